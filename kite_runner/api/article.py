@@ -1,26 +1,69 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
-from django.db.models import Q, QuerySet
+from django.db import transaction
+from django.db.models import QuerySet
 from rest_framework import generics, mixins, serializers, status, viewsets
 from rest_framework.exceptions import NotAuthenticated, NotFound
-from rest_framework.permissions import (IsAuthenticated,
+from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
+from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from kite_runner.api.renderer import ArticleJSONRenderer
+from kite_runner import cache
+from kite_runner.api.renderer import (ArticleJSONRenderer,
+                                      FavoriteBatchJSONRenderer)
 from kite_runner.models import Article, Profile, Tag
+from kite_runner.models.tag import tag_dictionary, tag_slug
+from kite_runner.models.timeline import FEED_ORDERING, Feed
+from kite_runner.pagination import (KeysetOrLimitOffsetPagination,
+                                    KeysetPagination)
+from kite_runner.renderer import StreamingListMixin
+from kite_runner.transactions import AtomicWritesMixin
 
-from .profile import ProfileSerializer
+from .profile import EdgeBatchSerializer, ProfileSerializer, batch_results
+from .viewer import ViewerListSerializer, ViewerRelations, get_viewer_relations
+
+
+class TagListField(serializers.ManyRelatedField):
+    """
+    Resolves the whole tag list with ``Tag.objects.resolve`` instead of one
+    ``get_or_create`` per tag.
+    """
+
+    def to_internal_value(self, data: Any) -> List[Tag]:
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        names = [self.child_relation.to_internal_value(item) for item in data]
+        return Tag.objects.resolve(names)
 
 
 class TagRelatedField(serializers.RelatedField):
+    default_error_messages = {
+        "invalid": "Tag names must be strings.",
+        "unnamed": "Tag names must contain a letter or a digit.",
+    }
+
+    @classmethod
+    def many_init(cls, *args: Any, **kwargs: Any) -> TagListField:
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return TagListField(**list_kwargs)
+
     def get_queryset(self) -> QuerySet:
         return Tag.objects.all()
 
-    def to_internal_value(self, data: Any) -> Tag:
-        tag, _ = Tag.objects.get_or_create(tag=data, slug=data.lower())
-        return tag
+    def to_internal_value(self, data: Any) -> str:
+        if not isinstance(data, str):
+            self.fail("invalid")
+        if not tag_slug(data):
+            self.fail("unnamed")
+        return data
 
     def to_representation(self, value: Tag) -> str:
         return value.tag
@@ -29,7 +72,7 @@ class TagRelatedField(serializers.RelatedField):
 class ArticleSerializer(serializers.ModelSerializer):
     author = ProfileSerializer(read_only=True)
     description = serializers.CharField(required=False)
-    slug = serializers.SlugField(required=False)
+    slug = serializers.SlugField(read_only=True)
     favorited = serializers.SerializerMethodField()
     tagList = TagRelatedField(many=True, required=False, source="tags")
     createdAt = serializers.SerializerMethodField(method_name="get_created_at")
@@ -52,26 +95,63 @@ class ArticleSerializer(serializers.ModelSerializer):
             "favoritesCount",
             "author",
         )
+        list_serializer_class = ViewerListSerializer
+
+    def prime_viewer_relations(
+        self, relations: ViewerRelations, instances: List[Article]
+    ) -> None:
+        relations.prime(
+            profiles=[instance.author_id for instance in instances],
+            articles=[instance.pk for instance in instances],
+        )
 
     def create(self, validated_data: Dict) -> Article:
         author = self.context.get("author", None)
         tags = validated_data.pop("tags", [])
-        article: Article = Article.objects.create(author=author, **validated_data)
 
-        for tag in tags:
-            article.tags.add(tag)
+        with transaction.atomic():
+            article: Article = Article.objects.create(author=author, **validated_data)
+            self._add_tags(article, tags)
 
         return article
 
-    def get_favorited(self, instance: Any) -> bool:
-        request = self.context.get("request", None)
-        if not request:
-            return False
+    def _add_tags(self, article: Article, tags: List[Tag]) -> None:
+        if not tags:
+            return
 
-        if not request.user.is_authenticated:
+        # The tag dictionary may hold tags deleted elsewhere. Foreign keys are
+        # only checked at commit, so the insert below would not catch them.
+        existing = set(
+            Tag.objects.filter(pk__in=[tag.pk for tag in tags]).values_list(
+                "pk", flat=True
+            )
+        )
+        if len(existing) < len(tags):
+            for tag in tags:
+                if tag.pk not in existing:
+                    tag_dictionary.discard(tag.pk)
+            tags = Tag.objects.resolve(tag.tag for tag in tags)
+
+        through = Article.tags.through
+        through.objects.bulk_create(
+            [through(article_id=article.pk, tag_id=tag.pk) for tag in tags],
+            ignore_conflicts=True,
+        )
+        Article.objects.filter(pk=article.pk).update_search_vector()
+
+    def to_representation(self, instance: Any) -> Dict:
+        relations = get_viewer_relations(self.context.get("request", None))
+        if relations is not None:
+            self.prime_viewer_relations(relations, [instance])
+
+        return super().to_representation(instance)
+
+    def get_favorited(self, instance: Any) -> bool:
+        relations = get_viewer_relations(self.context.get("request", None))
+        if relations is None:
             return False
 
-        return request.user.profile.has_favorited(instance)
+        return relations.has_favorited(instance)
 
     def get_created_at(self, instance: Any) -> str:
         return instance.created_at.isoformat()
@@ -80,10 +160,33 @@ class ArticleSerializer(serializers.ModelSerializer):
         return instance.updated_at.isoformat()
 
     def get_fovorties_count(self, instance: Any) -> int:
-        return instance.favorited_by.count()
+        return instance.favorites_count
+
+
+def filter_articles(queryset: QuerySet, params: Any) -> QuerySet:
+    """
+    Applies the ``author``, ``tag`` and ``favorited`` query parameters.
+    """
+
+    author = params.get("author", None)
+    if author:
+        queryset = queryset.filter(author__user__username=author)
+
+    tag = params.get("tag", None)
+    if tag:
+        queryset = queryset.filter(tags__slug=tag_slug(tag))
+
+    favorited_by = params.get("favorited", None)
+    if favorited_by:
+        queryset = queryset.filter(favorited_by__user__username=favorited_by)
+
+    return queryset
 
 
 class ArticleViewset(
+    cache.CachedAnonymousReadMixin,
+    AtomicWritesMixin,
+    StreamingListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -95,23 +198,34 @@ class ArticleViewset(
     permissions_classes = (IsAuthenticatedOrReadOnly,)
     serializer_class = ArticleSerializer
     renderer_classes = (ArticleJSONRenderer,)
+    pagination_class = KeysetOrLimitOffsetPagination
+    orderings = {
+        "recent": ("-created_at", "-id"),
+        "favorites": ("-favorites_count", "-id"),
+    }
 
-    def get_queryset(self) -> QuerySet:
-        queryset: QuerySet = self.queryset
+    @property
+    def keyset_ordering(self) -> Tuple[str, ...]:
+        ordering = self.request.query_params.get("ordering", "recent")
+        return self.orderings.get(ordering, self.orderings["recent"])
 
-        author = self.request.query_params.get("author", None)
-        if author:
-            queryset = queryset.filter(author__user__username=author)
+    def get_cache_scopes(self, request: Any, *args: Any, **kwargs: Any) -> List[str]:
+        slug = kwargs.get(self.lookup_field, None)
+        if slug is None:
+            return [cache.ARTICLES, cache.PROFILES]
 
-        tag = self.request.query_params.get("tag", None)
-        if tag:
-            queryset = queryset.filter(tags__tag=tag)
+        return [cache.article_scope(slug), cache.PROFILES]
 
-        favorited_by = self.request.query_params.get("favorited", None)
-        if favorited_by:
-            queryset = queryset.filter(favorited_by__username=favorited_by)
+    def needs_read_snapshot(self, request: Any, *args: Any, **kwargs: Any) -> bool:
+        # Only the list runs a page query and a count that must agree.
+        return self.lookup_field not in kwargs
 
-        return queryset
+    def get_queryset(self) -> QuerySet:
+        queryset: QuerySet = Article.objects.for_display().order_by(
+            *self.keyset_ordering
+        )
+
+        return filter_articles(queryset, self.request.query_params)
 
     def create(self, request: Any) -> Response:
         if not request.user.is_authenticated:
@@ -138,7 +252,7 @@ class ArticleViewset(
     def retrieve(self, request: Any, slug: str) -> Response:
         serializer_context = {"request": request}
         try:
-            instance = self.queryset.get(slug=slug)
+            instance = Article.objects.for_display().get(slug=slug)
         except Article.DoesNotExist:
             raise NotFound(f"Could not found any article with slug: {slug}")
 
@@ -174,7 +288,7 @@ class ArticleViewset(
         return Response(None, status=status.HTTP_204_NO_CONTENT)
 
 
-class ArticlesFavoriteAPIView(APIView):
+class ArticlesFavoriteAPIView(AtomicWritesMixin, APIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
@@ -189,6 +303,7 @@ class ArticlesFavoriteAPIView(APIView):
             raise NotFound(f"Could not found any article with slug: {slug}")
 
         profile.unfavorite(article)
+        article = Article.objects.for_display().get(pk=article.pk)
         serializer = self.serializer_class(article, context=serializer_context)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -203,22 +318,69 @@ class ArticlesFavoriteAPIView(APIView):
             raise NotFound(f"Could not found any article with slug: {slug}")
 
         profile.favorite(article)
+        article = Article.objects.for_display().get(pk=article.pk)
         serializer = self.serializer_class(article, context=serializer_context)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class ArticlesFeedAPIView(generics.ListAPIView):
+class FavoriteBatchSerializer(EdgeBatchSerializer):
+    favorite = serializers.ListField(child=serializers.CharField(), default=list)
+    unfavorite = serializers.ListField(child=serializers.CharField(), default=list)
+
+
+class FavoriteBatchAPIView(AtomicWritesMixin, APIView):
+    """
+    Favorites and unfavorites many articles, by slug, in one request.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (FavoriteBatchJSONRenderer,)
+    serializer_class = FavoriteBatchSerializer
+
+    def post(self, request: Any) -> Response:
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        favorite = serializer.validated_data["favorite"]
+        unfavorite = serializer.validated_data["unfavorite"]
+
+        articles = {
+            article.slug: article
+            for article in Article.objects.only("id", "slug").filter(
+                slug__in=[*favorite, *unfavorite]
+            )
+        }
+
+        profile: Profile = request.user.profile
+        favorited = profile.favorite_many(
+            articles[slug] for slug in favorite if slug in articles
+        )
+        unfavorited = profile.unfavorite_many(
+            articles[slug] for slug in unfavorite if slug in articles
+        )
+
+        results = batch_results(
+            "slug",
+            "favorited",
+            articles,
+            [(favorite, True, favorited), (unfavorite, False, unfavorited)],
+        )
+
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class ArticlesFeedAPIView(AtomicWritesMixin, StreamingListMixin, generics.ListAPIView):
     queryset = Article.objects.all()
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ArticleJSONRenderer,)
     serializer_class = ArticleSerializer
+    pagination_class = KeysetOrLimitOffsetPagination
+    keyset_ordering = FEED_ORDERING
+    read_snapshot = True
 
-    def get_queryset(self) -> QuerySet:
-        return Article.objects.filter(
-            Q(author__in=self.request.user.profile.following.all())
-            | Q(author=self.request.user.profile)
-        )
+    def get_queryset(self) -> Feed:
+        profile: Profile = self.request.user.profile
+        return Article.objects.for_display().feed_for(profile)
 
     def list(self, request: Any) -> Response:
         queryset = self.get_queryset()
@@ -227,3 +389,33 @@ class ArticlesFeedAPIView(generics.ListAPIView):
         serlizer_context = {"request": request}
         serializer = self.serializer_class(page, context=serlizer_context, many=True)
         return self.get_paginated_response(serializer.data)
+
+
+class ArticlesSearchAPIView(
+    cache.CachedAnonymousReadMixin, StreamingListMixin, generics.ListAPIView
+):
+    """
+    Full-text search over title, tags, description and body, best matches
+    first. Always keyset paginated, so no ``COUNT(*)`` runs over the matches.
+    """
+
+    permission_classes = (AllowAny,)
+    renderer_classes = (ArticleJSONRenderer,)
+    serializer_class = ArticleSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-rank", "-id")
+    search_query_param = "q"
+    cache_scopes = (cache.ARTICLES, cache.PROFILES)
+
+    def get_queryset(self) -> QuerySet:
+        text = self.request.query_params.get(self.search_query_param, "").strip()
+        queryset = Article.objects.for_display().search(text)
+
+        return queryset if text else queryset.none()
+
+    def list(self, request: Any) -> Response:
+        page = self.paginate_queryset(self.get_queryset())
+
+        serializer_context = {"request": request}
+        serializer = self.serializer_class(page, context=serializer_context, many=True)
+        return self.get_paginated_response(serializer.data)
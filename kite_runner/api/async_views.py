@@ -0,0 +1,201 @@
+"""
+Async variants of the read endpoints, served under ``/api/v1/async/``.
+
+Request handling stays on the event loop; ORM and serialization work runs on
+the ``kite_runner.db.executor`` pool, and independent queries (a page and its
+count, an article and its comments) run concurrently.
+"""
+
+import asyncio
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.pagination import _positive_int
+
+from kite_runner import cache
+from kite_runner.api.article import ArticleSerializer, filter_articles
+from kite_runner.api.comment import CommentSerializer, comments_for
+from kite_runner.api.profile import ProfileSerializer
+from kite_runner.api.renderer import (ArticleJSONRenderer, CommentJSONRenderer,
+                                      ProfileJSONRenderer, TagJSONRenderer)
+from kite_runner.api.tag import PopularTagSerializer
+from kite_runner.authentication import CachedJWTAuthentication
+from kite_runner.db.executor import run_in_db_pool
+from kite_runner.models import Article, PopularTag, Profile
+from kite_runner.renderer import KRJSONRenderer
+
+JSON = "application/json"
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def _authenticate(request: HttpRequest) -> None:
+    result = CachedJWTAuthentication().authenticate(request)
+    request.user = result[0] if result is not None else AnonymousUser()
+
+
+def async_api_view(view: Callable) -> Callable:
+    """
+    Authenticates the request off the event loop and renders API exceptions
+    like ``core_exception_handler``. Only ``GET`` and ``HEAD`` are allowed, as
+    ``require_safe`` does not support async views before Django 5.0.
+    """
+
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if request.method not in SAFE_METHODS:
+            return HttpResponseNotAllowed(SAFE_METHODS)
+
+        try:
+            await run_in_db_pool(_authenticate, request)
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            content = KRJSONRenderer().encode({"errors": {"detail": exc.detail}})
+            return HttpResponse(content, status=exc.status_code, content_type=JSON)
+
+    return wrapper
+
+
+def _limit_offset(request: HttpRequest) -> Tuple[int, int]:
+    try:
+        limit = _positive_int(request.GET["limit"], strict=True, cutoff=None)
+    except (KeyError, ValueError):
+        limit = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+    try:
+        offset = _positive_int(request.GET["offset"])
+    except (KeyError, ValueError):
+        offset = 0
+
+    return limit, offset
+
+
+def _serialize(
+    serializer_class: Any, instance: Any, request: HttpRequest, **kwargs: Any
+) -> Any:
+    return serializer_class(instance, context={"request": request}, **kwargs).data
+
+
+def _serialize_page(serializer_class: Any, queryset: Any, request: HttpRequest) -> Any:
+    limit, offset = _limit_offset(request)
+    page = list(queryset[offset:][:limit])
+    return _serialize(serializer_class, page, request, many=True)
+
+
+async def _paginated(
+    serializer_class: Any, queryset: Any, request: HttpRequest
+) -> Dict[str, Any]:
+    results, count = await asyncio.gather(
+        run_in_db_pool(_serialize_page, serializer_class, queryset, request),
+        run_in_db_pool(queryset.count),
+    )
+    return {"results": results, "count": count}
+
+
+def _render(renderer: KRJSONRenderer, data: Any) -> HttpResponse:
+    return HttpResponse(renderer.render(data), content_type=JSON)
+
+
+@async_api_view
+async def article_list(request: HttpRequest) -> HttpResponse:
+    queryset = filter_articles(
+        Article.objects.for_display().order_by("-created_at", "-id"), request.GET
+    )
+    data = await _paginated(ArticleSerializer, queryset, request)
+
+    return _render(ArticleJSONRenderer(), data)
+
+
+def _get_article(slug: str, request: HttpRequest) -> Dict:
+    try:
+        article = Article.objects.for_display().get(slug=slug)
+    except Article.DoesNotExist:
+        raise NotFound(f"Could not found any article with slug: {slug}")
+
+    return _serialize(ArticleSerializer, article, request)
+
+
+def _get_comments(slug: str, request: HttpRequest) -> List:
+    # Runs alongside ``_get_article``, so the article id comes from the cache
+    # the comments endpoint fills too. Paged with the same ``limit``/``offset``.
+    article_id = cache.get_article_id(
+        slug, Article.objects.filter(slug=slug).values_list("pk", flat=True).first
+    )
+    if article_id is None:
+        return []
+
+    return _serialize_page(CommentSerializer, comments_for(article_id), request)
+
+
+def _get_comment_page(article_slug: str, request: HttpRequest) -> Dict[str, Any]:
+    article = (
+        Article.objects.only("id", "comments_count").filter(slug=article_slug).first()
+    )
+    if article is None:
+        return {"results": [], "count": 0}
+
+    page = _serialize_page(CommentSerializer, comments_for(article.pk), request)
+    return {"results": page, "count": article.comments_count}
+
+
+@async_api_view
+async def article_detail(request: HttpRequest, slug: str) -> HttpResponse:
+    """
+    Returns the article; with ``?include=comments`` its comments are fetched
+    concurrently and returned alongside it.
+    """
+
+    if request.GET.get("include", None) != "comments":
+        article = await run_in_db_pool(_get_article, slug, request)
+        return _render(ArticleJSONRenderer(), article)
+
+    article, comments = await asyncio.gather(
+        run_in_db_pool(_get_article, slug, request),
+        run_in_db_pool(_get_comments, slug, request),
+    )
+    content = KRJSONRenderer().encode({"article": article, "comments": comments})
+    return HttpResponse(content, content_type=JSON)
+
+
+@async_api_view
+async def comment_list(request: HttpRequest, article_slug: str) -> HttpResponse:
+    # The count comes from the article's counter, so there is nothing to run
+    # alongside the page.
+    data = await run_in_db_pool(_get_comment_page, article_slug, request)
+
+    return _render(CommentJSONRenderer(), data)
+
+
+def _get_profile(username: str, request: HttpRequest) -> Dict:
+    try:
+        profile = Profile.objects.select_related("user").get(user__username=username)
+    except Profile.DoesNotExist:
+        raise NotFound(f"Profile with username: {username} not found.")
+
+    return _serialize(ProfileSerializer, profile, request)
+
+
+@async_api_view
+async def profile_detail(request: HttpRequest, username: str) -> HttpResponse:
+    profile = await run_in_db_pool(_get_profile, username, request)
+
+    return _render(ProfileJSONRenderer(), profile)
+
+
+def _get_popular_tags(request: HttpRequest) -> List:
+    top = (
+        PopularTag.objects.filter(window=PopularTag.objects.ALL)
+        .select_related("tag")
+        .order_by("rank")[: settings.TAG_POPULAR_LIMIT]
+    )
+    return _serialize(PopularTagSerializer, top, request, many=True)
+
+
+@async_api_view
+async def tag_list(request: HttpRequest) -> HttpResponse:
+    tags = await run_in_db_pool(_get_popular_tags, request)
+
+    return _render(TagJSONRenderer(), tags)
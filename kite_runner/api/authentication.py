@@ -1,11 +1,11 @@
 from typing import Any, Dict
 
-from django.contrib.auth import authenticate
 from rest_framework import permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from kite_runner.utils import tokens
+from kite_runner.transactions import AtomicWritesMixin
+from kite_runner.utils import passwords, tokens
 
 from .renderer import UserJSONRenderer
 
@@ -28,7 +28,9 @@ class LoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError("Email and password are required")
 
-        user = authenticate(email=email, password=password)
+        user = passwords.authenticate(
+            email=email, password=password, request=self.context.get("request")
+        )
 
         if user is None:
             raise serializers.ValidationError("wrong username or password")
@@ -40,15 +42,17 @@ class LoginSerializer(serializers.Serializer):
         }
 
 
-class LoginViewSet(APIView):
+class LoginViewSet(AtomicWritesMixin, APIView):
     serializer_class = LoginSerializer
     permission_classes = (permissions.AllowAny,)
     renderer_classes = (UserJSONRenderer,)
+    # Hashing can take a while; the only write, a rehash, is one UPDATE.
+    non_atomic_methods = ("POST",)
 
     def post(self, request: Any) -> Response:
         user = request.data.get("user", None)
 
-        serializer = self.serializer_class(data=user)
+        serializer = self.serializer_class(data=user, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1,14 +1,21 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
+from django.db import transaction
 from django.db.models import QuerySet
 from rest_framework import generics, serializers, status
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 
+from kite_runner import cache
 from kite_runner.api.profile import ProfileSerializer
 from kite_runner.api.renderer import CommentJSONRenderer
+from kite_runner.api.viewer import ViewerListSerializer, ViewerRelations
 from kite_runner.models import Article, Comment
+from kite_runner.pagination import (AnchoredKeysetPagination,
+                                    KeysetOrLimitOffsetPagination)
+from kite_runner.renderer import StreamingListMixin
+from kite_runner.transactions import AtomicWritesMixin
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -25,12 +32,21 @@ class CommentSerializer(serializers.ModelSerializer):
             "createdAt",
             "updatedAt",
         )
+        list_serializer_class = ViewerListSerializer
+
+    def prime_viewer_relations(
+        self, relations: ViewerRelations, instances: List[Comment]
+    ) -> None:
+        relations.prime(profiles=[instance.author_id for instance in instances])
 
     def create(self, validated_data: Dict) -> Comment:
         article = self.context["article"]
         author = self.context["author"]
 
-        return Comment.objects.create(article=article, author=author, **validated_data)
+        with transaction.atomic():
+            return Comment.objects.create(
+                article=article, author=author, **validated_data
+            )
 
     def get_created_at(self, obj: Comment) -> str:
         return obj.created_at.isoformat()
@@ -39,20 +55,73 @@ class CommentSerializer(serializers.ModelSerializer):
         return obj.updated_at.isoformat()
 
 
-class CommentListCreateAPIView(generics.ListCreateAPIView):
-    lookup_field = "article__slug"
+def comments_for(article_id: int) -> QuerySet:
+    """
+    Comments of an article in display order, loading only the columns
+    ``CommentSerializer`` renders. Served by ``comment_article_created_idx``.
+    """
+
+    return (
+        Comment.objects.filter(article_id=article_id)
+        .select_related("author", "author__user")
+        .only(
+            "body",
+            "created_at",
+            "updated_at",
+            "author__bio",
+            "author__image",
+            "author__user__username",
+        )
+        .order_by("created_at", "id")
+    )
+
+
+class CommentPagination(KeysetOrLimitOffsetPagination):
+    keyset_class = AnchoredKeysetPagination
+
+
+class CommentListCreateAPIView(
+    cache.CachedAnonymousReadMixin,
+    AtomicWritesMixin,
+    StreamingListMixin,
+    generics.ListCreateAPIView,
+):
     lookup_url_kwarg = "article_slug"
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    queryset = Comment.objects.select_related(
-        "article", "article__author", "article__author__user", "author", "author__user"
-    )
     renderer_classes = (CommentJSONRenderer,)
     serializer_class = CommentSerializer
+    pagination_class = CommentPagination
+    keyset_ordering = ("created_at", "id")
+    read_snapshot = True
+
+    def get_cache_scopes(self, request: Any, *args: Any, **kwargs: Any) -> List[str]:
+        slug = kwargs[self.lookup_url_kwarg]
+        article_id = cache.get_article_id(
+            slug, Article.objects.filter(slug=slug).values_list("pk", flat=True).first
+        )
+
+        return [cache.comments_scope(article_id), cache.PROFILES]
 
-    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
-        filters = {self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
+    def get_article(self) -> Optional[Article]:
+        if not hasattr(self, "_article"):
+            self._article = (
+                Article.objects.only("id", "comments_count")
+                .filter(slug=self.kwargs[self.lookup_url_kwarg])
+                .first()
+            )
 
-        return queryset.filter(**filters)
+        return self._article
+
+    def get_queryset(self) -> QuerySet:
+        article = self.get_article()
+        if article is None:
+            return Comment.objects.none()
+
+        return comments_for(article.pk)
+
+    def get_known_count(self) -> int:
+        article = self.get_article()
+        return article.comments_count if article is not None else 0
 
     def create(self, request: Any, article_slug: str) -> Response:
         data = request.data.get("comment", {})
@@ -61,7 +130,7 @@ class CommentListCreateAPIView(generics.ListCreateAPIView):
         try:
             context["article"] = Article.objects.get(slug=article_slug)
         except Article.DoesNotExist:
-            return NotFound(f"Could not found any article with slug: {article_slug}")
+            raise NotFound(f"Could not found any article with slug: {article_slug}")
 
         serializer = self.serializer_class(data=data, context=context)
         serializer.is_valid(raise_exception=True)
@@ -70,16 +139,18 @@ class CommentListCreateAPIView(generics.ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class CommentDestroyAPIView(generics.DestroyAPIView):
-    lookup_url_kwarg = "comment_pk"
+class CommentDestroyAPIView(AtomicWritesMixin, generics.DestroyAPIView):
     permission_classes = (IsAuthenticatedOrReadOnly,)
     queryset = Comment.objects.all()
 
-    def destroy(self, comment_pk: Any) -> Response:
+    def destroy(self, request: Any, article_slug: str, pk: int) -> Response:
         try:
-            comment = Comment.objects.get(pk=comment_pk)
+            comment = Comment.objects.get(pk=pk, article__slug=article_slug)
         except Comment.DoesNotExist:
-            return NotFound(f"Could not found any comment with pk: {comment_pk}")
+            raise NotFound(f"Could not found any comment with pk: {pk}")
+
+        if comment.author_id != request.user.profile.pk:
+            raise PermissionDenied("Only the author can delete a comment.")
 
         comment.delete()
 
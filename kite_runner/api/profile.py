@@ -1,3 +1,6 @@
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
 from rest_framework import serializers, status
 from rest_framework.exceptions import NotFound
 from rest_framework.generics import RetrieveAPIView
@@ -5,10 +8,13 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from kite_runner import cache
 from kite_runner.models import Profile
+from kite_runner.transactions import AtomicWritesMixin
 from kite_runner.utils.constants import DEFAULT_AVT_IMAGE
 
-from .renderer import ProfileJSONRenderer
+from .renderer import FollowBatchJSONRenderer, ProfileJSONRenderer
+from .viewer import ViewerListSerializer, get_viewer_relations
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -21,6 +27,10 @@ class ProfileSerializer(serializers.ModelSerializer):
         model = Profile
         fields = ["username", "bio", "image", "following"]
         read_only_fields = ["username"]
+        list_serializer_class = ViewerListSerializer
+
+    def prime_viewer_relations(self, relations, instances):
+        relations.prime(profiles=[instance.pk for instance in instances])
 
     def get_image(self, obj):
         if obj.image:
@@ -29,23 +39,19 @@ class ProfileSerializer(serializers.ModelSerializer):
         return DEFAULT_AVT_IMAGE
 
     def get_following(self, instance):
-        request = self.context.get("request")
-        if request is None:
-            return False
-        if not request.user.is_authenticated:
+        relations = get_viewer_relations(self.context.get("request"))
+        if relations is None:
             return False
 
-        follower = request.user.profile
-        followee = instance
+        return relations.is_following(instance)
 
-        return follower.is_following(followee)
 
-
-class ProfileRetrieveAPIView(RetrieveAPIView):
+class ProfileRetrieveAPIView(cache.CachedAnonymousReadMixin, RetrieveAPIView):
     permission_classes = (AllowAny,)
     queryset = Profile.objects.select_related("user")
     serializer_class = ProfileSerializer
     renderer_classes = (ProfileJSONRenderer,)
+    cache_scopes = (cache.PROFILES,)
 
     def retrieve(self, request, username):
         try:
@@ -58,7 +64,7 @@ class ProfileRetrieveAPIView(RetrieveAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FollowUserAPIView(APIView):
+class FollowUserAPIView(AtomicWritesMixin, APIView):
     permission_classes = (IsAuthenticated,)
     queryset = Profile.objects.select_related("user")
     serializer_class = ProfileSerializer
@@ -91,3 +97,93 @@ class FollowUserAPIView(APIView):
         serializer = self.serializer_class(followee, context={"request": request})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+def batch_results(
+    key: str,
+    state: str,
+    objects: Dict[str, Any],
+    batches: Iterable[Tuple[List[str], bool, Set[int]]],
+) -> List[Dict[str, Any]]:
+    """
+    Compact per-item results of a batch, in request order:
+    ``{key: ..., state: ..., "changed": ...}`` for every requested key, or
+    ``{key: ..., "error": ...}`` when it matched no object.
+    """
+
+    results: List[Dict[str, Any]] = []
+    for keys, value, changed in batches:
+        for item in keys:
+            obj = objects.get(item, None)
+            if obj is None:
+                results.append({key: item, "error": "Not found."})
+            else:
+                results.append({key: item, state: value, "changed": obj.pk in changed})
+
+    return results
+
+
+class EdgeBatchSerializer(serializers.Serializer):
+    """
+    Validates a batch of edges to add and remove, each a list of keys, with
+    at most ``SOCIAL_BATCH_LIMIT`` keys in total.
+    """
+
+    def validate(self, attrs):
+        added, removed = (set(keys) for keys in attrs.values())
+
+        if len(added) + len(removed) > settings.SOCIAL_BATCH_LIMIT:
+            raise serializers.ValidationError(
+                f"At most {settings.SOCIAL_BATCH_LIMIT} items can be changed at once."
+            )
+        if added & removed:
+            raise serializers.ValidationError(
+                f"Cannot both add and remove: {', '.join(sorted(added & removed))}."
+            )
+
+        return attrs
+
+
+class FollowBatchSerializer(EdgeBatchSerializer):
+    follow = serializers.ListField(child=serializers.CharField(), default=list)
+    unfollow = serializers.ListField(child=serializers.CharField(), default=list)
+
+
+class FollowBatchAPIView(AtomicWritesMixin, APIView):
+    """
+    Follows and unfollows many profiles, by username, in one request.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (FollowBatchJSONRenderer,)
+    serializer_class = FollowBatchSerializer
+
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        follow = serializer.validated_data["follow"]
+        unfollow = serializer.validated_data["unfollow"]
+
+        profiles = {
+            profile.user.username: profile
+            for profile in Profile.objects.select_related("user")
+            .only("id", "user__username")
+            .filter(user__username__in=[*follow, *unfollow])
+        }
+
+        follower: Profile = request.user.profile
+        followed = follower.follow_many(
+            profiles[username] for username in follow if username in profiles
+        )
+        unfollowed = follower.unfollow_many(
+            profiles[username] for username in unfollow if username in profiles
+        )
+
+        results = batch_results(
+            "username",
+            "following",
+            profiles,
+            [(follow, True, followed), (unfollow, False, unfollowed)],
+        )
+
+        return Response(results, status=status.HTTP_200_OK)
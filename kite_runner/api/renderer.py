@@ -1,3 +1,5 @@
+from typing import Any, Dict, Optional
+
 from kite_runner.renderer import KRJSONRenderer
 
 
@@ -6,12 +8,17 @@ class UserJSONRenderer(KRJSONRenderer):
     pagination_object_label = "users"
     pagination_count_label = "usersCount"
 
-    def render(self, data, media_type=None, renderer_context=None):
+    def render(
+        self,
+        data: Any,
+        media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
         token = data.get("token", None)
         if token and isinstance(token, bytes):
-            data["token"] = token.decode("utf-8")
+            data = {**data, "token": token.decode("utf-8")}
 
-        return super(UserJSONRenderer, self).render(data)  # type: ignore
+        return super(UserJSONRenderer, self).render(data)
 
 
 class ProfileJSONRenderer(KRJSONRenderer):
@@ -20,13 +27,27 @@ class ProfileJSONRenderer(KRJSONRenderer):
     pagination_count_label = "profilesCount"
 
 
+class FollowBatchJSONRenderer(KRJSONRenderer):
+    object_label = "profiles"
+
+
 class ArticleJSONRenderer(KRJSONRenderer):
     object_label = "article"
     pagination_object_label = "articles"
     pagination_count_label = "articlesCount"
 
 
+class FavoriteBatchJSONRenderer(KRJSONRenderer):
+    object_label = "articles"
+
+
 class CommentJSONRenderer(KRJSONRenderer):
     object_label = "comment"
     pagination_object_label = "comments"
-    pagination_count_label = "commentsCount"
+    pagination_object_count = "commentsCount"
+
+
+class TagJSONRenderer(KRJSONRenderer):
+    object_label = "tags"
+    pagination_object_label = "tags"
+    pagination_count_label = "tagsCount"
@@ -4,7 +4,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from kite_runner.api.profile import ProfileSerializer
+from kite_runner.db import routers
 from kite_runner.models import User
+from kite_runner.transactions import AtomicWritesMixin
 from kite_runner.utils import tokens
 
 from .renderer import UserJSONRenderer
@@ -53,7 +55,7 @@ class SignupSerializer(serializers.ModelSerializer):
         return tokens.get_user_token(user)
 
 
-class SignupAPIView(APIView):
+class SignupAPIView(AtomicWritesMixin, APIView):
     serializer_class = SignupSerializer
     permission_classes = (permissions.AllowAny,)
     renderer_classes = (UserJSONRenderer,)
@@ -62,6 +64,8 @@ class SignupAPIView(APIView):
         user = request.data.get("user", {})
         serializer = self.serializer_class(data=user)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        new_user = serializer.save()
+        # Requests made with the returned token must find the new user.
+        routers.stick_to_primary(new_user.pk)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
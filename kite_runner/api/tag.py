@@ -1,29 +1,61 @@
 from typing import Any
 
-from rest_framework import generics, serializers, status
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework import generics, serializers
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from kite_runner.models import Tag
+from kite_runner import cache
+from kite_runner.api.renderer import TagJSONRenderer
+from kite_runner.models import PopularTag
+from kite_runner.pagination import KeysetOrLimitOffsetPagination
 
 
-class TagSerializer(serializers.ModelSerializer):
+class PopularTagSerializer(serializers.ModelSerializer):
     class Meta:
-        model = Tag
+        model = PopularTag
         fields = ("tag",)
 
-    def to_representation(self, obj: Any) -> Tag:
-        return obj.tag
+    def to_representation(self, obj: Any) -> str:
+        return obj.tag.tag
 
 
-class TagListAPIView(generics.ListAPIView):
-    queryset = Tag.objects.all()
+class TagListAPIView(cache.CachedAnonymousReadMixin, generics.ListAPIView):
+    """
+    Returns the ``TAG_POPULAR_LIMIT`` most used tags, optionally within a
+    ``?window=``. Passing ``limit``/``offset`` or ``cursor`` pages through the
+    whole ranking instead. Rankings are recomputed by ``refresh_popular_tags``.
+    """
+
     permission_classes = (AllowAny,)
-    pagination_class = None
-    serializer_class = TagSerializer
+    serializer_class = PopularTagSerializer
+    renderer_classes = (TagJSONRenderer,)
+    pagination_class = KeysetOrLimitOffsetPagination
+    keyset_ordering = ("rank", "id")
+    paging_params = ("cursor", "limit", "offset")
+    cache_scopes = (cache.TAGS,)
+
+    @property
+    def window(self) -> str:
+        window = self.request.query_params.get("window", PopularTag.objects.ALL)
+        if window not in PopularTag.objects.windows():
+            return PopularTag.objects.ALL
+        return window
+
+    def get_queryset(self) -> QuerySet:
+        return (
+            PopularTag.objects.filter(window=self.window)
+            .select_related("tag")
+            .order_by(*self.keyset_ordering)
+        )
 
     def list(self, request: Any) -> Response:
-        serializer_data = self.get_queryset()
-        serializer = self.serializer_class(serializer_data, many=True)
-
-        return Response({"tags": serializer.data}, status=status.HTTP_200_OK)
+        queryset = self.get_queryset()
+        if not any(param in request.query_params for param in self.paging_params):
+            top = queryset[: settings.TAG_POPULAR_LIMIT]
+            return Response(self.get_serializer(top, many=True).data)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
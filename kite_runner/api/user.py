@@ -5,6 +5,7 @@ from rest_framework.response import Response
 
 from kite_runner.api.profile import ProfileSerializer
 from kite_runner.models import User
+from kite_runner.transactions import AtomicWritesMixin
 from kite_runner.utils import tokens
 
 from .renderer import UserJSONRenderer
@@ -23,7 +24,7 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ("token",)
 
     def get_token(self, obj: "User") -> str:
-        return tokens.get_user_token(obj)
+        return tokens.get_request_token(self.context.get("request", None), obj)
 
     def update(self, instance, validated_data):
         password = validated_data.pop("password", None)
@@ -45,13 +46,13 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
-class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
+class UserRetrieveUpdateAPIView(AtomicWritesMixin, RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
     renderer_classes = (UserJSONRenderer,)
 
     def retrieve(self, request, *args, **kwargs):
-        serializer = self.serializer_class(request.user)
+        serializer = self.serializer_class(request.user, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, *args, **kwargs):
@@ -67,7 +68,10 @@ class UserRetrieveUpdateAPIView(RetrieveUpdateAPIView):
         }
 
         serializer = self.serializer_class(
-            request.user, data=serializer_data, partial=True
+            request.user,
+            data=serializer_data,
+            partial=True,
+            context={"request": request},
         )
 
         serializer.is_valid(raise_exception=True)
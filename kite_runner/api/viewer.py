@@ -0,0 +1,111 @@
+"""
+Request-scoped loader for the relationships between the current user and
+the objects being serialized (``favorited`` and ``following`` flags).
+"""
+
+from typing import Any, Dict, Iterable, Optional, Set
+
+from django.db.models import CharField, Manager, Value
+from rest_framework import serializers
+
+from kite_runner.models import Profile
+
+FOLLOWING = "following"
+FAVORITED = "favorited"
+
+
+class ViewerRelations:
+    """
+    Answers ``is_following``/``has_favorited`` for the request user from
+    memory. Ids registered with ``prime`` are fetched together, in one
+    query, the first time any of them is looked up.
+    """
+
+    def __init__(self, user_id: int) -> None:
+        self.user_id = user_id
+        self._pending: Dict[str, Set[int]] = {FOLLOWING: set(), FAVORITED: set()}
+        self._loaded: Dict[str, Set[int]] = {FOLLOWING: set(), FAVORITED: set()}
+        self._edges: Dict[str, Set[int]] = {FOLLOWING: set(), FAVORITED: set()}
+
+    def prime(
+        self, profiles: Iterable[int] = (), articles: Iterable[int] = ()
+    ) -> None:
+        self._pending[FOLLOWING].update(set(profiles) - self._loaded[FOLLOWING])
+        self._pending[FAVORITED].update(set(articles) - self._loaded[FAVORITED])
+
+    def is_following(self, profile: Any) -> bool:
+        return self._lookup(FOLLOWING, profile.pk)
+
+    def has_favorited(self, article: Any) -> bool:
+        return self._lookup(FAVORITED, article.pk)
+
+    def _lookup(self, kind: str, pk: int) -> bool:
+        if pk not in self._loaded[kind]:
+            self._pending[kind].add(pk)
+            self._load()
+
+        return pk in self._edges[kind]
+
+    def _load(self) -> None:
+        following: Set[int] = self._pending[FOLLOWING]
+        favorited: Set[int] = self._pending[FAVORITED]
+
+        queries = []
+        if following:
+            queries.append(
+                Profile.following.through.objects.filter(
+                    from_profile__user_id=self.user_id, to_profile_id__in=following
+                )
+                .annotate(kind=Value(FOLLOWING, output_field=CharField()))
+                .values_list("kind", "to_profile_id")
+            )
+        if favorited:
+            queries.append(
+                Profile.favourites.through.objects.filter(
+                    profile__user_id=self.user_id, article_id__in=favorited
+                )
+                .annotate(kind=Value(FAVORITED, output_field=CharField()))
+                .values_list("kind", "article_id")
+            )
+
+        if queries:
+            edges = queries[0].union(*queries[1:], all=True)
+            for kind, pk in edges:
+                self._edges[kind].add(pk)
+
+        for kind, pending in self._pending.items():
+            self._loaded[kind].update(pending)
+            pending.clear()
+
+
+def get_viewer_relations(request: Any) -> Optional[ViewerRelations]:
+    """
+    Returns the ``ViewerRelations`` of ``request``, creating it on first use.
+    Anonymous requests have no relations.
+    """
+
+    if request is None or not request.user.is_authenticated:
+        return None
+
+    relations = getattr(request, "_viewer_relations", None)
+    if relations is None:
+        relations = ViewerRelations(request.user.pk)
+        request._viewer_relations = relations
+
+    return relations
+
+
+class ViewerListSerializer(serializers.ListSerializer):
+    """
+    Primes the viewer relations of every item before rendering any of them,
+    so the flags of a whole page are loaded in a single query.
+    """
+
+    def to_representation(self, data: Any) -> Any:
+        items = list(data.all() if isinstance(data, Manager) else data)
+
+        relations = get_viewer_relations(self.context.get("request"))
+        if relations is not None:
+            self.child.prime_viewer_relations(relations, items)
+
+        return super().to_representation(items)
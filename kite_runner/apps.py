@@ -6,4 +6,10 @@ class KiteRunnerConfig(AppConfig):
     verbose_name = "KiteRunner"
 
     def ready(self):
+        from django.core import checks
+
         from . import signals  # noqa: F401
+        from .checks import check_atomic_write_views, check_shared_cache
+
+        checks.register(check_atomic_write_views, checks.Tags.urls)
+        checks.register(check_shared_cache, checks.Tags.caches, deploy=True)
@@ -0,0 +1,41 @@
+from typing import Any
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from kite_runner import cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that resolves the user, with its profile, from the
+    cache. Entries are versioned per user and invalidated whenever the user
+    or profile is saved, so the hot path runs no database queries.
+    """
+
+    def get_user(self, validated_token: Any) -> Any:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = cache.AUTH_KEY.format(user_id)
+        user, versions = cache.get_versioned(key, [cache.user_scope(user_id)])
+
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related("profile").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+            cache.set_versioned(key, versions, user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -0,0 +1,214 @@
+"""
+Versioned response cache for anonymous reads.
+
+Every cached response records the version of the scopes it depends on
+(e.g. ``articles`` or ``article:<slug>``). Writes bump those versions once
+their transaction commits, which invalidates every dependent entry in O(1)
+without having to find or delete them.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from kite_runner.db import routers
+
+VERSION_KEY = "kr:version:{}"
+RESPONSE_KEY = "kr:response:{}"
+AUTH_KEY = "kr:auth:{}"
+ARTICLE_ID_KEY = "kr:article-id:{}"
+
+ARTICLES = "articles"
+PROFILES = "profiles"
+TAGS = "tags"
+
+_stats = {"hit": 0, "miss": 0}
+_stats_lock = threading.Lock()
+
+
+def article_scope(slug: str) -> str:
+    return f"article:{slug}"
+
+
+def comments_scope(article_id: Any) -> str:
+    return f"comments:{article_id}"
+
+
+def user_scope(user_id: Any) -> str:
+    return f"user:{user_id}"
+
+
+def _initial_version() -> int:
+    # Versions that were evicted restart from the clock rather than from
+    # zero, so entries stored against an older counter can never match.
+    return time.time_ns()
+
+
+def get_versions(
+    scopes: Iterable[str], *extra_keys: str
+) -> Tuple[Dict[str, int], Dict[str, Any]]:
+    """
+    Returns the current version of every scope, along with the values of
+    ``extra_keys`` fetched in the same round trip.
+    """
+
+    keys = {VERSION_KEY.format(scope): scope for scope in scopes}
+    found = cache.get_many([*keys, *extra_keys])
+
+    for key in keys.keys() - found.keys():
+        cache.add(key, _initial_version(), timeout=None)
+        found[key] = cache.get(key)
+
+    versions = {scope: found.pop(key) for key, scope in keys.items()}
+    return versions, found
+
+
+def get_versioned(key: str, scopes: Iterable[str]) -> Tuple[Any, Dict[str, int]]:
+    """
+    Returns the value stored under ``key`` if it was stored against the
+    current versions of ``scopes`` (``None`` otherwise), along with those
+    versions, in a single cache round trip.
+    """
+
+    versions, found = get_versions(scopes, key)
+
+    entry = found.get(key)
+    if entry is None or entry["versions"] != versions:
+        return None, versions
+
+    return entry["value"], versions
+
+
+def set_versioned(key: str, versions: Dict[str, int], value: Any, timeout: int) -> None:
+    cache.set(key, {"versions": versions, "value": value}, timeout=timeout)
+
+
+def _bump(scopes: Iterable[str]) -> None:
+    for scope in scopes:
+        key = VERSION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+
+
+def bump(*scopes: str) -> None:
+    """
+    Invalidates ``scopes`` right away and again once the current transaction
+    commits, so no reader can cache pre-commit data under the new version.
+    """
+
+    _bump(scopes)
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def get_article_id(slug: str, load: Callable[[], Optional[int]]) -> Optional[int]:
+    """
+    Returns the id of the article with ``slug``, remembered in the cache so
+    that reads keyed on it cost no query once cached. ``load`` looks the id
+    up on a miss; unknown slugs are not remembered.
+    """
+
+    key = ARTICLE_ID_KEY.format(slug)
+    article_id = cache.get(key)
+    if article_id is None:
+        article_id = load()
+        if article_id is not None:
+            cache.set(key, article_id, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+    return article_id
+
+
+def forget_article_id(slug: str) -> None:
+    """
+    Forgets the id of a deleted article right away and again once the
+    current transaction commits, as its slug may be taken by a new one.
+    """
+
+    key = ARTICLE_ID_KEY.format(slug)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def record(outcome: str) -> None:
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def get_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats() -> None:
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+
+def is_cacheable(request: Any) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and "HTTP_AUTHORIZATION" not in request.META
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def response_key(request: Any) -> str:
+    query = sorted((key, sorted(values)) for key, values in request.GET.lists())
+    raw = f"{request.path}|{query}|{request.META.get('HTTP_ACCEPT', '')}"
+
+    return RESPONSE_KEY.format(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+
+
+class CachedAnonymousReadMixin:
+    """
+    Serves anonymous ``GET`` requests from the response cache. Views list
+    the scopes a response depends on in ``cache_scopes``, or override
+    ``get_cache_scopes`` when they depend on the request.
+    """
+
+    cache_scopes: Tuple[str, ...] = ()
+
+    def get_cache_scopes(self, request: Any, *args: Any, **kwargs: Any) -> List[str]:
+        return list(self.cache_scopes)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)  # type: ignore
+
+        key = response_key(request)
+        scopes = self.get_cache_scopes(request, *args, **kwargs)
+        entry, versions = get_versioned(key, scopes)
+
+        if entry is not None:
+            record("hit")
+            content, content_type = entry
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+            return response
+
+        record("miss")
+        # The entry outlives the request, so it must not be filled from a
+        # replica that may not have caught up with the latest bump yet.
+        with routers.use_primary():
+            response = super().dispatch(request, *args, **kwargs)  # type: ignore
+
+        if isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            set_versioned(
+                key,
+                versions,
+                (response.content, response["Content-Type"]),
+                settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        response["X-Cache"] = "MISS"
+
+        return response
@@ -0,0 +1,118 @@
+from typing import Any, Iterable, Iterator, List, Set, Tuple, Type
+
+from django.conf import settings
+from django.core.checks import Error
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.views import View
+from rest_framework.permissions import SAFE_METHODS
+
+from kite_runner.transactions import AtomicWritesMixin
+
+
+def _iter_views(patterns: Iterable[Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _iter_views(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.callback
+
+
+def _write_methods(callback: Any, view_class: Type[View]) -> Set[str]:
+    actions = getattr(callback, "actions", None)
+    if actions:
+        methods = actions.keys()
+    else:
+        methods = [m for m in view_class.http_method_names if hasattr(view_class, m)]
+
+    return {method.upper() for method in methods} - set(SAFE_METHODS)
+
+
+def _uncovered_methods(callback: Any, view_class: Type[View]) -> Set[str]:
+    methods = _write_methods(callback, view_class)
+    if issubclass(view_class, AtomicWritesMixin):
+        methods -= set(view_class.atomic_methods)
+        methods -= set(view_class.non_atomic_methods)
+
+    return methods
+
+
+def non_atomic_write_views(patterns: Iterable[Any]) -> List[Error]:
+    """
+    Returns an error for every class-based ``kite_runner`` view that accepts
+    a write method without running it in a transaction.
+    """
+
+    errors = []
+    for route, callback in _iter_views(patterns):
+        view_class = getattr(callback, "cls", None) or getattr(
+            callback, "view_class", None
+        )
+        if view_class is None or not view_class.__module__.startswith("kite_runner"):
+            continue
+
+        methods = _uncovered_methods(callback, view_class)
+        if methods:
+            errors.append(
+                Error(
+                    f"{view_class.__qualname__} at '{route}' handles "
+                    f"{', '.join(sorted(methods))} outside a transaction.",
+                    hint=(
+                        "Add AtomicWritesMixin to the view, or list the method "
+                        "in its non_atomic_methods if that is intended."
+                    ),
+                    obj=view_class,
+                    id="kite_runner.E001",
+                )
+            )
+
+    return errors
+
+
+def check_atomic_write_views(app_configs: Any = None, **kwargs: Any) -> List[Error]:
+    if any(db.get("ATOMIC_REQUESTS", False) for db in settings.DATABASES.values()):
+        return []
+
+    return non_atomic_write_views(get_resolver().url_patterns)
+
+
+# Cache backends whose entries are only seen by the process that wrote them.
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def _shared_cache_dependents() -> List[str]:
+    dependents = []
+    if settings.RESPONSE_CACHE_TIMEOUT > 0:
+        dependents.append("the response cache (RESPONSE_CACHE_TIMEOUT)")
+    if settings.AUTH_USER_CACHE_TIMEOUT > 0:
+        dependents.append("the authenticated user cache (AUTH_USER_CACHE_TIMEOUT)")
+    if settings.DATABASE_REPLICAS and settings.REPLICA_STICKINESS > 0:
+        dependents.append("read-your-writes routing (REPLICA_STICKINESS)")
+
+    return dependents
+
+
+def check_shared_cache(app_configs: Any = None, **kwargs: Any) -> List[Error]:
+    """
+    Invalidations are written to the default cache, so features depending on
+    them need every worker to share it.
+    """
+
+    if settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+
+    dependents = _shared_cache_dependents()
+    if not dependents:
+        return []
+
+    return [
+        Error(
+            "The default cache is process-local, so invalidations only reach "
+            f"the worker that made them. It is relied on by {', '.join(dependents)}.",
+            hint=(
+                "Point CACHE_URL at a cache shared by every worker, e.g. Redis "
+                "or Memcached, or set the timeouts listed above to 0."
+            ),
+            id="kite_runner.E002",
+        )
+    ]
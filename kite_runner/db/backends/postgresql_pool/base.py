@@ -0,0 +1,113 @@
+"""
+PostgreSQL backend that borrows connections from a per-process pool.
+
+Enable it with ``ENGINE = "kite_runner.db.backends.postgresql_pool"`` and
+tune it with a ``POOL`` dict in the database settings::
+
+    "POOL": {
+        "MIN_SIZE": 2,
+        "MAX_SIZE": 20,
+        "TIMEOUT": 5,
+        "HEALTH_CHECK_INTERVAL": 30,
+        "MAX_LIFETIME": 3600,
+    }
+
+Closing a connection (at the end of every request when ``CONN_MAX_AGE`` is
+0) returns it to the pool instead of closing the socket.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+from django.utils.asyncio import async_unsafe
+
+from kite_runner.db.pool import ConnectionPool
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _connect(conn_params: Dict[str, Any]) -> Any:
+    connection = base.Database.connect(**conn_params)
+    # Same dummy loads() as Django's backend registers on every connection.
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+def get_pool(alias: str, conn_params: Dict[str, Any], options: Dict) -> ConnectionPool:
+    """
+    Returns the pool for ``alias``, creating it (and filling it up to
+    ``MIN_SIZE`` in the background) on first use in this process.
+    """
+
+    key = (
+        os.getpid(),
+        alias,
+        tuple(sorted((k, str(v)) for k, v in conn_params.items())),
+    )
+
+    with _pools_lock:
+        pool = _pools.get(key, None)
+        if pool is None:
+            pool = ConnectionPool(
+                lambda: _connect(conn_params),
+                min_size=options.get("MIN_SIZE", 0),
+                max_size=options.get("MAX_SIZE", 10),
+                timeout=options.get("TIMEOUT", 5),
+                health_check_interval=options.get("HEALTH_CHECK_INTERVAL", 30),
+                max_lifetime=options.get("MAX_LIFETIME", 3600),
+            )
+            _pools[key] = pool
+            threading.Thread(target=pool.fill, daemon=True).start()
+
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Returns the metrics of every pool of this process, by database alias.
+    """
+
+    with _pools_lock:
+        pools = [(key, pool) for key, pool in _pools.items() if key[0] == os.getpid()]
+
+    return {alias: pool.stats() for (_, alias, _), pool in pools}
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @async_unsafe
+    def get_new_connection(self, conn_params: Dict[str, Any]) -> Any:
+        self.pool = get_pool(
+            self.alias, conn_params, self.settings_dict.get("POOL", {})
+        )
+        connection = self.pool.acquire()
+
+        # Mirrors the isolation level handling of the base backend, which
+        # pooled connections bypass.
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = options["isolation_level"]
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
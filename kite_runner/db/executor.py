@@ -0,0 +1,46 @@
+"""
+Thread pool for running ORM work from async views.
+
+Unlike ``sync_to_async``'s default thread-sensitive mode, which funnels every
+call through one thread, work submitted here runs concurrently on up to
+``ASYNC_DB_WORKERS`` threads, each with its own database connection.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix="async-db"
+            )
+        return _executor
+
+
+def _call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # Pool threads outlive requests, so apply CONN_MAX_AGE and drop broken
+    # connections around every call like the request cycle does.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_in_db_pool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    call = sync_to_async(_call, thread_sensitive=False, executor=get_executor())
+    return await call(func, *args, **kwargs)
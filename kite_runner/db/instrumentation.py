@@ -0,0 +1,117 @@
+"""
+Per-request SQL statistics: query count, time spent in the database and how
+often each query shape was executed.
+
+``query_instrumentation_middleware`` collects them for sampled requests. A
+query shape executed ``QUERY_N_PLUS_ONE_THRESHOLD`` times or more in one
+request is reported as a likely N+1. Statistics live in a context variable,
+so queries run by ``run_in_db_pool`` on behalf of a request count towards it.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_PLACEHOLDER = re.compile(r"%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\?(?:\s*,\s*\?)*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Shape of ``sql``: parameters and literals become ``?`` and lists of
+    values of any length collapse to ``(...)``.
+    """
+
+    shape = _PLACEHOLDER.sub("?", sql)
+    shape = _VALUE_LIST.sub("(...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """
+    Statistics of the queries run while handling one request. Queries
+    recorded in nested statistics are also recorded in their ``parent``.
+    """
+
+    def __init__(self, parent: Optional["QueryStats"] = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: "Counter[str]" = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, duration: float) -> None:
+        self._record(fingerprint(sql), duration)
+
+    def _record(self, shape: str, duration: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.shapes[shape] += 1
+        if self.parent is not None:
+            self.parent._record(shape, duration)
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """
+        Query shapes executed at least ``threshold`` times, most frequent
+        first.
+        """
+
+        return {
+            shape: times
+            for shape, times in self.shapes.most_common()
+            if times >= threshold
+        }
+
+
+_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "kite_runner_query_stats", default=None
+)
+
+
+def _instrument(
+    execute: Callable, sql: str, params: Any, many: bool, context: Dict
+) -> Any:
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - start)
+
+
+def _install(connection: Any, **kwargs: Any) -> None:
+    if _instrument not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_instrument)
+
+
+def install() -> None:
+    """
+    Instruments the connections of the current thread and every connection
+    opened from now on, in any thread.
+    """
+
+    connection_created.connect(_install, dispatch_uid="kite_runner_instrumentation")
+    for connection in connections.all():
+        _install(connection)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=_stats.get())
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
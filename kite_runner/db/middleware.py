@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.decorators import sync_and_async_middleware
+
+from kite_runner import cache
+from kite_runner.db import instrumentation, routers
+from kite_runner.db.backends.postgresql_pool.base import get_pool_stats
+from kite_runner.utils import tokens
+
+logger = logging.getLogger(__name__)
+
+# Process-wide statistics logged by ``report_process_stats``, by name.
+PROCESS_STATS: Dict[str, Callable[[], Dict]] = {
+    "db_pool": get_pool_stats,
+    "tokens": tokens.get_stats,
+    "response_cache": cache.get_stats,
+}
+
+_process_stats_reported = float("-inf")
+_process_stats_lock = threading.Lock()
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response: Callable) -> Callable:
+    """
+    Decides where the reads of each request go; see ``kite_runner.db.routers``.
+    """
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def async_middleware(request: Any) -> Any:
+            with routers.request_routing(request):
+                response = await get_response(request)
+            routers.record_write(request, response)
+            return response
+
+        return async_middleware
+
+    def middleware(request: Any) -> Any:
+        with routers.request_routing(request):
+            response = get_response(request)
+        routers.record_write(request, response)
+        return response
+
+    return middleware
+
+
+def report_queries(request: Any, response: Any, stats: Any) -> None:
+    """
+    Adds the statistics of ``stats`` to ``response`` as a ``Server-Timing``
+    entry and ``X-Query-*`` headers, and logs them.
+    """
+
+    repeated = stats.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD)
+    duration = stats.duration * 1000
+
+    timing = f'db;dur={duration:.2f};desc="{stats.count} queries"'
+    if response.has_header("Server-Timing"):
+        timing = f"{response['Server-Timing']}, {timing}"
+    response["Server-Timing"] = timing
+    response["X-Query-Count"] = str(stats.count)
+    if repeated:
+        response["X-Query-Repeated"] = str(len(repeated))
+
+    logger.info(
+        "%s %s %s queries=%d db_ms=%.2f repeated=%d",
+        request.method,
+        request.path,
+        response.status_code,
+        stats.count,
+        duration,
+        len(repeated),
+        extra={
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": stats.count,
+            "db_ms": round(duration, 2),
+            "repeated": repeated,
+        },
+    )
+    for shape, times in repeated.items():
+        logger.warning(
+            "Likely N+1 in %s %s: %d x %s",
+            request.method,
+            request.path,
+            times,
+            shape,
+            extra={"path": request.path, "times": times, "query": shape},
+        )
+
+
+def report_process_stats() -> None:
+    """
+    Logs the statistics of ``PROCESS_STATS``, at most once every
+    ``PROCESS_STATS_INTERVAL`` seconds per process. Counters are cumulative
+    since the process started.
+    """
+
+    global _process_stats_reported
+
+    now = time.monotonic()
+    with _process_stats_lock:
+        if now - _process_stats_reported < settings.PROCESS_STATS_INTERVAL:
+            return
+        _process_stats_reported = now
+
+    for name, get_stats in PROCESS_STATS.items():
+        stats = get_stats()
+        if stats:
+            logger.info(
+                "%s stats: %s", name, stats, extra={"source": name, "stats": stats}
+            )
+
+
+@sync_and_async_middleware
+def query_instrumentation_middleware(get_response: Callable) -> Callable:
+    """
+    Collects SQL statistics for a ``QUERY_INSTRUMENTATION_SAMPLE_RATE``
+    fraction of requests; see ``kite_runner.db.instrumentation``. Sampled
+    requests also log the process statistics; see ``report_process_stats``.
+    Removed from the stack when the rate is zero. Queries run while a
+    streaming response is consumed are not counted.
+    """
+
+    sample_rate = settings.QUERY_INSTRUMENTATION_SAMPLE_RATE
+    if sample_rate <= 0:
+        raise MiddlewareNotUsed()
+
+    instrumentation.install()
+
+    def sampled() -> bool:
+        return sample_rate >= 1 or random.random() < sample_rate
+
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def async_middleware(request: Any) -> Any:
+            if not sampled():
+                return await get_response(request)
+
+            with instrumentation.collect_queries() as stats:
+                response = await get_response(request)
+            report_queries(request, response, stats)
+            report_process_stats()
+            return response
+
+        return async_middleware
+
+    def middleware(request: Any) -> Any:
+        if not sampled():
+            return get_response(request)
+
+        with instrumentation.collect_queries() as stats:
+            response = get_response(request)
+        report_queries(request, response, stats)
+        report_process_stats()
+        return response
+
+    return middleware
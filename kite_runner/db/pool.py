@@ -0,0 +1,194 @@
+"""
+In-process pool of PostgreSQL connections shared by every thread.
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool holding between ``min_size`` and ``max_size`` open
+    connections made by ``connect``.
+
+    ``acquire`` hands out the most recently used idle connection, opening a
+    new one while below ``max_size`` and otherwise waiting up to ``timeout``
+    seconds for a release. Connections idle for longer than
+    ``health_check_interval`` seconds are pinged before being handed out;
+    connections older than ``max_lifetime`` seconds are replaced.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+        max_lifetime: float = 3600.0,
+    ) -> None:
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._opened_at: Dict[Any, float] = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats: Counter = Counter()
+        self._wait_seconds = 0.0
+
+    def acquire(self) -> Any:
+        deadline = time.monotonic() + self.timeout
+        started = time.monotonic()
+
+        while True:
+            connection, last_used = self._checkout(deadline)
+            if connection is None:
+                connection = self._open()
+            elif not self._is_healthy(connection, last_used):
+                self._discard(connection)
+                continue
+
+            with self._condition:
+                self._stats["acquired"] += 1
+                self._wait_seconds += time.monotonic() - started
+            return connection
+
+    def release(self, connection: Any) -> None:
+        reusable = not self._closed and not self._is_expired(connection)
+        if reusable:
+            try:
+                if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                reusable = False
+
+        if not reusable:
+            self._discard(connection)
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def fill(self) -> None:
+        """
+        Opens connections until ``min_size`` are available.
+        """
+
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self._create()
+            except psycopg2.Error:
+                with self._condition:
+                    self._size -= 1
+                return
+            self.release(connection)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+
+        for connection in idle:
+            self._discard(connection)
+
+    def stats(self) -> Dict[str, float]:
+        with self._condition:
+            return {
+                **self._stats,
+                "wait_seconds": self._wait_seconds,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+            }
+
+    def _checkout(self, deadline: float) -> Tuple[Any, float]:
+        """
+        Pops an idle connection, or reserves room for a new one by returning
+        ``(None, 0)``. Waits for a release when the pool is exhausted.
+        """
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise psycopg2.OperationalError("connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0.0
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise psycopg2.OperationalError(
+                        f"connection pool exhausted ({self.max_size} connections)"
+                    )
+                self._stats["waits"] += 1
+                self._condition.wait(remaining)
+
+    def _open(self) -> Any:
+        try:
+            return self._create()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def _create(self) -> Any:
+        connection = self._connect()
+        with self._condition:
+            self._opened_at[connection] = time.monotonic()
+            self._stats["opened"] += 1
+        return connection
+
+    def _discard(self, connection: Any) -> None:
+        with self._condition:
+            self._opened_at.pop(connection, None)
+            self._size -= 1
+            self._stats["discarded"] += 1
+            self._condition.notify()
+
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _is_expired(self, connection: Any) -> bool:
+        opened_at = self._opened_at.get(connection, 0.0)
+        return connection.closed or time.monotonic() - opened_at > self.max_lifetime
+
+    def _is_healthy(self, connection: Any, last_used: float) -> bool:
+        if self._is_expired(connection):
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        with self._condition:
+            self._stats["health_checks"] += 1
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+
+        return True
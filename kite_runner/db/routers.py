@@ -0,0 +1,225 @@
+"""
+Sends the reads of ``GET`` requests to read replicas and everything else to
+the primary.
+
+Routing is decided per request by ``replica_routing_middleware``: write
+requests, reads inside a transaction on the primary and requests of users
+who wrote within the last ``REPLICA_STICKINESS`` seconds stay on the
+primary, so users always see their own writes. Stickiness is kept in the
+default cache, which must be shared by every worker. Other requests pick one
+healthy replica, round-robin, and use it for all their reads. Queries made
+outside a request always go to the primary.
+"""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
+
+STICKY_KEY = "kr:sticky:{}"
+
+
+class Routing:
+    """
+    Routing state of one request: whether it is pinned to the primary and
+    which replica it reads from once one has been picked.
+    """
+
+    def __init__(self, primary: bool) -> None:
+        self.primary = primary
+        self.alias: Optional[str] = None
+
+
+_routing: ContextVar[Optional[Routing]] = ContextVar(
+    "kite_runner_routing", default=None
+)
+
+_health: Dict[str, Tuple[bool, float]] = {}
+_health_lock = threading.Lock()
+_turns = itertools.count()
+
+
+def replicas() -> List[str]:
+    return list(settings.DATABASE_REPLICAS)
+
+
+def stick_to_primary(user_id: Any) -> None:
+    """
+    Routes the reads of ``user_id`` to the primary for the next
+    ``REPLICA_STICKINESS`` seconds.
+    """
+
+    cache.set(STICKY_KEY.format(user_id), True, settings.REPLICA_STICKINESS)
+
+
+def is_sticky(user_id: Any) -> bool:
+    return cache.get(STICKY_KEY.format(user_id), False)
+
+
+def _token_user_id(request: Any) -> Any:
+    """
+    Reads the user id claim of the presented access token without verifying
+    it; it is only used to pick a database, never to authorize anything.
+    """
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+
+    try:
+        payload = token_backend.decode(raw_token, verify=False)
+    except TokenBackendError:
+        return None
+
+    return payload.get(api_settings.USER_ID_CLAIM, None)
+
+
+def _session_user_id(request: Any) -> Any:
+    """
+    Reads the user id of the session the request carries, if any, so users
+    of ``SessionAuthentication`` are kept on the primary after writes too.
+    """
+
+    session = getattr(request, "session", None)
+    if session is None or settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return None
+
+    return session.get(SESSION_KEY, None)
+
+
+def _needs_primary(request: Any) -> bool:
+    if request.method not in SAFE_METHODS or not replicas():
+        return True
+
+    user_id = _token_user_id(request)
+    if user_id is None:
+        user_id = _session_user_id(request)
+    return user_id is not None and is_sticky(user_id)
+
+
+@contextmanager
+def request_routing(request: Any) -> Iterator[Routing]:
+    state = Routing(primary=_needs_primary(request))
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def record_write(request: Any, response: Any) -> None:
+    """
+    Makes the author of a successful write request sticky.
+    """
+
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+
+    user = getattr(request, "user", None)
+    if replicas() and user is not None and user.is_authenticated:
+        stick_to_primary(user.pk)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    Routes the reads of the block to the primary.
+    """
+
+    state = _routing.get()
+    if state is None:
+        yield
+        return
+
+    primary = state.primary
+    state.primary = True
+    try:
+        yield
+    finally:
+        state.primary = primary
+
+
+def _is_healthy(alias: str) -> bool:
+    now = time.monotonic()
+    with _health_lock:
+        entry = _health.get(alias, None)
+    if entry is not None and now - entry[1] < settings.REPLICA_HEALTH_CHECK_INTERVAL:
+        return entry[0]
+
+    connection = connections[alias]
+    try:
+        connection.ensure_connection()
+        healthy = connection.is_usable()
+    except DatabaseError:
+        healthy = False
+    if not healthy:
+        connection.close()
+
+    with _health_lock:
+        _health[alias] = (healthy, now)
+    return healthy
+
+
+def reset_health() -> None:
+    with _health_lock:
+        _health.clear()
+
+
+def pick_replica() -> Optional[str]:
+    """
+    Returns the next healthy replica in round-robin order, or ``None`` when
+    none is available.
+    """
+
+    aliases = replicas()
+    if not aliases:
+        return None
+
+    start = next(_turns)
+    for offset in range(len(aliases)):
+        alias = aliases[(start + offset) % len(aliases)]
+        if _is_healthy(alias):
+            return alias
+
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model: Any, **hints: Any) -> Optional[str]:
+        state = _routing.get()
+        if state is None or state.primary:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+
+        if state.alias is None:
+            state.alias = pick_replica() or DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> Optional[bool]:
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> Optional[bool]:
+        if db in replicas():
+            return False
+        return None
@@ -1,11 +1,25 @@
 import logging
+from typing import Any, Optional
 
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
 logger = logging.getLogger(__name__)
 
 
+class ServiceUnavailable(APIException):
+    status_code = 503
+    default_detail = "Service temporarily unavailable, try again later."
+    default_code = "service_unavailable"
+
+    def __init__(
+        self, detail: Any = None, code: Optional[str] = None, wait: Optional[int] = None
+    ) -> None:
+        super().__init__(detail, code)
+        self.wait = wait
+
+
 def core_exception_handler(exc, context) -> Response:  # type: ignore
     logger.error(exc)
     logger.error(context)
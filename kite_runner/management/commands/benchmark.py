@@ -0,0 +1,437 @@
+import itertools
+import json
+import math
+import statistics
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import (BaseCommand, CommandError,
+                                         CommandParser)
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import URLResolver, get_resolver, resolve
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from kite_runner.db import instrumentation
+from kite_runner.models import Article, Comment, Profile, Tag
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+Fixtures = Dict[str, Any]
+
+
+class Scenario:
+    """
+    One request driven by the benchmark. ``path`` and the strings of
+    ``data`` are formatted with the fixtures, plus whatever ``prepare``
+    returns. Writes run in a transaction that is rolled back afterwards, so
+    every run sees the same data.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        data: Optional[Dict] = None,
+        auth: bool = False,
+        prepare: Optional[Callable[[Fixtures], Fixtures]] = None,
+    ) -> None:
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.auth = auth
+        self.prepare = prepare
+
+    @property
+    def write(self) -> bool:
+        return self.method not in ("GET", "HEAD", "OPTIONS")
+
+    def render(self, fixtures: Fixtures) -> Tuple[str, Optional[str]]:
+        def fill(value: Any) -> Any:
+            if isinstance(value, str):
+                return value.format(**fixtures)
+            if isinstance(value, dict):
+                return {key: fill(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [fill(item) for item in value]
+            return value
+
+        body = None if self.data is None else json.dumps(fill(self.data))
+        return self.path.format(**fixtures), body
+
+
+def own_article(fixtures: Fixtures) -> Fixtures:
+    article = Article.objects.create(
+        title="Benchmark article",
+        description="d",
+        body="b",
+        author_id=fixtures["viewer_id"],
+    )
+    return {"own_slug": article.slug}
+
+
+def own_comment(fixtures: Fixtures) -> Fixtures:
+    comment = Comment.objects.create(
+        body="Benchmark comment",
+        article_id=fixtures["article_id"],
+        author_id=fixtures["viewer_id"],
+    )
+    return {"comment": comment.pk}
+
+
+def favorited(fixtures: Fixtures) -> Fixtures:
+    viewer = Profile.objects.get(pk=fixtures["viewer_id"])
+    viewer.favorite(Article.objects.get(pk=fixtures["article_id"]))
+    return {}
+
+
+def followed(fixtures: Fixtures) -> Fixtures:
+    viewer = Profile.objects.get(pk=fixtures["viewer_id"])
+    viewer.follow(Profile.objects.get(pk=fixtures["author_id"]))
+    return {}
+
+
+ARTICLE = {"article": {"title": "Benchmark {n}", "description": "d", "body": "b"}}
+
+SCENARIOS = [
+    Scenario("articles", "GET", "/api/v1/articles"),
+    Scenario("articles", "GET", "/api/v1/articles", auth=True),
+    Scenario("articles by tag", "GET", "/api/v1/articles?tag={tag}"),
+    Scenario("articles by author", "GET", "/api/v1/articles?author={author}"),
+    Scenario("articles favorited", "GET", "/api/v1/articles?favorited={username}"),
+    Scenario("article", "GET", "/api/v1/articles/{slug}"),
+    Scenario("article", "GET", "/api/v1/articles/{slug}", auth=True),
+    Scenario("feed", "GET", "/api/v1/articles/feed/", auth=True),
+    Scenario("search", "GET", "/api/v1/articles/search?q={word}"),
+    Scenario("comments", "GET", "/api/v1/articles/{slug}/comments/"),
+    Scenario("comments", "GET", "/api/v1/articles/{slug}/comments/", auth=True),
+    Scenario("profile", "GET", "/api/v1/profiles/{author}"),
+    Scenario("profile", "GET", "/api/v1/profiles/{author}", auth=True),
+    Scenario("tags", "GET", "/api/v1/tags/"),
+    Scenario("current user", "GET", "/api/v1/user/", auth=True),
+    Scenario("async articles", "GET", "/api/v1/async/articles"),
+    Scenario("async articles", "GET", "/api/v1/async/articles", auth=True),
+    Scenario("async article", "GET", "/api/v1/async/articles/{slug}"),
+    Scenario("async comments", "GET", "/api/v1/async/articles/{slug}/comments/"),
+    Scenario("async profile", "GET", "/api/v1/async/profiles/{author}"),
+    Scenario("async tags", "GET", "/api/v1/async/tags/"),
+    Scenario(
+        "signup",
+        "POST",
+        "/api/v1/users/",
+        {
+            "user": {
+                "email": "bench{n}@example.com",
+                "username": "bench{n}",
+                "password": "{password}-{n}",
+            }
+        },
+    ),
+    Scenario(
+        "login",
+        "POST",
+        "/api/v1/users/login/",
+        {"user": {"email": "{email}", "password": "{password}"}},
+    ),
+    Scenario(
+        "token", "POST", "/api/token/", {"email": "{email}", "password": "{password}"}
+    ),
+    Scenario("token refresh", "POST", "/api/token/refresh/", {"refresh": "{refresh}"}),
+    Scenario(
+        "update user", "PUT", "/api/v1/user/", {"user": {"bio": "Bio {n}"}}, auth=True
+    ),
+    Scenario("create article", "POST", "/api/v1/articles", ARTICLE, auth=True),
+    Scenario(
+        "update article",
+        "PUT",
+        "/api/v1/articles/{own_slug}",
+        ARTICLE,
+        auth=True,
+        prepare=own_article,
+    ),
+    Scenario(
+        "delete article",
+        "DELETE",
+        "/api/v1/articles/{own_slug}",
+        auth=True,
+        prepare=own_article,
+    ),
+    Scenario("favorite", "POST", "/api/v1/articles/{slug}/favorite/", auth=True),
+    Scenario(
+        "unfavorite",
+        "DELETE",
+        "/api/v1/articles/{slug}/favorite/",
+        auth=True,
+        prepare=favorited,
+    ),
+    Scenario(
+        "comment",
+        "POST",
+        "/api/v1/articles/{slug}/comments/",
+        {"comment": {"body": "Comment {n}"}},
+        auth=True,
+    ),
+    Scenario(
+        "delete comment",
+        "DELETE",
+        "/api/v1/articles/{slug}/comments/{comment}",
+        auth=True,
+        prepare=own_comment,
+    ),
+    Scenario("follow", "POST", "/api/v1/profiles/{author}/follow/", auth=True),
+    Scenario(
+        "unfollow",
+        "DELETE",
+        "/api/v1/profiles/{author}/follow/",
+        auth=True,
+        prepare=followed,
+    ),
+    Scenario(
+        "follow batch",
+        "POST",
+        "/api/v1/user/following",
+        {"follow": ["{author}"]},
+        auth=True,
+    ),
+    Scenario(
+        "favorite batch",
+        "POST",
+        "/api/v1/user/favorites",
+        {"favorite": ["{slug}"]},
+        auth=True,
+    ),
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of ``values``.
+    """
+
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def iter_routes(
+    resolver: URLResolver, prefix: str = ""
+) -> Iterator[Tuple[str, Callable]]:
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern, route)
+        else:
+            yield route, pattern.callback
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives every API route in-process, anonymously and authenticated, and "
+        "reports latency percentiles, throughput and query counts as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Measured requests per route."
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Unmeasured requests per route."
+        )
+        parser.add_argument(
+            "--username",
+            help="User the authenticated requests are made as; defaults to the "
+            "user following the most profiles.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of that user, for the login routes.",
+        )
+        parser.add_argument(
+            "--only", help="Only run scenarios whose name contains this text."
+        )
+        parser.add_argument(
+            "--reads-only", action="store_true", help="Skip the write scenarios."
+        )
+        parser.add_argument(
+            "--response-cache",
+            action="store_true",
+            help="Serve anonymous reads from the response cache. By default it is "
+            "disabled, so every measured request reaches the view.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+
+        fixtures = self.fixtures(options)
+        scenarios = [
+            scenario
+            for scenario in SCENARIOS
+            if (not options["only"] or options["only"] in scenario.name)
+            and not (options["reads_only"] and scenario.write)
+        ]
+
+        instrumentation.install()
+        hosts = [host for host in settings.ALLOWED_HOSTS if "*" not in host]
+        self.client = Client(
+            raise_request_exception=False, SERVER_NAME=(hosts or ["localhost"])[0]
+        )
+        self.counter = itertools.count()
+
+        # Anonymous reads would otherwise be measured as response cache hits
+        # after the first request.
+        response_cache = (
+            nullcontext()
+            if options["response_cache"]
+            else override_settings(RESPONSE_CACHE_TIMEOUT=0)
+        )
+
+        results = []
+        covered = set()
+        with response_cache:
+            for scenario in scenarios:
+                result, callback = self.run(scenario, fixtures, options)
+                results.append(result)
+                covered.add(callback)
+                self.stderr.write(
+                    f"{result['method']} {result['path']} "
+                    f"{'auth' if scenario.auth else 'anon'}: "
+                    f"p50={result['latency_ms']['p50']}ms "
+                    f"p95={result['latency_ms']['p95']}ms "
+                    f"queries={result['queries']['max']}"
+                )
+
+        report = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "requests_per_route": options["requests"],
+            "response_cache": options["response_cache"],
+            "data": {
+                "users": Profile.objects.count(),
+                "articles": Article.objects.count(),
+                "comments": Comment.objects.count(),
+                "tags": Tag.objects.count(),
+            },
+            "results": results,
+            "uncovered_routes": sorted(
+                route
+                for route, callback in iter_routes(get_resolver())
+                if callback not in covered and not route.startswith("admin/")
+            ),
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def fixtures(self, options: Dict) -> Fixtures:
+        """
+        Picks the data the scenarios request: a viewer, the most followed
+        other author, that author's most commented article and a common tag.
+        """
+
+        profiles = Profile.objects.select_related("user")
+        if options["username"]:
+            viewer = profiles.filter(user__username=options["username"]).first()
+        else:
+            viewer = profiles.order_by("-following_count", "pk").first()
+        if viewer is None:
+            raise CommandError("No user to benchmark as; run seed_data first.")
+
+        author = (
+            profiles.exclude(pk=viewer.pk)
+            .filter(articles_count__gt=0)
+            .order_by("-followers_count", "pk")
+            .first()
+        )
+        if author is None:
+            raise CommandError("No articles by other users; run seed_data first.")
+        article = author.articles.order_by("-comments_count", "pk").first()
+        tag = article.tags.order_by("pk").first() or Tag(tag="none")
+
+        return {
+            "viewer_id": viewer.pk,
+            "username": viewer.user.username,
+            "email": viewer.user.email,
+            "password": options["password"],
+            "token": get_user_token(viewer.user),
+            "refresh": str(RefreshToken.for_user(viewer.user)),
+            "author_id": author.pk,
+            "author": author.user.username,
+            "article_id": article.pk,
+            "slug": article.slug,
+            "tag": tag.tag,
+            "word": article.title.split()[0],
+        }
+
+    def run(
+        self, scenario: Scenario, fixtures: Fixtures, options: Dict
+    ) -> Tuple[Dict, Callable]:
+        latencies: List[float] = []
+        queries: List[int] = []
+        statuses: Dict[int, int] = {}
+        cache_hits = 0
+        extra: Dict[str, Any] = {"secure": True}
+        if scenario.auth:
+            extra["HTTP_AUTHORIZATION"] = TOKEN_HEADER.format(fixtures["token"])
+
+        for attempt in range(options["warmup"] + options["requests"]):
+            with transaction.atomic() if scenario.write else nullcontext():
+                values = {**fixtures, "n": next(self.counter)}
+                if scenario.prepare is not None:
+                    values.update(scenario.prepare(values))
+                path, body = scenario.render(values)
+
+                with instrumentation.collect_queries() as stats:
+                    started = time.perf_counter()
+                    response = self.client.generic(
+                        scenario.method,
+                        path,
+                        body or "",
+                        content_type="application/json",
+                        **extra,
+                    )
+                    elapsed = time.perf_counter() - started
+
+                if scenario.write:
+                    transaction.set_rollback(True)
+
+            if attempt < options["warmup"]:
+                continue
+            latencies.append(elapsed * 1000)
+            queries.append(stats.count)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            cache_hits += response.get("X-Cache") == "HIT"
+
+        errors = sum(count for code, count in statuses.items() if code >= 400)
+        total = sum(latencies) / 1000
+        result = {
+            "name": scenario.name,
+            "method": scenario.method,
+            "path": scenario.path,
+            "authenticated": scenario.auth,
+            "requests": len(latencies),
+            "errors": errors,
+            "statuses": statuses,
+            "cache_hits": cache_hits,
+            "latency_ms": {
+                "mean": round(statistics.mean(latencies), 3),
+                "p50": round(percentile(latencies, 0.50), 3),
+                "p95": round(percentile(latencies, 0.95), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+                "max": round(max(latencies), 3),
+            },
+            "throughput_rps": round(len(latencies) / total, 1) if total else None,
+            "queries": {"mean": statistics.mean(queries), "max": max(queries)},
+        }
+        return result, resolve(path.split("?")[0]).func
@@ -0,0 +1,153 @@
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import (BaseCommand, CommandError,
+                                         CommandParser)
+
+from kite_runner.models import User
+
+
+def read_records(stream: IO[str], file_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields ``(line number, record)`` for every record of a CSV stream with a
+    header row or of an NDJSON stream. Unparsable NDJSON lines are yielded
+    as their ``ValueError``.
+    """
+
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as error:
+            yield number, error
+            continue
+        if not isinstance(record, dict):
+            yield number, ValueError("Records must be JSON objects")
+            continue
+        yield number, record
+
+
+def hash_password(record: Any) -> Any:
+    """
+    Replaces the raw ``password`` of ``record`` with its ``password_hash``.
+    """
+
+    if isinstance(record, Exception):
+        return record
+
+    password = record.pop("password", None)
+    if password and not record.get("password_hash", None):
+        if not isinstance(password, str):
+            return ValueError("Passwords must be strings")
+        record["password_hash"] = make_password(password)
+    return record
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates users and their profiles in bulk from a CSV or NDJSON file with "
+        "email, username and password or password_hash fields (bio and image "
+        "optional). Existing emails and usernames are skipped."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="File to read, or - for standard input.")
+        parser.add_argument(
+            "--format",
+            choices=("csv", "ndjson"),
+            help="Defaults to csv for .csv files and ndjson otherwise.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Records inserted per transaction.",
+        )
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Threads hashing raw passwords.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: str = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.endswith(".csv") else "ndjson"
+        )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        if path == "-":
+            self.provision(sys.stdin, file_format, options)
+            return
+
+        try:
+            stream = open(path, newline="", encoding="utf-8")
+        except OSError as error:
+            raise CommandError(f"Cannot read {path}: {error}")
+        with stream:
+            self.provision(stream, file_format, options)
+
+    def provision(self, stream: IO[str], file_format: str, options: Dict) -> None:
+        self.read = self.created = self.invalid = 0
+        started = time.perf_counter()
+        records = read_records(stream, file_format)
+
+        with ThreadPoolExecutor(max_workers=options["hash_workers"]) as hashers:
+            while True:
+                batch = list(itertools.islice(records, options["batch_size"]))
+                if not batch:
+                    break
+                self.provision_batch(batch, hashers)
+
+                elapsed = time.perf_counter() - started
+                self.stderr.write(
+                    f"{self.read} read, {self.created} created "
+                    f"({self.created / elapsed:.0f} users/s)"
+                )
+
+        elapsed = time.perf_counter() - started
+        skipped = self.read - self.created - self.invalid
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {self.created} users in {elapsed:.1f}s "
+                f"({self.created / elapsed if elapsed else 0:.0f} users/s); "
+                f"skipped {skipped} duplicate and {self.invalid} invalid records."
+            )
+        )
+
+    def provision_batch(
+        self, batch: List[Tuple[int, Any]], hashers: ThreadPoolExecutor
+    ) -> None:
+        self.read += len(batch)
+
+        hashed = hashers.map(hash_password, [record for _, record in batch])
+
+        valid = []
+        for (number, _), record in zip(batch, hashed):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                User.objects.build(record)
+            except ValueError as error:
+                self.invalid += 1
+                self.stderr.write(f"Line {number}: {error}")
+                continue
+            valid.append(record)
+
+        self.created += len(User.objects.provision(valid))
@@ -0,0 +1,57 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from kite_runner.models import Profile, TimelineEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the materialized feed timelines from the follow graph."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--pending",
+            action="store_true",
+            help=(
+                "Only fan out the articles of authors that dropped back under "
+                "TIMELINE_FANOUT_LIMIT, instead of rebuilding every timeline."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of followers fanned out to per statement with --pending.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["pending"]:
+            self.fan_out_pending(options["batch_size"])
+            return
+
+        rebuilt = 0
+
+        for profile in Profile.objects.only("pk").order_by("pk").iterator():
+            with transaction.atomic():
+                TimelineEntry.objects.filter(profile=profile).delete()
+                followee_ids = profile.following.values_list("pk", flat=True)
+                TimelineEntry.objects.backfill_many(
+                    profile, [profile.pk, *followee_ids]
+                )
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} timelines."))
+
+    def fan_out_pending(self, batch_size: int) -> None:
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        pending = Profile.objects.filter(fanout_pending=True).order_by("pk")
+        author_ids = list(pending.values_list("pk", flat=True))
+
+        for author_id in author_ids:
+            followers = TimelineEntry.objects.fan_out_pending(author_id, batch_size)
+            self.stdout.write(f"Author {author_id}: fanned out to {followers} followers")
+
+        self.stdout.write(self.style.SUCCESS(f"Fanned out {len(author_ids)} authors."))
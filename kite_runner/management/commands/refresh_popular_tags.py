@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from kite_runner.models import PopularTag
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the popular tag rankings of every window. The tag cloud "
+        "only reads them, so run this periodically, e.g. from cron."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for window in PopularTag.objects.windows():
+            ranked = PopularTag.objects.refresh(window)
+            self.stdout.write(
+                self.style.SUCCESS(f"Ranked {ranked} tags for window {window!r}.")
+            )
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import models, transaction
+
+from kite_runner import cache
+from kite_runner.models import Article
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search vector of articles in batches."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of primary keys updated per statement.",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only index articles that have never been indexed.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        last_pk = Article.objects.aggregate(last=models.Max("pk"))["last"] or 0
+        indexed = 0
+
+        for start in range(0, last_pk + 1, batch_size):
+            batch = Article.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+            if options["missing_only"]:
+                batch = batch.filter(search_vector__isnull=True)
+
+            with transaction.atomic():
+                indexed += batch.update_search_vector()
+
+        cache.bump(cache.ARTICLES)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} articles."))
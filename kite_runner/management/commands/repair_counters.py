@@ -0,0 +1,51 @@
+from typing import Any, Iterator, Tuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import models, transaction
+
+from kite_runner.models import Article, Comment, Profile
+from kite_runner.models.counters import count_subquery
+
+
+def _counters() -> Iterator[Tuple[Any, str, Any]]:
+    favourites = Profile.favourites.through.objects.all()
+    following = Profile.following.through.objects.all()
+
+    yield Article, "favorites_count", count_subquery(favourites, "article_id")
+    yield Article, "comments_count", count_subquery(Comment.objects.all(), "article_id")
+    yield Profile, "followers_count", count_subquery(following, "to_profile_id")
+    yield Profile, "following_count", count_subquery(following, "from_profile_id")
+    yield Profile, "articles_count", count_subquery(Article.objects.all(), "author_id")
+
+
+class Command(BaseCommand):
+    help = "Recomputes denormalized counters and repairs rows that drifted."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Number of primary keys updated per statement.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size: int = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        for model, field, actual in _counters():
+            last_pk = model.objects.aggregate(last=models.Max("pk"))["last"] or 0
+            repaired = 0
+
+            for start in range(0, last_pk + 1, batch_size):
+                with transaction.atomic():
+                    repaired += (
+                        model.objects.filter(pk__gte=start, pk__lt=start + batch_size)
+                        .exclude(**{field: actual})
+                        .update(**{field: actual})
+                    )
+
+            self.stdout.write(f"{model.__name__}.{field}: repaired {repaired} rows")
+
+        self.stdout.write(self.style.SUCCESS("Counters repaired."))
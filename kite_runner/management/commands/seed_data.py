@@ -0,0 +1,290 @@
+import itertools
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import (BaseCommand, CommandError,
+                                         CommandParser)
+from django.db import transaction
+
+from kite_runner import cache
+from kite_runner.models import (Article, Comment, Profile, Tag,
+                                TimelineEntry, User)
+from kite_runner.models.article import slug_base
+
+WORDS = (
+    "async cache database django feed index kite latency model python query "
+    "replica runner schema search server slug stream table timeline token"
+).split()
+
+
+def zipf_weights(size: int) -> List[float]:
+    """
+    Cumulative weights giving the item of rank ``r`` a ``1 / (r + 1)`` share,
+    so a few profiles, articles and tags get most of the attention.
+    """
+
+    return list(itertools.accumulate(1 / (rank + 1) for rank in range(size)))
+
+
+def pick(
+    rng: random.Random, size: int, weights: Sequence[float], count: int
+) -> Set[int]:
+    if not size or count <= 0:
+        return set()
+    return set(rng.choices(range(size), cum_weights=weights, k=count))
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds users, articles, tags, follows, favorites and comments with bulk "
+        "inserts, for benchmarking at realistic scale."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--articles", type=int, default=5000)
+        parser.add_argument("--tags", type=int, default=100)
+        parser.add_argument(
+            "--tags-per-article",
+            type=int,
+            default=3,
+            help="Tags drawn per article; duplicates are dropped.",
+        )
+        parser.add_argument(
+            "--follows", type=int, default=20, help="Follows drawn per user."
+        )
+        parser.add_argument(
+            "--favorites", type=int, default=20, help="Favorites drawn per user."
+        )
+        parser.add_argument(
+            "--comments", type=int, default=3, help="Comments per article on average."
+        )
+        parser.add_argument(
+            "--prefix",
+            default="seed",
+            help="Prefix of generated usernames, emails, slugs and tags.",
+        )
+        parser.add_argument(
+            "--password", default="password", help="Password of every seeded user."
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.rng = random.Random(options["seed"])
+        self.batch_size: int = options["batch_size"]
+        prefix: str = options["prefix"]
+
+        if options["articles"] and not options["users"]:
+            raise CommandError("Seeding articles needs at least one user.")
+        if User.objects.filter(username=f"{prefix}0").exists():
+            raise CommandError(
+                f"Users prefixed {prefix!r} already exist; pass another --prefix."
+            )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            profiles = self.seed_profiles(options)
+            articles = self.seed_articles(options, profiles)
+            self.seed_edges(options, profiles, articles)
+            self.seed_timelines(profiles)
+
+        # Bulk inserts send no signals, so nothing else invalidated the cache.
+        cache.bump(cache.ARTICLES, cache.PROFILES, cache.TAGS)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded in {time.perf_counter() - started:.1f}s.")
+        )
+
+    def report(self, label: str, rows: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(f"{label}: {rows} rows in {elapsed:.1f}s ({rate:.0f}/s)")
+
+    def plan(self, options: Dict) -> None:
+        """
+        Draws the follow graph, article authors, favorites and comments up
+        front, so the counters can be inserted along with the rows.
+        """
+
+        users, articles = options["users"], options["articles"]
+        rng = self.rng
+        profile_weights = zipf_weights(users)
+        article_weights = zipf_weights(articles)
+
+        self.follows: List[Tuple[int, int]] = [
+            (source, target)
+            for source in range(users)
+            for target in sorted(
+                pick(rng, users, profile_weights, options["follows"]) - {source}
+            )
+        ]
+        self.authors = rng.choices(
+            range(users), cum_weights=profile_weights, k=articles
+        )
+        self.favorites: List[Tuple[int, int]] = [
+            (profile, article)
+            for profile in range(users)
+            for article in sorted(
+                pick(rng, articles, article_weights, options["favorites"])
+            )
+        ]
+        self.comments: List[Tuple[int, int]] = (
+            [
+                (rng.randrange(users), article)
+                for article in rng.choices(
+                    range(articles),
+                    cum_weights=article_weights,
+                    k=articles * options["comments"],
+                )
+            ]
+            if users and articles
+            else []
+        )
+
+    def seed_profiles(self, options: Dict) -> List[Profile]:
+        self.plan(options)
+        prefix = options["prefix"]
+
+        started = time.perf_counter()
+        password = make_password(options["password"])
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"{prefix}{index}@example.com",
+                    username=f"{prefix}{index}",
+                    password=password,
+                )
+                for index in range(options["users"])
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Users", len(users), started)
+
+        started = time.perf_counter()
+        followers = Counter(target for _, target in self.follows)
+        following = Counter(source for source, _ in self.follows)
+        articles = Counter(self.authors)
+        profiles = Profile.objects.bulk_create(
+            [
+                Profile(
+                    user=user,
+                    followers_count=followers[index],
+                    following_count=following[index],
+                    articles_count=articles[index],
+                )
+                for index, user in enumerate(users)
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Profiles", len(profiles), started)
+        return profiles
+
+    def seed_articles(self, options: Dict, profiles: List[Profile]) -> List[Article]:
+        rng = self.rng
+        prefix = options["prefix"]
+
+        started = time.perf_counter()
+        favorites = Counter(article for _, article in self.favorites)
+        comments = Counter(article for _, article in self.comments)
+        articles = []
+        for index, author in enumerate(self.authors):
+            title = " ".join(rng.choices(WORDS, k=4)).capitalize()
+            articles.append(
+                Article(
+                    slug=f"{slug_base(title)}-{prefix}{index}",
+                    title=title,
+                    description=" ".join(rng.choices(WORDS, k=12)),
+                    body=" ".join(rng.choices(WORDS, k=rng.randint(50, 300))),
+                    author=profiles[author],
+                    favorites_count=favorites[index],
+                    comments_count=comments[index],
+                )
+            )
+        articles = Article.objects.bulk_create(articles, batch_size=self.batch_size)
+        self.report("Articles", len(articles), started)
+
+        started = time.perf_counter()
+        tags = Tag.objects.resolve(
+            f"{prefix}-tag{index}" for index in range(options["tags"])
+        )
+        tag_weights = zipf_weights(len(tags))
+        through = Article.tags.through
+        taggings = through.objects.bulk_create(
+            [
+                through(article_id=article.pk, tag_id=tags[tag].pk)
+                for article in articles
+                for tag in sorted(
+                    pick(rng, len(tags), tag_weights, options["tags_per_article"])
+                )
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Taggings", len(taggings), started)
+
+        started = time.perf_counter()
+        for start in range(0, len(articles), self.batch_size):
+            stop = start + self.batch_size
+            batch = articles[start:stop]
+            Article.objects.filter(pk__in=[a.pk for a in batch]).update_search_vector()
+        self.report("Search vectors", len(articles), started)
+        return articles
+
+    def seed_edges(
+        self, options: Dict, profiles: List[Profile], articles: List[Article]
+    ) -> None:
+        started = time.perf_counter()
+        through = Profile.following.through
+        follows = through.objects.bulk_create(
+            [
+                through(
+                    from_profile_id=profiles[source].pk,
+                    to_profile_id=profiles[target].pk,
+                )
+                for source, target in self.follows
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Follows", len(follows), started)
+
+        started = time.perf_counter()
+        through = Profile.favourites.through
+        favorites = through.objects.bulk_create(
+            [
+                through(
+                    profile_id=profiles[profile].pk, article_id=articles[article].pk
+                )
+                for profile, article in self.favorites
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Favorites", len(favorites), started)
+
+        started = time.perf_counter()
+        comments = Comment.objects.bulk_create(
+            [
+                Comment(
+                    body=" ".join(self.rng.choices(WORDS, k=self.rng.randint(5, 40))),
+                    article=articles[article],
+                    author=profiles[author],
+                )
+                for author, article in self.comments
+            ],
+            batch_size=self.batch_size,
+        )
+        self.report("Comments", len(comments), started)
+
+    def seed_timelines(self, profiles: List[Profile]) -> None:
+        started = time.perf_counter()
+        followees: Dict[int, List[int]] = {}
+        for source, target in self.follows:
+            followees.setdefault(source, []).append(profiles[target].pk)
+
+        for index, profile in enumerate(profiles):
+            TimelineEntry.objects.backfill_many(
+                profile, [profile.pk, *followees.get(index, [])]
+            )
+        self.report("Timelines", len(profiles), started)
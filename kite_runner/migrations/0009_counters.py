@@ -0,0 +1,72 @@
+# Generated by Django 3.2.7 on 2026-10-18 17:58
+
+from typing import Any
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset: QuerySet, outer_field: str) -> Coalesce:
+    counted = (
+        queryset.filter(**{outer_field: OuterRef("pk")})
+        .order_by()
+        .values(outer_field)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def populate_counters(apps: Any, schema_editor: Any) -> None:
+    Article = apps.get_model("kite_runner", "Article")
+    Comment = apps.get_model("kite_runner", "Comment")
+    Profile = apps.get_model("kite_runner", "Profile")
+    favourites = Profile.favourites.through.objects
+    following = Profile.following.through.objects
+
+    Article.objects.update(
+        favorites_count=_count(favourites, "article_id"),
+        comments_count=_count(Comment.objects, "article_id"),
+    )
+    Profile.objects.update(
+        followers_count=_count(following, "to_profile_id"),
+        following_count=_count(following, "from_profile_id"),
+        articles_count=_count(Article.objects, "author_id"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kite_runner", "0008_timelineentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="favorites_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="articles_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
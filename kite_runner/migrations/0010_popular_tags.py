@@ -0,0 +1,46 @@
+# Generated by Django 3.2.7 on 2026-10-18 18:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kite_runner", "0009_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PopularTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("window", models.CharField(max_length=16)),
+                ("rank", models.PositiveIntegerField()),
+                ("articles_count", models.PositiveIntegerField()),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rankings",
+                        to="kite_runner.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="populartag",
+            constraint=models.UniqueConstraint(
+                fields=("window", "rank"), name="unique_popular_tag_rank"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.7 on 2026-10-18 18:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The index is built without locking the articles table against writes.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0010_popular_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="article_search_idx"
+            ),
+        ),
+    ]
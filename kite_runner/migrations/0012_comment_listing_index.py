@@ -0,0 +1,23 @@
+# Generated by Django 3.2.7 on 2026-10-18 18:27
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without locking the comments table against writes.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0011_article_search"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "created_at", "id"],
+                name="comment_article_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 3.2.7 on 2026-10-18 18:49
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+def through_index(name: str, table: str, columns: str) -> migrations.RunSQL:
+    """
+    Builds an index on an auto-created many-to-many table, which has no
+    ``Meta.indexes`` of its own.
+    """
+
+    return migrations.RunSQL(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})",
+        f"DROP INDEX CONCURRENTLY IF EXISTS {name}",
+    )
+
+
+class Migration(migrations.Migration):
+    # Built without locking the articles and link tables against writes.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0012_comment_listing_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="article",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AlterModelOptions(
+            name="comment",
+            options={"ordering": ["created_at", "id"]},
+        ),
+        AddIndexConcurrently(
+            model_name="article",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="article_created_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="article",
+            index=models.Index(
+                fields=["-favorites_count", "-id"], name="article_favorites_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="article_author_created_idx",
+            ),
+        ),
+        # Reverse lookups: favoriters of an article, followers of a profile
+        # and articles of a tag, answered from the index alone.
+        through_index(
+            "favourite_article_profile_idx",
+            "kite_runner_profile_favourites",
+            "article_id, profile_id",
+        ),
+        through_index(
+            "following_to_from_idx",
+            "kite_runner_profile_following",
+            "to_profile_id, from_profile_id",
+        ),
+        through_index(
+            "article_tag_tag_article_idx",
+            "kite_runner_article_tags",
+            "tag_id, article_id",
+        ),
+    ]
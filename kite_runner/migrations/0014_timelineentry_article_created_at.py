@@ -0,0 +1,47 @@
+# Generated by Django 3.2.7 on 2026-10-18 19:05
+
+from typing import Any
+
+from django.db import migrations, models
+
+BATCH_SIZE = 10000
+
+
+def backfill_article_created_at(apps: Any, schema_editor: Any) -> None:
+    TimelineEntry = apps.get_model("kite_runner", "TimelineEntry")
+    last_pk = TimelineEntry.objects.aggregate(last=models.Max("pk"))["last"] or 0
+
+    # One short transaction per batch of timeline rows, as the migration is
+    # not atomic.
+    with schema_editor.connection.cursor() as cursor:
+        for start in range(0, last_pk + 1, BATCH_SIZE):
+            cursor.execute(
+                """
+                UPDATE kite_runner_timelineentry AS entry
+                SET article_created_at = article.created_at
+                FROM kite_runner_article AS article
+                WHERE article.id = entry.article_id
+                    AND entry.id >= %s AND entry.id < %s
+                    AND entry.article_created_at IS NULL
+                """,
+                [start, start + BATCH_SIZE],
+            )
+
+
+class Migration(migrations.Migration):
+    # Backfilled in batches instead of rewriting every timeline row under a
+    # single lock. The column is made NOT NULL by a later migration.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0013_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="timelineentry",
+            name="article_created_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_article_created_at, migrations.RunPython.noop),
+    ]
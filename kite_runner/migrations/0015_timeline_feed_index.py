@@ -0,0 +1,23 @@
+# Generated by Django 3.2.7 on 2026-10-18 19:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without locking the timelines against fan-out writes.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0014_timelineentry_article_created_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["profile", "-article_created_at", "-article"],
+                name="timeline_feed_idx",
+            ),
+        ),
+    ]
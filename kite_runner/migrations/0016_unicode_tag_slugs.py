@@ -0,0 +1,30 @@
+# Generated by Django 3.2.7 on 2026-10-18 19:20
+
+from typing import Any
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def reslug_tags(apps: Any, schema_editor: Any) -> None:
+    Tag = apps.get_model("kite_runner", "Tag")
+    taken = set(Tag.objects.values_list("slug", flat=True))
+
+    for tag in Tag.objects.only("tag", "slug").iterator():
+        slug = slugify(tag.tag, allow_unicode=True)
+        # A tag already owning the new slug keeps it; this one keeps its own.
+        if slug and slug != tag.slug and slug not in taken:
+            taken.discard(tag.slug)
+            taken.add(slug)
+            Tag.objects.filter(pk=tag.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kite_runner", "0015_timeline_feed_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(reslug_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.7 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("kite_runner", "0016_unicode_tag_slugs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="fanout_pending",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.7 on 2026-10-18 19:40
+
+from django.db import migrations, models
+
+CHECK = "timelineentry_article_created_at_not_null"
+
+
+class Migration(migrations.Migration):
+    # Every statement commits on its own: the constraint is validated without
+    # blocking writes, and lets SET NOT NULL skip its own full-table scan.
+    atomic = False
+
+    dependencies = [
+        ("kite_runner", "0017_profile_fanout_pending"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [
+                f"ALTER TABLE kite_runner_timelineentry ADD CONSTRAINT {CHECK} "
+                "CHECK (article_created_at IS NOT NULL) NOT VALID",
+                f"ALTER TABLE kite_runner_timelineentry VALIDATE CONSTRAINT {CHECK}",
+                "ALTER TABLE kite_runner_timelineentry "
+                "ALTER COLUMN article_created_at SET NOT NULL",
+                f"ALTER TABLE kite_runner_timelineentry DROP CONSTRAINT {CHECK}",
+            ],
+            "ALTER TABLE kite_runner_timelineentry "
+            "ALTER COLUMN article_created_at DROP NOT NULL",
+            state_operations=[
+                migrations.AlterField(
+                    model_name="timelineentry",
+                    name="article_created_at",
+                    field=models.DateTimeField(),
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,17 @@
 from .article import Article
 from .comment import Comment
 from .profile import Profile
-from .tag import Tag
+from .tag import PopularTag, Tag
+from .timeline import TimelineEntry
 from .user import User, UserManager
 
-__all__ = ["User", "UserManager", "Profile", "Article", "Tag", "Comment"]
+__all__ = [
+    "User",
+    "UserManager",
+    "Profile",
+    "Article",
+    "Tag",
+    "PopularTag",
+    "Comment",
+    "TimelineEntry",
+]
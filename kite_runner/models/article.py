@@ -1,9 +1,124 @@
-from django.db import models
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector, SearchVectorField)
+from django.db import IntegrityError, models, router, transaction
+from django.db.models.functions import Cast, Coalesce, Substr
 from django.template.defaultfilters import slugify
+from psycopg2 import errorcodes
+
+if TYPE_CHECKING:
+    from kite_runner.models.timeline import Feed
+
+SLUG_MAX_LENGTH = 255
+
+# Room left in the slug for a ``-<suffix>`` of up to nine digits.
+SLUG_BASE_LENGTH = SLUG_MAX_LENGTH - 10
+
+SLUG_ALLOCATION_ATTEMPTS = 5
+
+
+def slug_base(title: str) -> str:
+    """
+    Slug an article titled ``title`` gets when no other article uses it.
+    """
+
+    return slugify(title)[:SLUG_BASE_LENGTH].strip("-") or "article"
+
+
+class ArticleQuerySet(models.QuerySet):
+    def feed_for(self, profile: Any) -> "Feed":
+        """
+        Articles on the materialized timeline of ``profile``, merged with the
+        articles of followed authors that are not fanned out on write.
+        """
+
+        from kite_runner.models.timeline import Feed, TimelineEntry
+
+        skipped_authors = TimelineEntry.objects.fanout_skipped_authors(profile)
+        return Feed(self, profile.pk, [row["pk"] for row in skipped_authors])
+
+    def for_display(self) -> "ArticleQuerySet":
+        """
+        Loads everything ``ArticleSerializer`` renders in a constant number
+        of queries. Viewer flags are batched by ``ViewerRelations``.
+        """
+
+        return self.select_related("author", "author__user").prefetch_related("tags")
+
+    def search(self, text: str) -> "ArticleQuerySet":
+        """
+        Articles matching the web-search style query ``text``, annotated with
+        their ``rank``. Matching is served by the GIN index on
+        ``search_vector``.
+        """
+
+        query = SearchQuery(
+            text, config=settings.SEARCH_CONFIG, search_type="websearch"
+        )
+
+        # ts_rank returns a ``real``; compare cursors in double precision so
+        # the ranks round-trip exactly through keyset pagination.
+        rank = Cast(SearchRank(models.F("search_vector"), query), models.FloatField())
+
+        return self.filter(search_vector=query).annotate(rank=rank)
+
+    def free_slug(self, base: str) -> str:
+        """
+        ``base`` when no article uses it, otherwise ``base`` suffixed with one
+        more than the highest numeric suffix taken. A single query, served by
+        the pattern index on ``slug``.
+        """
+
+        taken = models.Q(slug=base) | models.Q(
+            slug__startswith=f"{base}-", slug__regex=rf"^{base}-[0-9]{{1,9}}$"
+        )
+        suffix = models.Case(
+            models.When(slug=base, then=models.Value(1)),
+            default=Cast(Substr("slug", len(base) + 2), models.IntegerField()),
+        )
+        highest = self.filter(taken).aggregate(highest=models.Max(suffix))["highest"]
+
+        if highest is None:
+            return base
+        return f"{base}-{highest + 1}"
+
+    def update_search_vector(self) -> int:
+        """
+        Recomputes ``search_vector`` from title, tags, description and body
+        for every article in the queryset with a single ``UPDATE``.
+        """
+
+        from kite_runner.models.tag import Tag
+
+        tag_names = (
+            Tag.objects.filter(articles=models.OuterRef("pk"))
+            .order_by()
+            .values("articles")
+            .annotate(names=StringAgg("tag", delimiter=" "))
+            .values("names")
+        )
+        config = settings.SEARCH_CONFIG
+
+        return self.update(
+            search_vector=(
+                SearchVector("title", weight="A", config=config)
+                + SearchVector(
+                    Coalesce(models.Subquery(tag_names), models.Value("")),
+                    weight="B",
+                    config=config,
+                )
+                + SearchVector("description", weight="B", config=config)
+                + SearchVector("body", weight="C", config=config)
+            )
+        )
 
 
 class Article(models.Model):
-    slug = models.SlugField(max_length=255, unique=True, db_index=True)
+    slug = models.SlugField(max_length=SLUG_MAX_LENGTH, unique=True, db_index=True)
     title = models.CharField(max_length=255)
     description = models.TextField()
     body = models.TextField()
@@ -13,10 +128,58 @@ class Article(models.Model):
     author = models.ForeignKey(
         "kite_runner.Profile", on_delete=models.CASCADE, related_name="articles"
     )
+    favorites_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="article_search_idx"),
+            models.Index(fields=["-created_at", "-id"], name="article_created_idx"),
+            models.Index(
+                fields=["-favorites_count", "-id"], name="article_favorites_idx"
+            ),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="article_author_created_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
     def save(self, *args, **kwargs) -> None:  # type: ignore
-        self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
+        if self._state.adding and not self.slug:
+            self._insert_with_free_slug(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        Article.objects.filter(pk=self.pk).update_search_vector()
+
+    def _insert_with_free_slug(self, *args, **kwargs) -> None:  # type: ignore
+        """
+        Inserts the article under the first free slug for its title. The slug
+        is assigned once and kept when the article is retitled; a concurrent
+        insert that takes the same slug first makes this one pick the next.
+        """
+
+        using = kwargs.get("using", None) or router.db_for_write(Article, instance=self)
+        base = slug_base(self.title)
+
+        for attempt in range(1, SLUG_ALLOCATION_ATTEMPTS + 1):
+            self.slug = Article.objects.using(using).free_slug(base)
+            try:
+                with transaction.atomic(using=using):
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError as error:
+                # ``slug`` is the only unique column that is not generated.
+                unique_violation = (
+                    getattr(error.__cause__, "pgcode", None)
+                    == errorcodes.UNIQUE_VIOLATION
+                )
+                if not unique_violation or attempt == SLUG_ALLOCATION_ATTEMPTS:
+                    self.slug = ""
+                    raise
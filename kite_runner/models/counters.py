@@ -0,0 +1,37 @@
+from typing import Any
+
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+
+
+def increment(queryset: models.QuerySet, **deltas: int) -> int:
+    """
+    Atomically adds ``deltas`` to counter columns of every row in
+    ``queryset`` with a single ``UPDATE``, never going below zero.
+    """
+
+    return queryset.update(
+        **{
+            field: Greatest(models.F(field) + delta, 0)
+            for field, delta in deltas.items()
+        }
+    )
+
+
+def count_subquery(queryset: models.QuerySet, outer_field: str) -> Any:
+    """
+    Correlated ``COUNT(*)`` of ``queryset`` rows whose ``outer_field``
+    matches the outer row primary key.
+    """
+
+    counted = (
+        queryset.filter(**{outer_field: models.OuterRef("pk")})
+        .order_by()
+        .values(outer_field)
+        .annotate(count=models.Count("*"))
+        .values("count")
+    )
+
+    return Coalesce(
+        models.Subquery(counted, output_field=models.IntegerField()), 0
+    )
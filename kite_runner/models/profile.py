@@ -1,8 +1,55 @@
 from __future__ import annotations
 
-from django.db import models
+from typing import Any, Iterable, Set
 
+from django.db import connections, models, router, transaction
+
+from kite_runner import cache
 from kite_runner.models import Article
+from kite_runner.models.counters import increment
+from kite_runner.models.timeline import TimelineEntry
+
+INSERT_EDGES = (
+    "INSERT INTO {table} ({source}, {target}) SELECT %s, unnest(%s) "
+    "ON CONFLICT DO NOTHING RETURNING {target}"
+)
+DELETE_EDGES = (
+    "DELETE FROM {table} WHERE {source} = %s AND {target} = ANY(%s) "
+    "RETURNING {target}"
+)
+
+
+def _change_edges(
+    statement: str,
+    through: Any,
+    source: str,
+    source_id: int,
+    target: str,
+    target_ids: Iterable[int],
+) -> Set[int]:
+    """
+    Runs ``INSERT_EDGES`` or ``DELETE_EDGES`` on the ``through`` table for
+    the edges from ``source_id`` to every id in ``target_ids``, and returns
+    the target ids whose edge was actually created or deleted.
+    """
+
+    # Sorted, so concurrent batches touch rows in the same order.
+    target_ids = sorted(set(target_ids))
+    if not target_ids:
+        return set()
+
+    connection = connections[router.db_for_write(through)]
+    qn = connection.ops.quote_name
+    meta = through._meta
+    sql = statement.format(
+        table=qn(meta.db_table),
+        source=qn(meta.get_field(source).column),
+        target=qn(meta.get_field(target).column),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [source_id, target_ids])
+        return {target_id for (target_id,) in cursor.fetchall()}
 
 
 class Profile(models.Model):
@@ -17,15 +64,71 @@ class Profile(models.Model):
     favourites = models.ManyToManyField(
         "kite_runner.Article", related_name="favorited_by"
     )
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    articles_count = models.PositiveIntegerField(default=0)
+    # Dropped back under ``TIMELINE_FANOUT_LIMIT`` with articles that were
+    # never fanned out; merged into feeds at read time until they are.
+    fanout_pending = models.BooleanField(default=False)
 
     def __str__(self):
         return self.user.username
 
     def follow(self, profile: Profile) -> None:
-        self.following.add(profile)
+        self.follow_many([profile])
+
+    def follow_many(self, profiles: Iterable[Profile]) -> Set[int]:
+        """
+        Follows every profile in ``profiles`` with one insert into the follow
+        table and returns the ids of those that were not followed yet.
+        """
+
+        with transaction.atomic():
+            followed = _change_edges(
+                INSERT_EDGES,
+                Profile.following.through,
+                "from_profile",
+                self.pk,
+                "to_profile",
+                [profile.pk for profile in profiles],
+            )
+            if followed:
+                increment(
+                    Profile.objects.filter(pk=self.pk), following_count=len(followed)
+                )
+                increment(Profile.objects.filter(pk__in=followed), followers_count=1)
+                TimelineEntry.objects.backfill_many(self, followed)
+
+        return followed
 
     def unfollow(self, profile: Profile) -> None:
-        self.following.remove(profile)
+        self.unfollow_many([profile])
+
+    def unfollow_many(self, profiles: Iterable[Profile]) -> Set[int]:
+        """
+        Unfollows every profile in ``profiles`` with one delete from the
+        follow table and returns the ids of those that were followed.
+        """
+
+        with transaction.atomic():
+            unfollowed = _change_edges(
+                DELETE_EDGES,
+                Profile.following.through,
+                "from_profile",
+                self.pk,
+                "to_profile",
+                [profile.pk for profile in profiles],
+            )
+            if unfollowed:
+                increment(
+                    Profile.objects.filter(pk=self.pk),
+                    following_count=-len(unfollowed),
+                )
+                increment(Profile.objects.filter(pk__in=unfollowed), followers_count=-1)
+                TimelineEntry.objects.trim_many(self, unfollowed)
+                TimelineEntry.objects.mark_unskipped(unfollowed)
+
+        return unfollowed
 
     def is_following(self, profile: Profile) -> bool:
         return self.following.filter(pk=profile.pk).exists()
@@ -34,10 +137,49 @@ class Profile(models.Model):
         return self.followed_by.filter(pk=profile.pk).exists()
 
     def favorite(self, article: Article) -> None:
-        self.favourites.add(article)
+        self.favorite_many([article])
+
+    def favorite_many(self, articles: Iterable[Article]) -> Set[int]:
+        """
+        Favorites every article in ``articles`` with one insert into the
+        favorites table and returns the ids of those that were not favorited
+        yet.
+        """
+
+        return self._change_favorites(INSERT_EDGES, articles, 1)
 
     def unfavorite(self, article: Article) -> None:
-        self.favourites.remove(article)
+        self.unfavorite_many([article])
+
+    def unfavorite_many(self, articles: Iterable[Article]) -> Set[int]:
+        """
+        Unfavorites every article in ``articles`` with one delete from the
+        favorites table and returns the ids of those that were favorited.
+        """
+
+        return self._change_favorites(DELETE_EDGES, articles, -1)
+
+    def _change_favorites(
+        self, statement: str, articles: Iterable[Article], delta: int
+    ) -> Set[int]:
+        slugs = {article.pk: article.slug for article in articles}
+
+        with transaction.atomic():
+            changed = _change_edges(
+                statement,
+                Profile.favourites.through,
+                "profile",
+                self.pk,
+                "article",
+                slugs,
+            )
+            if changed:
+                increment(Article.objects.filter(pk__in=changed), favorites_count=delta)
+                cache.bump(
+                    cache.ARTICLES, *[cache.article_scope(slugs[pk]) for pk in changed]
+                )
+
+        return changed
 
     def has_favorited(self, article: Article) -> bool:
         return self.favourites.filter(pk=article.pk).exists()
@@ -1,14 +1,209 @@
-from django.db import models
-from django.template.defaultfilters import slugify
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from kite_runner import cache
+
+
+def tag_slug(name: str) -> str:
+    """
+    Normalized form of a tag name, used both as ``Tag.slug`` and as the key
+    of the tag dictionary.
+    """
+
+    return slugify(name, allow_unicode=True)
+
+
+class TagDictionary:
+    """
+    Bounded, thread-safe LRU mapping of tag slug to ``(pk, tag)``, so hot tags
+    resolve without touching the database.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None) -> None:
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is not None:
+            return self._maxsize
+        return settings.TAG_CACHE_SIZE
+
+    def get_many(self, slugs: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+        found = {}
+        with self._lock:
+            for slug in slugs:
+                entry = self._entries.get(slug, None)
+                if entry is not None:
+                    self._entries.move_to_end(slug)
+                    found[slug] = entry
+        return found
+
+    def set_many(self, entries: Dict[str, Tuple[int, str]]) -> None:
+        with self._lock:
+            for slug, entry in entries.items():
+                self._entries[slug] = entry
+                self._entries.move_to_end(slug)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, pk: int) -> None:
+        with self._lock:
+            for slug in [s for s, (id_, _) in self._entries.items() if id_ == pk]:
+                del self._entries[slug]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+tag_dictionary = TagDictionary()
+
+
+class TagManager(models.Manager):
+    def resolve(self, names: Iterable[str]) -> List["Tag"]:
+        """
+        Returns one ``Tag`` per distinct normalized name, in input order,
+        creating the missing ones. Costs at most one select, one
+        conflict-tolerant insert and one re-select, and nothing at all when
+        every name is in the tag dictionary.
+        """
+
+        wanted: Dict[str, str] = {}
+        for name in names:
+            slug = tag_slug(name)
+            if slug and slug not in wanted:
+                wanted[slug] = name.strip()
+
+        resolved = tag_dictionary.get_many(wanted)
+        missing = [slug for slug in wanted if slug not in resolved]
+
+        if missing:
+            fetched = self._fetch(missing)
+            created = [slug for slug in missing if slug not in fetched]
+            if created:
+                self.bulk_create(
+                    [self.model(tag=wanted[slug], slug=slug) for slug in created],
+                    ignore_conflicts=True,
+                )
+                fetched.update(self._fetch(created))
+                cache.bump(cache.TAGS)
+
+            tag_dictionary.set_many(fetched)
+            resolved.update(fetched)
+
+        return [
+            self.model.from_db(self.db, ["id", "tag", "slug"], (*resolved[slug], slug))
+            for slug in wanted
+        ]
+
+    def _fetch(self, slugs: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+        return {
+            slug: (pk, tag)
+            for slug, pk, tag in self.filter(slug__in=slugs).values_list(
+                "slug", "pk", "tag"
+            )
+        }
 
 
 class Tag(models.Model):
     tag = models.CharField(max_length=255)
     slug = models.SlugField(db_index=True, unique=True)
 
+    objects = TagManager()
+
     def __str__(self) -> str:
         return self.tag
 
     def save(self, *args, **kwargs):
-        self.slug = slugify(self.tag)
+        self.slug = tag_slug(self.tag)
         super().save(*args, **kwargs)
+
+
+class PopularTagManager(models.Manager):
+    ALL = "all"
+
+    def windows(self) -> Dict[str, Optional[int]]:
+        """
+        Ranking windows by name, in days. ``"all"`` counts every article.
+        """
+
+        return {self.ALL: None, **settings.TAG_RANKING_WINDOWS}
+
+    def refresh(self, window: str) -> int:
+        """
+        Recomputes the top ``TAG_RANKING_SIZE`` tags of ``window`` from the
+        article/tag through table and replaces the stored snapshot with them
+        if they changed.
+        """
+
+        days = self.windows()[window]
+        now = timezone.now()
+
+        usage = Tag.articles.through.objects.all()
+        if days is not None:
+            usage = usage.filter(article__created_at__gte=now - timedelta(days=days))
+        ranked = (
+            usage.values("tag_id")
+            .annotate(articles_count=models.Count("pk"))
+            .order_by("-articles_count", "tag_id")[: settings.TAG_RANKING_SIZE]
+        )
+
+        ranking = [(row["tag_id"], row["articles_count"]) for row in ranked]
+        current = self.filter(window=window).order_by("rank")
+        if ranking == list(current.values_list("tag_id", "articles_count")):
+            return len(ranking)
+
+        rows = [
+            self.model(
+                window=window,
+                rank=rank,
+                tag_id=tag_id,
+                articles_count=articles_count,
+                computed_at=now,
+            )
+            for rank, (tag_id, articles_count) in enumerate(ranking, start=1)
+        ]
+
+        with transaction.atomic():
+            self.filter(window=window).delete()
+            self.bulk_create(rows, batch_size=1000)
+            cache.bump(cache.TAGS)
+
+        return len(rows)
+
+
+class PopularTag(models.Model):
+    """
+    Precomputed ranking of tags by the number of articles using them within
+    a time window.
+    """
+
+    window = models.CharField(max_length=16)
+    rank = models.PositiveIntegerField()
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="rankings")
+    articles_count = models.PositiveIntegerField()
+    computed_at = models.DateTimeField()
+
+    objects = PopularTagManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["window", "rank"], name="unique_popular_tag_rank"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.window}#{self.rank}"
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, Iterable, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections, models, router
+
+# Keyset ordering of ``Feed``: ``feed_at`` is the article creation time and
+# ``feed_id`` the article id, whichever source the article comes from.
+FEED_ORDERING = ("-feed_at", "-feed_id")
+
+
+class TimelineEntryManager(models.Manager):
+    def _follow_through(self) -> Any:
+        return self.model._meta.get_field("profile").related_model.following.through
+
+    def _profiles(self) -> models.QuerySet:
+        return self.model._meta.get_field("profile").related_model.objects
+
+    def _skipped(self) -> models.Q:
+        return models.Q(followers_count__gt=settings.TIMELINE_FANOUT_LIMIT) | models.Q(
+            fanout_pending=True
+        )
+
+    def fanout_skipped_authors(self, profile: Any) -> models.QuerySet:
+        """
+        Returns the ids of authors followed by ``profile`` that have too many
+        followers to be fanned out on write, or whose articles are still to
+        be fanned out since they dropped under the limit. Their articles are
+        merged into the feed at read time instead.
+        """
+
+        return (
+            self._profiles()
+            .filter(self._skipped(), followed_by=profile.pk)
+            .values("pk")
+        )
+
+    def is_fanout_skipped(self, author_id: int) -> bool:
+        return self._profiles().filter(self._skipped(), pk=author_id).exists()
+
+    def fan_out(self, article: Any) -> None:
+        """
+        Adds ``article`` to the timeline of its author and, unless the author
+        is above ``TIMELINE_FANOUT_LIMIT``, to the timeline of every follower.
+        """
+
+        profile_ids = [article.author_id]
+        if not self.is_fanout_skipped(article.author_id):
+            profile_ids.extend(
+                self._follow_through()
+                .objects.filter(to_profile_id=article.author_id)
+                .values_list("from_profile_id", flat=True)
+            )
+
+        self.bulk_create(
+            [
+                self.model(
+                    profile_id=pk,
+                    article_id=article.pk,
+                    article_created_at=article.created_at,
+                )
+                for pk in profile_ids
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    def backfill(self, profile: Any, followee: Any) -> None:
+        """
+        Copies the most recent articles of ``followee`` into the timeline of
+        ``profile``.
+        """
+
+        self.backfill_many(profile, [followee.pk])
+
+    def backfill_many(self, profile: Any, followee_ids: Iterable[int]) -> None:
+        """
+        Copies the ``TIMELINE_BACKFILL_SIZE`` most recent articles of every
+        followee into the timeline of ``profile`` with a single statement.
+        """
+
+        followee_ids = set(followee_ids)
+        skipped = set(
+            self._profiles()
+            .filter(self._skipped(), pk__in=followee_ids)
+            .exclude(pk=profile.pk)
+            .values_list("pk", flat=True)
+        )
+        author_ids = sorted(followee_ids - skipped)
+        if not author_ids:
+            return
+
+        article_model = self.model._meta.get_field("article").related_model
+        connection = connections[router.db_for_write(self.model)]
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {qn(self.model._meta.db_table)}
+                    (profile_id, article_id, article_created_at)
+                SELECT %s, recent.id, recent.created_at
+                FROM unnest(%s) AS author(id)
+                CROSS JOIN LATERAL (
+                    SELECT article.id, article.created_at
+                    FROM {qn(article_model._meta.db_table)} AS article
+                    WHERE article.author_id = author.id
+                    ORDER BY article.created_at DESC, article.id DESC
+                    LIMIT %s
+                ) AS recent
+                ON CONFLICT DO NOTHING
+                """,
+                [profile.pk, author_ids, settings.TIMELINE_BACKFILL_SIZE],
+            )
+
+    def mark_unskipped(self, author_ids: Iterable[int]) -> None:
+        """
+        Called when ``author_ids`` lost a follower. Authors that dropped back
+        to ``TIMELINE_FANOUT_LIMIT`` followers have articles that were never
+        fanned out, so they are marked ``fanout_pending`` and keep being
+        merged into feeds at read time until ``fan_out_pending`` runs.
+        """
+
+        self._profiles().filter(
+            pk__in=list(author_ids),
+            followers_count=settings.TIMELINE_FANOUT_LIMIT,
+        ).update(fanout_pending=True)
+
+    def fan_out_pending(self, author_id: int, batch_size: int = 1000) -> int:
+        """
+        Copies the ``TIMELINE_BACKFILL_SIZE`` most recent articles of the
+        fan-out pending ``author_id`` into the timelines of its followers,
+        ``batch_size`` followers per statement, and returns how many were
+        fanned out to.
+
+        The author stops being merged at read time first, so followers that
+        follow it meanwhile are backfilled on follow; the remaining ones miss
+        its older articles only until their batch is written.
+        """
+
+        pending = self._profiles().filter(pk=author_id, fanout_pending=True)
+        if not pending.update(fanout_pending=False):
+            return 0
+        if self.is_fanout_skipped(author_id):
+            return 0
+
+        article_model = self.model._meta.get_field("article").related_model
+        follows = self._follow_through().objects.filter(to_profile_id=author_id)
+        connection = connections[router.db_for_write(self.model)]
+        qn = connection.ops.quote_name
+
+        fanned_out, last_follower_id = 0, 0
+        while True:
+            follower_ids = list(
+                follows.filter(from_profile_id__gt=last_follower_id)
+                .order_by("from_profile_id")
+                .values_list("from_profile_id", flat=True)[:batch_size]
+            )
+            if not follower_ids:
+                return fanned_out
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {qn(self.model._meta.db_table)}
+                        (profile_id, article_id, article_created_at)
+                    SELECT follower.id, recent.id, recent.created_at
+                    FROM unnest(%s) AS follower(id)
+                    CROSS JOIN (
+                        SELECT article.id, article.created_at
+                        FROM {qn(article_model._meta.db_table)} AS article
+                        WHERE article.author_id = %s
+                        ORDER BY article.created_at DESC, article.id DESC
+                        LIMIT %s
+                    ) AS recent
+                    ON CONFLICT DO NOTHING
+                    """,
+                    [follower_ids, author_id, settings.TIMELINE_BACKFILL_SIZE],
+                )
+            fanned_out += len(follower_ids)
+            last_follower_id = follower_ids[-1]
+
+    def trim(self, profile: Any, followee: Any) -> None:
+        """
+        Removes every article of ``followee`` from the timeline of ``profile``.
+        """
+
+        self.trim_many(profile, [followee.pk])
+
+    def trim_many(self, profile: Any, followee_ids: Iterable[int]) -> None:
+        self.filter(
+            profile_id=profile.pk, article__author_id__in=list(followee_ids)
+        ).delete()
+
+
+class TimelineEntry(models.Model):
+    """
+    Materialized feed row: ``article`` shows up in the feed of ``profile``.
+    """
+
+    profile = models.ForeignKey(
+        "kite_runner.Profile", on_delete=models.CASCADE, related_name="timeline"
+    )
+    article = models.ForeignKey(
+        "kite_runner.Article",
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    # Copy of ``article.created_at``, so feeds are paged over this table's
+    # own index.
+    article_created_at = models.DateTimeField()
+
+    objects = TimelineEntryManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "article"], name="unique_timeline_entry"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["profile", "-article_created_at", "-article"],
+                name="timeline_feed_idx",
+            )
+        ]
+
+
+class Feed:
+    """
+    Articles in the feed of a profile: its materialized timeline merged with
+    the articles of followed authors that are not fanned out on write.
+
+    Implements the part of the ``QuerySet`` API the paginators use.
+    Ordering, filters and slices are applied to both sources separately, so
+    the timeline is read through ``timeline_feed_idx`` and the skipped
+    authors through ``article_author_created_idx``, each no further than the
+    requested page, and only then merged.
+    """
+
+    def __init__(
+        self, articles: models.QuerySet, profile_id: int, skipped_authors: List[int]
+    ) -> None:
+        self.articles = articles
+        self.ordering: Tuple[str, ...] = FEED_ORDERING
+
+        timeline = articles.filter(timeline_entries__profile_id=profile_id).annotate(
+            feed_at=models.F("timeline_entries__article_created_at"),
+            feed_id=models.F("timeline_entries__article_id"),
+        )
+        sources = [timeline]
+        if skipped_authors:
+            # Articles fanned out before their author went above the limit
+            # are already on the timeline.
+            on_timeline = TimelineEntry.objects.filter(
+                profile_id=profile_id, article_id=models.OuterRef("pk")
+            )
+            sources.append(
+                articles.filter(author_id__in=skipped_authors)
+                .filter(~models.Exists(on_timeline))
+                .annotate(feed_at=models.F("created_at"), feed_id=models.F("id"))
+            )
+        self._sources = [source.order_by(*self.ordering) for source in sources]
+
+    def _clone(self, sources: List[models.QuerySet], ordering: Sequence[str]) -> Feed:
+        feed = copy.copy(self)
+        feed._sources = sources
+        feed.ordering = tuple(ordering)
+        return feed
+
+    def order_by(self, *ordering: str) -> Feed:
+        return self._clone(
+            [source.order_by(*ordering) for source in self._sources], ordering
+        )
+
+    def filter(self, *conditions: models.Q) -> Feed:
+        return self._clone(
+            [source.filter(*conditions) for source in self._sources], self.ordering
+        )
+
+    def sources(self) -> List[models.QuerySet]:
+        """
+        The timeline and, if ``profile`` follows any, the articles of every
+        fan-out skipped author.
+        """
+
+        return list(self._sources)
+
+    def count(self) -> int:
+        timeline, *merged = self.sources()
+        if not merged:
+            return timeline.count()
+
+        (skipped,) = merged
+        return (
+            timeline.values("pk")
+            .order_by()
+            .union(skipped.values("pk").order_by(), all=True)
+            .count()
+        )
+
+    def __getitem__(self, index: slice) -> List[Any]:
+        timeline, *merged = self.sources()
+        if not merged:
+            return list(timeline[index])
+
+        # Both sources contribute at most ``stop`` rows to the page.
+        (skipped,) = merged
+        fields = [field.lstrip("-") for field in self.ordering]
+        timeline_keys, skipped_keys = (
+            source.prefetch_related(None).values_list(*fields)[: index.stop]
+            for source in (timeline, skipped)
+        )
+        rows: List[Tuple[Any, int]] = list(
+            timeline_keys.union(skipped_keys, all=True).order_by(*self.ordering)[index]
+        )
+
+        articles = self.articles.in_bulk([pk for _, pk in rows])
+        page = []
+        for feed_at, pk in rows:
+            article = articles[pk]
+            article.feed_at, article.feed_id = feed_at, pk
+            page.append(article)
+        return page
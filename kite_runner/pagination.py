@@ -0,0 +1,295 @@
+"""
+Keyset (a.k.a. seek) pagination.
+
+Pages are addressed by the position of the last row seen instead of an
+``OFFSET``, so page N costs the same as page 1 and no ``COUNT(*)`` is run.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class Cursor(NamedTuple):
+    position: Tuple[str, ...]
+    reverse: bool
+
+
+def _invert(ordering: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+
+
+def _to_cursor_value(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+
+    return str(value)
+
+
+def get_known_count(view: Any) -> Optional[int]:
+    """
+    Total number of rows as supplied by the view's ``get_known_count``, e.g.
+    from a denormalized counter, so no ``COUNT(*)`` has to be run.
+    """
+
+    get_count = getattr(view, "get_known_count", None)
+    return get_count() if get_count is not None else None
+
+
+class KeysetPage(OrderedDict):
+    """
+    Response data of a keyset page. Rendered with its ``next``/``previous``
+    links even when it also carries a ``count``.
+    """
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates over a unique ordering, ``(created_at, id)`` by default.
+
+    Views can override the ordering with a ``keyset_ordering`` attribute.
+    The last field of the ordering must be unique (usually ``id``). Pages
+    include a ``count`` when the view knows it (see ``get_known_count``).
+    """
+
+    ordering: Tuple[str, ...] = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    page_size = api_settings.PAGE_SIZE
+    max_limit = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def keyset_params(cls) -> Tuple[str, ...]:
+        """
+        Query parameters selecting keyset pagination.
+        """
+
+        return (cls.cursor_query_param,)
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Any, view: Any = None
+    ) -> List[Any]:
+        self.request = request
+        self.queryset = queryset
+        self.count = get_known_count(view)
+        self.limit = self.get_limit(request)
+        self.ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _invert(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                queryset = queryset.filter(self.seek(ordering, self.cursor.position))
+            except (TypeError, ValueError, ValidationError):
+                # Positions of forged cursors that do not fit their fields.
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data: Any) -> Response:
+        page = KeysetPage(
+            [
+                ("next", self.get_next_link()),
+                ("previous", self.get_previous_link()),
+                ("results", data),
+            ]
+        )
+        if self.count is not None:
+            page["count"] = self.count
+
+        return Response(page)
+
+    def get_limit(self, request: Any) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def seek(self, ordering: Sequence[str], position: Sequence[str]) -> Q:
+        """
+        Builds the row-value comparison ``(f1, f2, ...) > (v1, v2, ...)``
+        honouring the direction of every field in ``ordering``.
+        """
+
+        fields = [field.lstrip("-") for field in ordering]
+        lookups = ["lt" if field.startswith("-") else "gt" for field in ordering]
+
+        condition = Q()
+        for index in range(len(fields)):
+            term = Q(**{f"{fields[index]}__{lookups[index]}": position[index]})
+            for equal_index in range(index):
+                term &= Q(**{fields[equal_index]: position[equal_index]})
+            condition |= term
+
+        # Redundant bound on the leading column keeps the index scan ranged.
+        bound = {"lt": "lte", "gt": "gte"}[lookups[0]]
+        return Q(**{f"{fields[0]}__{bound}": position[0]}) & condition
+
+    def get_position(self, instance: Any) -> Tuple[str, ...]:
+        return tuple(
+            _to_cursor_value(getattr(instance, field.lstrip("-")))
+            for field in self.ordering
+        )
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+
+        if self.page:
+            position = self.get_position(self.page[-1])
+        else:
+            assert self.cursor is not None
+            position = self.cursor.position
+
+        return self.encode_cursor(Cursor(position=position, reverse=False))
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+
+        if self.page:
+            position = self.get_position(self.page[0])
+        else:
+            assert self.cursor is not None
+            position = self.cursor.position
+
+        return self.encode_cursor(Cursor(position=position, reverse=True))
+
+    def decode_cursor(self, request: Any) -> Optional[Cursor]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = tuple(str(value) for value in tokens["p"])
+            reverse = bool(tokens.get("r", False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor: Cursor) -> str:
+        tokens = {"p": list(cursor.position), "r": int(cursor.reverse)}
+        encoded = urlsafe_b64encode(json.dumps(tokens).encode("ascii")).decode("ascii")
+
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, encoded
+        )
+
+
+class AnchoredKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination that can also start next to a row given by primary
+    key: ``?since=<pk>`` returns the rows after it and ``?before=<pk>`` the
+    rows immediately before it.
+    """
+
+    since_query_param = "since"
+    before_query_param = "before"
+    invalid_anchor_message = "Invalid since/before position"
+
+    @classmethod
+    def keyset_params(cls) -> Tuple[str, ...]:
+        return (
+            *super().keyset_params(),
+            cls.since_query_param,
+            cls.before_query_param,
+        )
+
+    def decode_cursor(self, request: Any) -> Optional[Cursor]:
+        cursor = super().decode_cursor(request)
+        if cursor is not None:
+            return cursor
+
+        for param, reverse in (
+            (self.since_query_param, False),
+            (self.before_query_param, True),
+        ):
+            pk = request.query_params.get(param)
+            if pk:
+                return Cursor(position=self.get_anchor_position(pk), reverse=reverse)
+
+        return None
+
+    def get_anchor_position(self, pk: str) -> Tuple[str, ...]:
+        fields = [field.lstrip("-") for field in self.ordering]
+        try:
+            row = self.queryset.filter(pk=pk).values_list(*fields).first()
+        except (TypeError, ValueError, ValidationError):
+            row = None
+
+        if row is None:
+            raise NotFound(self.invalid_anchor_message)
+
+        return tuple(_to_cursor_value(value) for value in row)
+
+
+class KeysetOrLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination with opt-in keyset mode.
+
+    Passing one of the keyset parameters, e.g. ``cursor`` (empty for the
+    first page), switches the response to ``next``/``previous`` cursors.
+    Views supplying ``get_known_count`` skip the ``COUNT(*)`` in both modes.
+    """
+
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Any, view: Any = None
+    ) -> Optional[List[Any]]:
+        self.view = view
+        self.keyset: Optional[KeysetPagination] = None
+        params = self.keyset_class.keyset_params()
+        if any(param in request.query_params for param in params):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset: QuerySet) -> int:
+        count = get_known_count(self.view)
+        if count is not None:
+            return count
+
+        return super().get_count(queryset)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
+        return super().get_paginated_response(data)
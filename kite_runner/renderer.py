@@ -1,6 +1,56 @@
 import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from kite_runner.pagination import KeysetPage
+
+Encoder = Callable[[Any], bytes]
+
+_default = encoders.JSONEncoder().default
+
+
+def stdlib_encoder(data: Any) -> bytes:
+    return json.dumps(
+        data,
+        cls=encoders.JSONEncoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def orjson_encoder(data: Any) -> bytes:
+    import orjson
+
+    return orjson.dumps(data, default=_default)
+
+
+@lru_cache(maxsize=None)
+def get_encoder(name: str) -> Encoder:
+    """
+    Resolves the ``JSON_RENDERER_ENCODER`` setting: ``"stdlib"``,
+    ``"orjson"``, ``"auto"`` (orjson when importable) or the dotted path of
+    a callable returning UTF-8 bytes.
+    """
+
+    if name == "auto":
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            return stdlib_encoder
+        return orjson_encoder
+
+    encoders_by_name = {"stdlib": stdlib_encoder, "orjson": orjson_encoder}
+    if name in encoders_by_name:
+        return encoders_by_name[name]
+
+    return import_string(name)
 
 
 class KRJSONRenderer(JSONRenderer):
@@ -9,17 +59,89 @@ class KRJSONRenderer(JSONRenderer):
     pagination_object_label = "objects"
     pagination_object_count = "count"
 
-    def render(self, data, media_type=None, renderer_context=None):
-        if not data:
-            return json.dumps({})
-        if data.get("results", None) is not None:
-            return json.dumps(
-                {
-                    self.pagination_object_label: data["results"],
-                    self.pagination_object_count: data["count"],
-                }
-            )
-        elif data.get("errors", None) is not None:
-            return super(KRJSONRenderer, self).render(data)
-        else:
-            return json.dumps({self.object_label: data})
+    def encode(self, data: Any) -> bytes:
+        return get_encoder(settings.JSON_RENDERER_ENCODER)(data)
+
+    def envelope(self, data: Any) -> List[Tuple[str, Any]]:
+        if isinstance(data, dict) and data.get("results", None) is not None:
+            pairs = [(self.pagination_object_label, data["results"])]
+            if "count" in data:
+                pairs.append((self.pagination_object_count, data["count"]))
+            if "count" not in data or isinstance(data, KeysetPage):
+                pairs.append(("next", data.get("next")))
+                pairs.append(("previous", data.get("previous")))
+            return pairs
+
+        return [(self.object_label, data)]
+
+    def render(
+        self,
+        data: Any,
+        media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        if not data and not isinstance(data, list):
+            return b"{}"
+        if isinstance(data, dict) and data.get("errors", None) is not None:
+            return self.encode(data)
+
+        # Encode each member and splice the bytes together instead of
+        # building (and re-walking) a wrapper dict around large payloads.
+        members = [
+            self.encode(label) + b":" + self.encode(value)
+            for label, value in self.envelope(data)
+        ]
+        return b"{" + b",".join(members) + b"}"
+
+    def iter_render(self, data: Any, chunk_size: int = 100) -> Iterator[bytes]:
+        """
+        Yields the rendered payload in chunks of ``chunk_size`` list items,
+        so very large lists never exist as a single encoded buffer.
+        """
+
+        yield b"{"
+        for index, (label, value) in enumerate(self.envelope(data)):
+            yield (b"," if index else b"") + self.encode(label) + b":"
+
+            if not isinstance(value, list):
+                yield self.encode(value)
+                continue
+
+            yield b"["
+            for start in range(0, len(value), chunk_size):
+                stop = start + chunk_size
+                chunk = self.encode(value[start:stop])[1:-1]
+                yield (b"," if start else b"") + chunk
+            yield b"]"
+        yield b"}"
+
+
+class StreamingListMixin:
+    """
+    Streams paginated responses with more than
+    ``JSON_RENDERER_STREAM_THRESHOLD`` items using ``iter_render``.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(  # type: ignore
+            request, response, *args, **kwargs
+        )
+
+        renderer = getattr(response, "accepted_renderer", None)
+        data = getattr(response, "data", None)
+        results = data.get("results", None) if isinstance(data, dict) else None
+        if (
+            not isinstance(renderer, KRJSONRenderer)
+            or results is None
+            or len(results) <= settings.JSON_RENDERER_STREAM_THRESHOLD
+        ):
+            return response
+
+        streaming = StreamingHttpResponse(
+            renderer.iter_render(data), status=response.status_code
+        )
+        for header, value in response.items():
+            streaming[header] = value
+        streaming["Content-Type"] = f"{renderer.media_type}; charset={renderer.charset}"
+
+        return streaming
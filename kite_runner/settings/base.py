@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # 3rd party
     "rest_framework",
     "corsheaders",
@@ -53,11 +54,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "kite_runner.db.middleware.query_instrumentation_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "kite_runner.db.middleware.replica_routing_middleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -106,8 +109,21 @@ DATABASES = {
         "TEST": {"NAME": "test_db"},
     }
 }
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
 DATABASES["default"]["TEST"] = {"NAME": "test_db"}
+# Read replicas, one per URL in DATABASE_REPLICA_URLS, named replica1, replica2...
+# The reads of GET requests go to them; see kite_runner.db.routers.
+for _index, _url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[]), 1):
+    _replica = env.db_url_config(_url)
+    _options = _replica.get("OPTIONS", {})
+    _replica["OPTIONS"] = {**DATABASES["default"]["OPTIONS"], **_options}
+    _replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[f"replica{_index}"] = _replica
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["kite_runner.db.routers.ReplicaRouter"]
+# Seconds the reads of a user stay on the primary after one of their writes.
+REPLICA_STICKINESS = env.int("REPLICA_STICKINESS", default=10)
+# Seconds between health checks of each replica.
+REPLICA_HEALTH_CHECK_INTERVAL = env.int("REPLICA_HEALTH_CHECK_INTERVAL", default=30)
 
 
 # Password validation
@@ -129,6 +145,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
+# The first hasher is used for new passwords; logins transparently rehash
+# passwords stored with any other entry or with outdated parameters.
+PASSWORD_HASHERS = env.list(
+    "DJANGO_PASSWORD_HASHERS",
+    default=[
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.Argon2PasswordHasher",
+        "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    ],
+)
+
+# Threads verifying login passwords, and logins allowed to wait for one
+# before new ones are rejected with 429.
+LOGIN_HASH_WORKERS = env.int("LOGIN_HASH_WORKERS", default=2)
+LOGIN_HASH_QUEUE = env.int("LOGIN_HASH_QUEUE", default=16)
+# Seconds a login waits for its password check before failing with 503.
+LOGIN_HASH_TIMEOUT = env.int("LOGIN_HASH_TIMEOUT", default=5)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -160,7 +197,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "kite_runner.authentication.CachedJWTAuthentication",
     ),
     # "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "NON_FIELD_ERRORS_KEY": "error",
@@ -170,6 +207,72 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# QUERY INSTRUMENTATION
+# ------------------------------------------------------------------------------
+# Fraction of requests whose SQL queries are counted, timed and reported in
+# ``Server-Timing``/``X-Query-*`` headers and logs; 0 disables it entirely.
+QUERY_INSTRUMENTATION_SAMPLE_RATE = env.float(
+    "QUERY_INSTRUMENTATION_SAMPLE_RATE", default=0.0
+)
+# Query shapes run this many times in one request are reported as likely N+1.
+QUERY_N_PLUS_ONE_THRESHOLD = env.int("QUERY_N_PLUS_ONE_THRESHOLD", default=5)
+# Sampled requests log the process-wide statistics (such as the connection
+# pool's) at most once every this many seconds.
+PROCESS_STATS_INTERVAL = env.float("PROCESS_STATS_INTERVAL", default=60.0)
+
+# RENDERER
+# ------------------------------------------------------------------------------
+# "auto" uses orjson when installed; also "stdlib", "orjson" or a dotted path
+# to a callable returning UTF-8 bytes.
+JSON_RENDERER_ENCODER = env.str("JSON_RENDERER_ENCODER", default="auto")
+# Paginated responses with more items than this are streamed in chunks.
+JSON_RENDERER_STREAM_THRESHOLD = env.int("JSON_RENDERER_STREAM_THRESHOLD", default=500)
+
+# TIMELINE
+# ------------------------------------------------------------------------------
+# Authors with more followers than this are merged into feeds at read time
+# instead of being fanned out to every follower's timeline on write.
+TIMELINE_FANOUT_LIMIT = env.int("TIMELINE_FANOUT_LIMIT", default=10000)
+# Number of recent articles copied into a timeline when following an author.
+TIMELINE_BACKFILL_SIZE = env.int("TIMELINE_BACKFILL_SIZE", default=100)
+# Maximum number of profiles or articles a batch follow/favorite request may
+# change at once.
+SOCIAL_BATCH_LIMIT = env.int("SOCIAL_BATCH_LIMIT", default=100)
+
+# CACHES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#caches
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# Seconds an anonymous API response may be served from the cache. Writes
+# invalidate dependent responses immediately regardless of this timeout.
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=300)
+# Maximum number of tag name -> id entries kept in memory by each process.
+TAG_CACHE_SIZE = env.int("TAG_CACHE_SIZE", default=10000)
+# Seconds an authenticated user (and profile) is served from the cache.
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)
+# Presented access tokens with at least this many seconds left are echoed back
+# by /user/ instead of signing a new one.
+TOKEN_REUSE_MIN_LIFETIME = env.int("TOKEN_REUSE_MIN_LIFETIME", default=60)
+
+# TAGS
+# ------------------------------------------------------------------------------
+# Number of tags returned by the tag cloud endpoint.
+TAG_POPULAR_LIMIT = env.int("TAG_POPULAR_LIMIT", default=20)
+# Number of tags kept in each ranking, and so the depth of the tag cloud pages.
+TAG_RANKING_SIZE = env.int("TAG_RANKING_SIZE", default=1000)
+# Extra ranking windows, in days, selectable with ``?window=``.
+TAG_RANKING_WINDOWS = {"week": 7, "month": 30}
+
+# ASYNC
+# ------------------------------------------------------------------------------
+# Threads (and so database connections) used by the async read endpoints.
+ASYNC_DB_WORKERS = env.int("ASYNC_DB_WORKERS", default=10)
+
+# SEARCH
+# ------------------------------------------------------------------------------
+# PostgreSQL text search configuration used to index and query articles.
+SEARCH_CONFIG = env("SEARCH_CONFIG", default="english")
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
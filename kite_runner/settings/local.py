@@ -41,11 +41,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "kite_runner.db.middleware.query_instrumentation_middleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "kite_runner.db.middleware.replica_routing_middleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -94,8 +96,17 @@ DATABASES = {
         "TEST": {"NAME": "test_db"},
     }
 }
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
 DATABASES["default"]["TEST"] = {"NAME": "test_db"}
+# Stand-in read replica, by default the primary database itself. Tests run it
+# as a mirror of the test database. Enable it with DJANGO_DB_REPLICAS=replica.
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": env.str("DJANGO_DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+    "HOST": env.str("DJANGO_DB_REPLICA_HOST", default=DATABASES["default"]["HOST"]),
+    "PORT": env.str("DJANGO_DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_REPLICAS = env.list("DJANGO_DB_REPLICAS", default=[])
 
 
 # Password validation
@@ -148,7 +159,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "kite_runner.authentication.CachedJWTAuthentication",
     ),
     # "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "NON_FIELD_ERRORS_KEY": "error",
@@ -158,6 +169,13 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
+# QUERY INSTRUMENTATION
+# ------------------------------------------------------------------------------
+# Report the SQL statistics of every request during development.
+QUERY_INSTRUMENTATION_SAMPLE_RATE = env.float(
+    "QUERY_INSTRUMENTATION_SAMPLE_RATE", default=1.0
+)
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
@@ -13,9 +13,31 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["kiterunner.com"])
 # DATABASES
 # ------------------------------------------------------------------------------
 DATABASES["default"] = env.db("DATABASE_URL")  # noqa F405
-DATABASES["default"]["ATOMIC_REQUESTS"] = True  # noqa F405
 DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa F405
+if env.bool("DB_POOL", default=True):
+    # Requests hand their connection back to the in-process pool when they
+    # finish, so CONN_MAX_AGE must be 0 for connections to be shared.
+    DATABASES["default"]["ENGINE"] = "kite_runner.db.backends.postgresql_pool"  # noqa F405
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # noqa F405
+    DATABASES["default"]["POOL"] = {  # noqa F405
+        "MIN_SIZE": env.int("DB_POOL_MIN_SIZE", default=2),
+        "MAX_SIZE": env.int("DB_POOL_MAX_SIZE", default=20),
+        "TIMEOUT": env.float("DB_POOL_TIMEOUT", default=5.0),
+        "HEALTH_CHECK_INTERVAL": env.float("DB_POOL_HEALTH_CHECK_INTERVAL", default=30.0),
+        "MAX_LIFETIME": env.float("DB_POOL_MAX_LIFETIME", default=3600.0),
+    }
 
+# CACHES
+# ------------------------------------------------------------------------------
+# Required: scope versions and invalidations must be shared by every worker.
+CACHES = {"default": env.cache("CACHE_URL")}
+
+# QUERY INSTRUMENTATION
+# ------------------------------------------------------------------------------
+# Sample 1% of requests; see QUERY_INSTRUMENTATION_SAMPLE_RATE in base.
+QUERY_INSTRUMENTATION_SAMPLE_RATE = env.float(
+    "QUERY_INSTRUMENTATION_SAMPLE_RATE", default=0.01
+)
 
 DEBUG = False
 
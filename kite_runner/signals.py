@@ -1,10 +1,128 @@
-from django.db.models.signals import post_save
+from contextvars import ContextVar
+from typing import FrozenSet
+
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
 from django.dispatch import receiver
 
-from kite_runner.models import Profile, User
+from kite_runner import cache
+from kite_runner.models import (Article, Comment, Profile, Tag, TimelineEntry,
+                                User)
+from kite_runner.models.counters import increment
+from kite_runner.models.tag import tag_dictionary
+
+# Articles being deleted. Their comments are deleted along with them, so the
+# comment receivers skip the counter and cache upkeep of every such comment.
+_deleting_articles: ContextVar[FrozenSet[int]] = ContextVar(
+    "kite_runner_deleting_articles", default=frozenset()
+)
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance=None, created=False, **kwargs):
     if instance and created:
         Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Article)
+def fan_out_article(sender, instance=None, created=False, **kwargs):
+    if instance and created:
+        TimelineEntry.objects.fan_out(instance)
+
+
+@receiver(post_save, sender=Article)
+def count_created_article(sender, instance=None, created=False, **kwargs):
+    if instance and created:
+        increment(Profile.objects.filter(pk=instance.author_id), articles_count=1)
+
+
+@receiver(pre_delete, sender=Article)
+def mark_deleting_article(sender, instance=None, **kwargs):
+    if instance:
+        _deleting_articles.set(_deleting_articles.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Article)
+def count_deleted_article(sender, instance=None, **kwargs):
+    if instance:
+        _deleting_articles.set(_deleting_articles.get() - {instance.pk})
+        increment(Profile.objects.filter(pk=instance.author_id), articles_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def count_created_comment(sender, instance=None, created=False, **kwargs):
+    if instance and created:
+        increment(Article.objects.filter(pk=instance.article_id), comments_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance=None, **kwargs):
+    if instance and instance.article_id not in _deleting_articles.get():
+        increment(Article.objects.filter(pk=instance.article_id), comments_count=-1)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_article(sender, instance=None, **kwargs):
+    if instance:
+        cache.bump(
+            cache.ARTICLES,
+            cache.article_scope(instance.slug),
+            cache.comments_scope(instance.pk),
+        )
+
+
+@receiver(post_delete, sender=Article)
+def forget_article_id(sender, instance=None, **kwargs):
+    if instance:
+        cache.forget_article_id(instance.slug)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def invalidate_article_tags(sender, instance=None, action="", **kwargs):
+    if instance and action.startswith("post_"):
+        scopes = [cache.ARTICLES]
+        if isinstance(instance, Article):
+            scopes.append(cache.article_scope(instance.slug))
+        cache.bump(*scopes)
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def index_article_tags(sender, instance=None, action="", pk_set=None, **kwargs):
+    if not instance or not action.startswith("post_"):
+        return
+
+    if isinstance(instance, Article):
+        Article.objects.filter(pk=instance.pk).update_search_vector()
+    elif pk_set:
+        Article.objects.filter(pk__in=pk_set).update_search_vector()
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comments(sender, instance=None, **kwargs):
+    if instance and instance.article_id not in _deleting_articles.get():
+        cache.bump(cache.comments_scope(instance.article_id))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tags(sender, instance=None, **kwargs):
+    if instance:
+        tag_dictionary.discard(instance.pk)
+        cache.bump(cache.TAGS)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile(sender, instance=None, **kwargs):
+    if instance:
+        cache.bump(cache.PROFILES, cache.user_scope(instance.user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance=None, created=False, **kwargs):
+    if instance and not created:
+        # Covers profile edits, password changes and deactivation, which all
+        # save the user row.
+        cache.bump(cache.PROFILES, cache.user_scope(instance.pk))
@@ -1,8 +1,17 @@
-from typing import Any, Dict, Optional
+import difflib
+from typing import Any, Callable, Dict, List, Optional
 
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase as DRFTestCase
+from rest_framework.test import \
+    APITransactionTestCase as DRFTransactionTestCase
 
+from kite_runner.db.instrumentation import fingerprint
 from kite_runner.models import User
+from kite_runner.models.tag import tag_dictionary
 from kite_runner.utils.constants import DEFAULT_AVT_IMAGE
 
 
@@ -59,6 +68,89 @@ class TestMixin:
             _setup_test_data(self)
 
 
-class APIBaseTest(TestMixin, ErrorResponseMixin, DRFTestCase):
+class QueryBudgetMixin:
+    """
+    Query-count budgets for endpoint tests. Budgets hold for cache misses:
+    responses are not cached while they are measured, but every request is
+    made once beforehand to warm the authenticated user cache. Savepoints
+    are not counted.
+    """
+
+    def capture_queries(
+        self, request: Callable[[], Any], using: str = DEFAULT_DB_ALIAS
+    ) -> List[str]:
+        with CaptureQueriesContext(connections[using]) as context:
+            response = request()
+
+        self.assertLess(  # type: ignore
+            response.status_code, 400, f"Budgeted request failed: {response}"
+        )
+        return [query["sql"] for query in context if "SAVEPOINT" not in query["sql"]]
+
+    def assertQueryBudget(
+        self,
+        budget: int,
+        request: Callable[[], Any],
+        grow: Optional[Callable[[], Any]] = None,
+        using: str = DEFAULT_DB_ALIAS,
+    ) -> None:
+        """
+        Fails when ``request`` runs more than ``budget`` queries or, once
+        ``grow`` has added data, a different number of queries than before.
+        """
+
+        with override_settings(RESPONSE_CACHE_TIMEOUT=0):
+            request()
+            before = self.capture_queries(request, using)
+            self._check_budget(budget, before)
+            if grow is None:
+                return
+
+            grow()
+            after = self.capture_queries(request, using)
+
+        self._check_budget(budget, after)
+        if len(after) != len(before):
+            diff = difflib.unified_diff(
+                [fingerprint(sql) for sql in before],
+                [fingerprint(sql) for sql in after],
+                "before",
+                "after",
+                lineterm="",
+            )
+            self.fail(  # type: ignore
+                f"Query count changed from {len(before)} to {len(after)} with "
+                "more data:\n" + "\n".join(diff)
+            )
+
+    def _check_budget(self, budget: int, queries: List[str]) -> None:
+        if len(queries) > budget:
+            listing = "\n".join(
+                f"{number}. {sql}" for number, sql in enumerate(queries, 1)
+            )
+            self.fail(  # type: ignore
+                f"Expected at most {budget} queries, got {len(queries)}:\n{listing}"
+            )
+
+
+class APIBaseTest(TestMixin, ErrorResponseMixin, QueryBudgetMixin, DRFTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        tag_dictionary.clear()
+
+
+class APITransactionBaseTest(
+    TestMixin, ErrorResponseMixin, QueryBudgetMixin, DRFTransactionTestCase
+):
+    """
+    For code that queries from other threads, which cannot see the data of
+    a ``TestCase`` transaction.
+    """
+
+    CLASS_DATA_LEVEL_SETUP = False
+
     def setUp(self) -> None:
         super().setUp()
+        cache.clear()
+        tag_dictionary.clear()
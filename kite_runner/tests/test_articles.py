@@ -1,12 +1,25 @@
+import json
+from base64 import urlsafe_b64encode
 from copy import deepcopy
-
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
-from kite_runner.models import Article, Tag
+from kite_runner.api.article import ArticleViewset, filter_articles
+from kite_runner.models import (Article, Comment, Profile, Tag,
+                                TimelineEntry, User)
+from kite_runner.models.article import ArticleQuerySet
 from kite_runner.utils.constants import TOKEN_HEADER
 from kite_runner.utils.tokens import get_user_token
 
-from .base import APIBaseTest
+from .base import APIBaseTest, APITransactionBaseTest
 
 
 class TestArticleViewset(APIBaseTest):
@@ -80,6 +93,35 @@ class TestArticleViewset(APIBaseTest):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_create_article_with_unicode_tags(self) -> None:
+        article_data = deepcopy(self.article_data)
+        article_data["article"]["tagList"] = ["日本語", "Café", "ok"]
+
+        response = self.client.post(
+            f"{self.article_url}",
+            data=article_data,
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["article"]["tagList"], ["日本語", "Café", "ok"])
+
+    def test_create_article_with_unnamed_tag(self) -> None:
+        article_data = deepcopy(self.article_data)
+        article_data["article"]["tagList"] = ["!!!", "ok"]
+
+        response = self.client.post(
+            f"{self.article_url}",
+            data=article_data,
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json()["errors"]["tagList"],
+            ["Tag names must contain a letter or a digit."],
+        )
+
     def test_create_article_with_invalid_token(self) -> None:
         response = self.client.post(
             f"{self.article_url}",
@@ -293,6 +335,150 @@ class TestArticleViewset(APIBaseTest):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.json()["articles"]), 1)
 
+    def _create_author_article(self) -> Article:
+        author: User = self._create_user(
+            email="author@kiterunner.com", password="somepassword", username="author"
+        )
+        return Article.objects.create(
+            title="Author article",
+            author=author.profile,
+            description=self.article_description,
+            body=self.article_body,
+        )
+
+    def _get_feed_titles(self) -> list:
+        response = self.client.get(
+            f"{self.article_url}/feed/",
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article["title"] for article in response.json()["articles"]]
+
+    def test_get_article_feed_after_follow_and_unfollow(self) -> None:
+        article = self._create_author_article()
+
+        self.user.profile.follow(article.author)
+        self.assertCountEqual(
+            self._get_feed_titles(), [self.article_title, "Author article"]
+        )
+
+        self.user.profile.unfollow(article.author)
+        self.assertEqual(self._get_feed_titles(), [self.article_title])
+
+    def test_get_article_feed_fans_out_new_articles(self) -> None:
+        article = self._create_author_article()
+        self.user.profile.follow(article.author)
+
+        Article.objects.create(
+            title="Newer author article",
+            author=article.author,
+            description=self.article_description,
+            body=self.article_body,
+        )
+
+        self.assertIn("Newer author article", self._get_feed_titles())
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_get_article_feed_merges_skipped_authors(self) -> None:
+        article = self._create_author_article()
+        self.user.profile.follow(article.author)
+
+        self.assertFalse(
+            TimelineEntry.objects.filter(
+                profile=self.user.profile, article=article
+            ).exists()
+        )
+        self.assertIn("Author article", self._get_feed_titles())
+
+    def test_get_article_feed_pages_across_skipped_authors(self) -> None:
+        author = self._create_author_article().author
+        self.user.profile.follow(author)
+        for index in range(4):
+            Article.objects.create(
+                title=f"Article {index}",
+                author=author if index % 2 else self.user.profile,
+                description=self.article_description,
+                body=self.article_body,
+            )
+        expected = list(
+            Article.objects.filter(
+                author__in=[author, self.user.profile]
+            ).values_list("title", flat=True)
+        )
+
+        with self.settings(TIMELINE_FANOUT_LIMIT=0):
+            titles = []
+            url = f"{self.article_url}/feed/?cursor=&limit=2"
+            while url:
+                response = self.client.get(
+                    url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+                )
+                titles += [article["title"] for article in response.json()["articles"]]
+                url = response.json()["next"]
+            offset = self.client.get(
+                f"{self.article_url}/feed/?limit=2&offset=2",
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+            ).json()
+
+        self.assertEqual(titles, expected)
+        self.assertEqual(offset["count"], len(expected))
+        self.assertEqual(
+            [article["title"] for article in offset["articles"]], expected[2:4]
+        )
+
+    def test_get_article_feed_keeps_articles_of_authors_back_under_limit(
+        self,
+    ) -> None:
+        author = self._create_author_article().author
+        self.user.profile.follow(author)
+        fan = self._create_user(
+            email="fan@kiterunner.com", password="somepassword", username="fan"
+        )
+        fan.profile.follow(author)
+
+        with self.settings(TIMELINE_FANOUT_LIMIT=1):
+            Article.objects.create(
+                title="Posted above the limit",
+                author=author,
+                description=self.article_description,
+                body=self.article_body,
+            )
+            fan.profile.unfollow(author)
+
+            self.assertIn("Posted above the limit", self._get_feed_titles())
+
+            call_command("rebuild_timelines", "--pending", stdout=StringIO())
+
+            self.assertIn("Posted above the limit", self._get_feed_titles())
+
+        author.refresh_from_db()
+        self.assertFalse(author.fanout_pending)
+        self.assertTrue(
+            TimelineEntry.objects.filter(
+                profile=self.user.profile, article__title="Posted above the limit"
+            ).exists()
+        )
+
+    def test_unfollow_defers_fan_out_of_authors_back_under_limit(self) -> None:
+        author = self._create_author_article().author
+        self.user.profile.follow(author)
+        fan = self._create_user(
+            email="fan@kiterunner.com", password="somepassword", username="fan"
+        )
+        fan.profile.follow(author)
+
+        with self.settings(TIMELINE_FANOUT_LIMIT=1):
+            with CaptureQueriesContext(connection) as context:
+                fan.profile.unfollow(author)
+
+        self.assertFalse(any("INSERT" in query["sql"] for query in context))
+        author.refresh_from_db()
+        self.assertTrue(author.fanout_pending)
+
+    def test_rebuild_timelines_rejects_empty_batches(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("rebuild_timelines", "--pending", "--batch-size=0")
+
     def test_delete_article(self) -> None:
 
         response = self.client.delete(
@@ -301,3 +487,384 @@ class TestArticleViewset(APIBaseTest):
         )
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_get_articles_query_count_is_constant(self) -> None:
+        def count_list_queries() -> int:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    f"{self.article_url}",
+                    HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        count_list_queries()  # warms the authenticated user cache
+        single_article_queries = count_list_queries()
+
+        for index in range(5):
+            article = Article.objects.create(
+                title=f"{self.article_title} {index}",
+                author=self.user.profile,
+                description=self.article_description,
+                body=self.article_body,
+            )
+            article.tags.set(self.article.tags.all())
+            self.user.profile.favorite(article)
+
+        self.assertEqual(count_list_queries(), single_article_queries)
+
+    def test_get_articles_with_favorited_flag(self) -> None:
+        self.user.profile.favorite(self.article)
+
+        response = self.client.get(
+            f"{self.article_url}",
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        article_data = response.json()["articles"][0]
+        self.assertEqual(article_data["favorited"], True)
+        self.assertEqual(article_data["favoritesCount"], 1)
+        self.assertEqual(article_data["author"]["following"], False)
+
+    def test_get_articles_with_viewer_relations(self) -> None:
+        article = self._create_author_article()
+        self.user.profile.follow(article.author)
+        self.user.profile.favorite(article)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                f"{self.article_url}",
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        viewer_queries = [
+            query
+            for query in context.captured_queries
+            if "kite_runner_profile_favourites" in query["sql"]
+            or "kite_runner_profile_following" in query["sql"]
+        ]
+        self.assertEqual(len(viewer_queries), 1)
+        flags = {
+            article["title"]: (article["favorited"], article["author"]["following"])
+            for article in response.json()["articles"]
+        }
+        self.assertEqual(
+            flags, {"Author article": (True, True), self.article_title: (False, False)}
+        )
+
+    def test_get_articles_with_cursor(self) -> None:
+        for index in range(2):
+            Article.objects.create(
+                title=f"{self.article_title} {index}",
+                author=self.user.profile,
+                description=self.article_description,
+                body=self.article_body,
+            )
+
+        response = self.client.get(f"{self.article_url}?cursor=&limit=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertNotIn("count", response_data)
+        self.assertIsNone(response_data["previous"])
+        self.assertEqual(
+            [article["title"] for article in response_data["articles"]],
+            [f"{self.article_title} 1", f"{self.article_title} 0"],
+        )
+
+        response = self.client.get(response_data["next"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertIsNone(response_data["next"])
+        self.assertEqual(
+            [article["title"] for article in response_data["articles"]],
+            [self.article_title],
+        )
+
+        response = self.client.get(response_data["previous"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertIsNone(response_data["previous"])
+        self.assertEqual(
+            [article["title"] for article in response_data["articles"]],
+            [f"{self.article_title} 1", f"{self.article_title} 0"],
+        )
+
+    def test_get_articles_ordered_by_favorites(self) -> None:
+        popular = Article.objects.create(
+            title="Popular article",
+            author=self.user.profile,
+            description=self.article_description,
+            body=self.article_body,
+        )
+        self.user.profile.favorite(popular)
+
+        response = self.client.get(f"{self.article_url}?ordering=favorites")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [article["title"] for article in response.json()["articles"]],
+            ["Popular article", self.article_title],
+        )
+
+    def test_get_articles_favorited_by_user(self) -> None:
+        Article.objects.create(
+            title="Unfavorited article",
+            author=self.user.profile,
+            description=self.article_description,
+            body=self.article_body,
+        )
+        self.user.profile.favorite(self.article)
+
+        response = self.client.get(f"{self.article_url}?favorited={self.USERNAME}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [article["title"] for article in response.json()["articles"]],
+            [self.article_title],
+        )
+
+    def test_get_articles_with_invalid_cursor(self) -> None:
+        response = self.client.get(f"{self.article_url}?cursor=invalid")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), self.not_found_response("Invalid cursor"))
+
+    def test_get_articles_with_forged_cursor(self) -> None:
+        created_at = self.article.created_at.isoformat()
+        for path, position in (
+            ("?ordering=recent", [created_at, "abc"]),
+            ("?ordering=recent", ["yesterday", str(self.article.pk)]),
+            ("?ordering=recent", ["2021-13-45T00:00:00", str(self.article.pk)]),
+            ("?ordering=favorites", ["many", str(self.article.pk)]),
+            ("/feed/?", ["yesterday", str(self.article.pk)]),
+        ):
+            cursor = urlsafe_b64encode(json.dumps({"p": position}).encode()).decode()
+            with self.subTest(path=path, position=position):
+                response = self.client.get(
+                    f"{self.article_url}{path}&cursor={cursor}",
+                    HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(
+                    response.json(), self.not_found_response("Invalid cursor")
+                )
+
+
+class TestArticleTagging(APITransactionBaseTest):
+    def test_create_article_with_stale_tag_dictionary(self) -> None:
+        (tag,) = Tag.objects.resolve(["dragons"])
+        # Deleted by another process, which leaves this dictionary stale.
+        Tag.objects.filter(pk=tag.pk)._raw_delete(Tag.objects.db)
+
+        response = self.client.post(
+            "/api/v1/articles",
+            data={
+                "article": {
+                    "title": "Stale",
+                    "description": "d",
+                    "body": "b",
+                    "tagList": ["dragons"],
+                }
+            },
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(get_user_token(self.user)),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["article"]["tagList"], ["dragons"])
+        self.assertTrue(Tag.objects.filter(slug="dragons").exists())
+
+
+class TestArticleSlugs(APIBaseTest):
+    def create_article(self, title: str) -> Article:
+        return Article.objects.create(
+            title=title, description="d", body="b", author=self.user.profile
+        )
+
+    def test_same_titles_get_suffixed_slugs(self) -> None:
+        slugs = [self.create_article("Same title").slug for _ in range(3)]
+
+        self.assertEqual(slugs, ["same-title", "same-title-2", "same-title-3"])
+
+    def test_suffix_follows_highest_taken(self) -> None:
+        self.create_article("Same title")
+        self.create_article("Same title 7")
+        self.create_article("Same title extended")
+
+        self.assertEqual(self.create_article("Same title").slug, "same-title-8")
+
+    def test_untitled_slug(self) -> None:
+        self.assertEqual(self.create_article("!!!").slug, "article")
+
+    def test_slug_is_stable_across_edits(self) -> None:
+        article = self.create_article("Original title")
+
+        response = self.client.put(
+            f"/api/v1/articles/{article.slug}",
+            data={"article": {"title": "New title", "slug": "new-title"}},
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(get_user_token(self.user)),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["article"]["slug"], "original-title")
+        self.assertEqual(Article.objects.get(pk=article.pk).title, "New title")
+
+    def test_create_retries_when_slug_is_taken_concurrently(self) -> None:
+        self.create_article("Same title")
+        free_slug = ArticleQuerySet.free_slug
+        stale = iter(["same-title"])
+
+        def racing_free_slug(queryset, base):
+            return next(stale, None) or free_slug(queryset, base)
+
+        with mock.patch.object(
+            ArticleQuerySet,
+            "free_slug",
+            autospec=True,
+            side_effect=racing_free_slug,
+        ) as allocate:
+            article = self.create_article("Same title")
+
+        self.assertEqual(allocate.call_count, 2)
+        self.assertEqual(article.slug, "same-title-2")
+
+    def test_free_slug_uses_an_index(self) -> None:
+        self.create_article("Same title")
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            with CaptureQueriesContext(connection) as context:
+                Article.objects.free_slug("same-title")
+            cursor.execute(f"EXPLAIN {context.captured_queries[-1]['sql']}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertNotIn("Seq Scan", plan)
+
+
+class TestListingIndexes(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.articles = [
+            Article.objects.create(
+                title=f"Article {index}",
+                description="d",
+                body="b",
+                author=self.user.profile,
+            )
+            for index in range(3)
+        ]
+
+    def explain(self, queryset: QuerySet) -> str:
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Stand in for a large table, where the planner picks these anyway.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            return queryset.explain()
+
+    def listing(self, ordering: str = "recent", **params: str) -> QuerySet:
+        queryset = Article.objects.order_by(*ArticleViewset.orderings[ordering])
+        return filter_articles(queryset, params)[:20]
+
+    def test_default_orderings_are_deterministic(self) -> None:
+        comments = [
+            Comment.objects.create(
+                body=str(index), article=self.articles[0], author=self.user.profile
+            )
+            for index in range(3)
+        ]
+
+        self.assertEqual(list(Article.objects.all()), self.articles[::-1])
+        self.assertEqual(list(Comment.objects.all()), comments)
+
+    def test_orderings_walk_an_index(self) -> None:
+        for ordering, index in (
+            ("recent", "article_created_idx"),
+            ("favorites", "article_favorites_idx"),
+        ):
+            with self.subTest(ordering=ordering):
+                plan = self.explain(self.listing(ordering))
+
+                self.assertIn(index, plan)
+                self.assertNotIn("Sort", plan)
+
+    def test_filters_use_indexes(self) -> None:
+        # With a handful of rows, or statistics autovacuum happened to gather
+        # from other tests, the planner may scan a whole tiny table instead.
+        # Enough other rows and fresh statistics make each lookup selective.
+        Tag.objects.resolve(f"Tag {index}" for index in range(200))
+        User.objects.provision(
+            {"email": f"user{index}@kiterunner.com", "username": f"user{index}"}
+            for index in range(200)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Tag._meta.db_table}, {User._meta.db_table}")
+
+        username = self.user.username
+        by_username = f"Index Cond: ((username)::text = '{username}'::text)"
+        for params, index, lookup in (
+            ({"author": username}, "article_author_created_idx", by_username),
+            (
+                {"tag": "Dragons"},
+                "article_tag_tag_article_idx",
+                "Index Cond: ((slug)::text = 'dragons'::text)",
+            ),
+            # The index Django creates for the profile_id foreign key.
+            (
+                {"favorited": username},
+                "kite_runner_profile_favourites_profile_id_127a01b4",
+                by_username,
+            ),
+        ):
+            with self.subTest(params=params):
+                plan = self.explain(self.listing(**params))
+
+                self.assertIn(index, plan)
+                self.assertIn(lookup, plan)
+                self.assertNotIn("Seq Scan", plan)
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_feed_pages_over_indexes(self) -> None:
+        for index in range(2):
+            author = User.objects.create_user(
+                f"celebrity{index}@kiterunner.com", None, f"celeb{index}"
+            )
+            self.user.profile.follow(author.profile)
+
+        timeline, merged = Article.objects.feed_for(self.user.profile).sources()
+
+        plan = self.explain(timeline[:20])
+        self.assertIn("timeline_feed_idx", plan)
+        self.assertNotIn("Sort", plan)
+
+        # Every skipped author is read in the same scan, either through
+        # ``article_author_created_idx`` or walking ``article_created_idx``.
+        plan = self.explain(merged[:20])
+        self.assertRegex(
+            plan, r"Index Scan using article_(author_)?created_idx on kite_runner_article"
+        )
+        self.assertIn("author_id = ANY", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_reverse_lookups_are_index_only(self) -> None:
+        profile = self.user.profile
+        for queryset, index in (
+            (
+                Profile.favourites.through.objects.filter(
+                    article_id=self.articles[0].pk
+                ).values_list("profile_id"),
+                "favourite_article_profile_idx",
+            ),
+            (
+                Profile.following.through.objects.filter(
+                    to_profile_id=profile.pk
+                ).values_list("from_profile_id"),
+                "following_to_from_idx",
+            ),
+        ):
+            with self.subTest(index=index):
+                self.assertIn(f"Index Only Scan using {index}", self.explain(queryset))
@@ -0,0 +1,104 @@
+from typing import Any
+
+from rest_framework import status
+
+from kite_runner.models import Article, Comment, Tag
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APITransactionBaseTest
+
+
+class TestAsyncReadViews(APITransactionBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.article: Article = Article.objects.create(
+            title="Async Article",
+            body="Test Body",
+            description="Test Description",
+            author=self.user.profile,
+        )
+        self.article.tags.set(Tag.objects.resolve(["asyncio", "django"]))
+        self.comment = Comment.objects.create(
+            body="Test Comment", article=self.article, author=self.user.profile
+        )
+        self.token = get_user_token(self.user)
+
+    def assertSameResponse(self, path: str, **extra: Any) -> None:
+        sync_response = self.client.get(f"/api/v1/{path}", **extra)
+        async_response = self.client.get(f"/api/v1/async/{path}", **extra)
+
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_article_list_matches_sync_view(self) -> None:
+        self.assertSameResponse("articles")
+        self.assertSameResponse("articles?tag=asyncio&limit=1")
+
+    def test_article_detail_matches_sync_view(self) -> None:
+        self.assertSameResponse(f"articles/{self.article.slug}")
+        self.assertSameResponse("articles/missing")
+
+    def test_comment_list_matches_sync_view(self) -> None:
+        self.assertSameResponse(f"articles/{self.article.slug}/comments/")
+
+    def test_profile_matches_sync_view(self) -> None:
+        self.assertSameResponse(f"profiles/{self.USERNAME}")
+
+    def test_tags_match_sync_view(self) -> None:
+        self.assertSameResponse("tags/")
+
+    def test_authenticated_viewer_flags(self) -> None:
+        self.user.profile.favorite(self.article)
+
+        self.assertSameResponse(
+            f"articles/{self.article.slug}",
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+    def test_article_detail_includes_comments(self) -> None:
+        response = self.client.get(
+            f"/api/v1/async/articles/{self.article.slug}?include=comments"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertEqual(response_data["article"]["slug"], self.article.slug)
+        self.assertEqual(
+            [comment["body"] for comment in response_data["comments"]],
+            [self.comment.body],
+        )
+
+    def test_included_comments_are_paged(self) -> None:
+        for index in range(3):
+            Comment.objects.create(
+                body=f"Comment {index}", article=self.article, author=self.user.profile
+            )
+
+        response = self.client.get(
+            f"/api/v1/async/articles/{self.article.slug}"
+            "?include=comments&limit=2&offset=1"
+        )
+
+        self.assertEqual(
+            [comment["body"] for comment in response.json()["comments"]],
+            ["Comment 0", "Comment 1"],
+        )
+
+    def test_writes_are_not_allowed(self) -> None:
+        response = self.client.post(
+            f"/api/v1/async/articles/{self.article.slug}/comments/",
+            {"comment": {"body": "New Comment"}},
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(response["Allow"], "GET, HEAD")
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_invalid_token_is_rejected(self) -> None:
+        response = self.client.get(
+            "/api/v1/async/articles", HTTP_AUTHORIZATION=TOKEN_HEADER.format("bad")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
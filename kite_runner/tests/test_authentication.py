@@ -1,5 +1,18 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
+from kite_runner.utils import passwords
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
 from .base import APIBaseTest
 
 
@@ -23,3 +36,124 @@ class TestAuthentication(APIBaseTest):
         self.assertEqual(
             response.json()["errors"]["error"][0], "wrong username or password"
         )
+
+    def test_failed_login_sends_signal(self) -> None:
+        handler = mock.Mock()
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+
+        self.client.post(
+            "/api/v1/users/login/",
+            {"user": {"email": self.EMAIL, "password": "wrong_password"}},
+        )
+
+        handler.assert_called_once()
+        self.assertEqual(handler.call_args.kwargs["credentials"], {"email": self.EMAIL})
+
+
+class TestCachedJWTAuthentication(APIBaseTest):
+    user_api_url = "/api/v1/user/"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.token = get_user_token(self.user)
+
+    def _get_current_user(self) -> HttpResponse:
+        return self.client.get(
+            self.user_api_url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+        )
+
+    def test_cached_user_resolves_without_queries(self) -> None:
+        self._get_current_user()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self._get_current_user()
+        queries = [q["sql"] for q in context if "SAVEPOINT" not in q["sql"]]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_profile_update_invalidates_cached_user(self) -> None:
+        self._get_current_user()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                self.user_api_url,
+                {"user": {"bio": "Updated bio"}},
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+            )
+
+        response = self._get_current_user()
+        self.assertEqual(response.json()["user"]["bio"], "Updated bio")
+
+    def test_deactivated_user_is_rejected(self) -> None:
+        self._get_current_user()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response = self._get_current_user()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()["errors"]["code"], "user_inactive")
+
+
+class TestLoginPasswordHashing(APIBaseTest):
+    login_url = "/api/v1/users/login/"
+
+    def _login(self) -> HttpResponse:
+        return self.client.post(
+            self.login_url,
+            {"user": {"email": self.EMAIL, "password": self.PASSWORD}},
+        )
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_login_upgrades_outdated_hash(self) -> None:
+        self.user.password = make_password(self.PASSWORD, hasher="md5")
+        self.user.save()
+
+        response = self._login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+        self.assertTrue(self.user.check_password(self.PASSWORD))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+    )
+    def test_inactive_user_hash_is_not_upgraded(self) -> None:
+        self.user.password = make_password(self.PASSWORD, hasher="md5")
+        self.user.is_active = False
+        self.user.save()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self._login()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in context))
+
+    def test_login_is_rejected_when_pool_is_saturated(self) -> None:
+        passwords._get_pool()
+        saturated = threading.BoundedSemaphore(1)
+        saturated.acquire()
+
+        with mock.patch.object(passwords, "_slots", saturated):
+            response = self._login()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+    @override_settings(LOGIN_HASH_TIMEOUT=0)
+    def test_login_times_out_with_service_unavailable(self) -> None:
+        response = self._login()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
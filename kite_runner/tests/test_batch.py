@@ -0,0 +1,160 @@
+from typing import Dict, List
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from kite_runner.models import Article, Profile, TimelineEntry
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APIBaseTest
+
+
+class TestFollowBatch(APIBaseTest):
+    url = "/api/v1/user/following"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.authors = [
+            self._create_user(f"author{i}@kiterunner.com", "password", f"author{i}")
+            for i in range(6)
+        ]
+        Article.objects.create(
+            title="Backfilled",
+            description="d",
+            body="b",
+            author=self.authors[0].profile,
+        )
+        self.auth = TOKEN_HEADER.format(get_user_token(self.user))
+
+    def post(self, data: Dict[str, List[str]]) -> HttpResponse:
+        return self.client.post(self.url, data=data, HTTP_AUTHORIZATION=self.auth)
+
+    def test_follow_many(self) -> None:
+        self.user.profile.follow(self.authors[1].profile)
+
+        response = self.post({"follow": ["author0", "author1", "nobody"]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "profiles": [
+                    {"username": "author0", "following": True, "changed": True},
+                    {"username": "author1", "following": True, "changed": False},
+                    {"username": "nobody", "error": "Not found."},
+                ]
+            },
+        )
+
+        profile = Profile.objects.get(pk=self.user.profile.pk)
+        self.assertEqual(profile.following_count, 2)
+        self.assertEqual(
+            Profile.objects.get(pk=self.authors[0].profile.pk).followers_count, 1
+        )
+        self.assertTrue(TimelineEntry.objects.filter(profile=profile).exists())
+
+    def test_unfollow_many(self) -> None:
+        for author in self.authors[:3]:
+            self.user.profile.follow(author.profile)
+
+        response = self.post({"unfollow": ["author0", "author1", "author5"]})
+
+        self.assertEqual(
+            [item["changed"] for item in response.json()["profiles"]],
+            [True, True, False],
+        )
+        profile = Profile.objects.get(pk=self.user.profile.pk)
+        self.assertEqual(profile.following_count, 1)
+        self.assertFalse(TimelineEntry.objects.filter(profile=profile).exists())
+        self.assertEqual(
+            Profile.objects.get(pk=self.authors[0].profile.pk).followers_count, 0
+        )
+
+    def test_query_count_does_not_grow_with_batch_size(self) -> None:
+        def count_queries(usernames: List[str]) -> int:
+            with CaptureQueriesContext(connection) as context:
+                self.post({"follow": usernames})
+            return len(context)
+
+        count_queries([])  # Warms the authenticated user cache.
+        small = count_queries(["author0", "author1"])
+        large = count_queries(["author2", "author3", "author4", "author5"])
+
+        self.assertEqual(small, large)
+
+    @override_settings(SOCIAL_BATCH_LIMIT=2)
+    def test_rejects_oversized_and_conflicting_batches(self) -> None:
+        response = self.post({"follow": ["author0", "author1", "author2"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.post({"follow": ["author0"], "unfollow": ["author0"]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self) -> None:
+        response = self.client.post(self.url, data={"follow": ["author0"]})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TestFavoriteBatch(APIBaseTest):
+    url = "/api/v1/user/favorites"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.articles = [
+            Article.objects.create(
+                title=f"Article {i}",
+                description="d",
+                body="b",
+                author=self.user.profile,
+            )
+            for i in range(3)
+        ]
+        self.auth = TOKEN_HEADER.format(get_user_token(self.user))
+
+    def test_favorite_and_unfavorite_many(self) -> None:
+        self.user.profile.favorite(self.articles[2])
+
+        response = self.client.post(
+            self.url,
+            data={
+                "favorite": ["article-0", "article-1", "missing"],
+                "unfavorite": ["article-2"],
+            },
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "articles": [
+                    {"slug": "article-0", "favorited": True, "changed": True},
+                    {"slug": "article-1", "favorited": True, "changed": True},
+                    {"slug": "missing", "error": "Not found."},
+                    {"slug": "article-2", "favorited": False, "changed": True},
+                ]
+            },
+        )
+        self.assertEqual(
+            list(
+                Article.objects.order_by("pk").values_list("favorites_count", flat=True)
+            ),
+            [1, 1, 0],
+        )
+
+    def test_favorite_invalidates_cached_article(self) -> None:
+        path = f"/api/v1/articles/{self.articles[0].slug}"
+        self.client.get(path)
+
+        self.client.post(
+            self.url, data={"favorite": ["article-0"]}, HTTP_AUTHORIZATION=self.auth
+        )
+        response = self.client.get(path)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["article"]["favoritesCount"], 1)
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from typing import Dict
+
+from django.core.management import call_command
+
+from kite_runner.models import Article, Comment, Profile, TimelineEntry, User
+
+from .base import APIBaseTest, APITransactionBaseTest
+
+
+class TestSeedData(APIBaseTest):
+    def seed(self, *args: str) -> str:
+        stdout = StringIO()
+        call_command(
+            "seed_data",
+            "--users=8",
+            "--articles=20",
+            "--tags=5",
+            "--follows=3",
+            "--favorites=4",
+            "--comments=2",
+            *args,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    def test_seeds_requested_volumes(self) -> None:
+        output = self.seed()
+
+        self.assertIn("Articles: 20 rows", output)
+        self.assertEqual(User.objects.filter(username__startswith="seed").count(), 8)
+        self.assertEqual(Profile.objects.count(), User.objects.count())
+        self.assertEqual(Article.objects.count(), 20)
+        self.assertEqual(Comment.objects.count(), 40)
+        self.assertTrue(TimelineEntry.objects.exists())
+        self.assertFalse(Article.objects.filter(search_vector=None).exists())
+
+        user = User.objects.get(username="seed0")
+        self.assertTrue(user.check_password("password"))
+
+    def test_seeded_counters_are_consistent(self) -> None:
+        self.seed()
+
+        stdout = StringIO()
+        call_command("repair_counters", stdout=stdout)
+
+        self.assertNotRegex(stdout.getvalue(), r"repaired [1-9]")
+
+    def test_rejects_taken_prefix(self) -> None:
+        self.seed()
+
+        with self.assertRaisesMessage(Exception, "already exist"):
+            self.seed()
+
+        self.seed("--prefix=again")
+        self.assertEqual(Article.objects.count(), 40)
+
+
+class TestBenchmark(APITransactionBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        call_command(
+            "seed_data",
+            "--users=5",
+            "--articles=10",
+            "--tags=3",
+            "--follows=3",
+            stdout=StringIO(),
+        )
+
+    def benchmark(self, *args: str) -> Dict:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            call_command("benchmark", *args, f"--output={path}", stderr=StringIO())
+            with open(path) as file:
+                return json.load(file)
+
+    def test_drives_every_route(self) -> None:
+        articles = Article.objects.count()
+
+        report = self.benchmark("--requests=2", "--warmup=0")
+
+        self.assertEqual(report["uncovered_routes"], [])
+        self.assertFalse(report["response_cache"])
+        for result in report["results"]:
+            self.assertEqual(result["errors"], 0, result)
+            self.assertEqual(result["cache_hits"], 0, result)
+            self.assertEqual(result["requests"], 2)
+            self.assertLessEqual(
+                result["latency_ms"]["p50"], result["latency_ms"]["p99"]
+            )
+        self.assertTrue(any(result["queries"]["max"] for result in report["results"]))
+        # Writes are rolled back.
+        self.assertEqual(Article.objects.count(), articles)
+
+    def test_measures_response_cache_hits_on_request(self) -> None:
+        report = self.benchmark(
+            "--requests=2", "--warmup=1", "--only=tags", "--response-cache"
+        )
+
+        self.assertTrue(report["response_cache"])
+        cache_hits = {
+            result["path"]: result["cache_hits"] for result in report["results"]
+        }
+        self.assertEqual(cache_hits["/api/v1/tags/"], 2)
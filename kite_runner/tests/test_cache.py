@@ -0,0 +1,196 @@
+from django.test import override_settings
+from rest_framework import status
+
+from kite_runner import cache
+from kite_runner.checks import check_shared_cache
+from kite_runner.models import Article, Comment, Tag
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APIBaseTest
+
+
+class TestResponseCache(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.article: Article = Article.objects.create(
+            title="Cached Article",
+            body="Test Body",
+            description="Test Description",
+            author=self.user.profile,
+        )
+        self.token = get_user_token(self.user)
+
+    def test_anonymous_read_is_served_from_cache(self) -> None:
+        response = self.client.get("/api/v1/articles")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        cached = self.client.get("/api/v1/articles")
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.json(), response.json())
+
+    def test_query_params_are_part_of_the_key(self) -> None:
+        self.client.get("/api/v1/articles?limit=1")
+
+        response = self.client.get("/api/v1/articles?limit=2")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_authenticated_read_bypasses_cache(self) -> None:
+        self.client.get("/api/v1/articles")
+
+        response = self.client.get(
+            "/api/v1/articles",
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Cache", response)
+
+    def test_article_write_invalidates_list_and_detail(self) -> None:
+        self.client.get("/api/v1/articles")
+        self.client.get(f"/api/v1/articles/{self.article.slug}")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                f"/api/v1/articles/{self.article.slug}",
+                {"article": {"body": "Updated Body"}},
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+                format="json",
+            )
+
+        response = self.client.get("/api/v1/articles")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["articles"][0]["body"], "Updated Body")
+
+        response = self.client.get(f"/api/v1/articles/{self.article.slug}")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["article"]["body"], "Updated Body")
+
+    def test_unrelated_write_keeps_other_scopes_cached(self) -> None:
+        self.client.get("/api/v1/tags/")
+        self.client.get(f"/api/v1/articles/{self.article.slug}/comments/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                body="Test Comment", article=self.article, author=self.user.profile
+            )
+
+        response = self.client.get("/api/v1/tags/")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        response = self.client.get(f"/api/v1/articles/{self.article.slug}/comments/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["commentsCount"], 1)
+
+    def test_comment_delete_invalidates_comments(self) -> None:
+        comment = Comment.objects.create(
+            body="Test Comment", article=self.article, author=self.user.profile
+        )
+        self.client.get(f"/api/v1/articles/{self.article.slug}/comments/")
+
+        comment = Comment.objects.only("id", "article_id").get(pk=comment.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(2):
+                comment.delete()
+
+        response = self.client.get(f"/api/v1/articles/{self.article.slug}/comments/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["comments"], [])
+
+    def test_cached_comments_cost_no_queries(self) -> None:
+        self.client.get(f"/api/v1/articles/{self.article.slug}/comments/")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f"/api/v1/articles/{self.article.slug}/comments/"
+            )
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_reused_slug_does_not_serve_deleted_comments(self) -> None:
+        slug = self.article.slug
+        Comment.objects.create(
+            body="Test Comment", article=self.article, author=self.user.profile
+        )
+        self.client.get(f"/api/v1/articles/{slug}/comments/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.delete()
+            Article.objects.create(
+                title="Cached Article",
+                body="Test Body",
+                description="Test Description",
+                author=self.user.profile,
+                slug=slug,
+            )
+
+        response = self.client.get(f"/api/v1/articles/{slug}/comments/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["comments"], [])
+
+    def test_tag_write_invalidates_tags(self) -> None:
+        self.client.get("/api/v1/tags/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(tag="python", slug="python")
+
+        response = self.client.get("/api/v1/tags/")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_stats_count_hits_and_misses(self) -> None:
+        cache.reset_stats()
+
+        self.client.get("/api/v1/tags/")
+        self.client.get("/api/v1/tags/")
+
+        self.assertEqual(cache.get_stats(), {"hit": 1, "miss": 1})
+
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+MEMCACHED = {
+    "default": {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache"}
+}
+
+
+class TestSharedCacheCheck(APIBaseTest):
+    @override_settings(CACHES=LOCMEM, RESPONSE_CACHE_TIMEOUT=300)
+    def test_process_local_cache_is_rejected(self) -> None:
+        errors = check_shared_cache()
+
+        self.assertEqual([e.id for e in errors], ["kite_runner.E002"])
+        self.assertIn("RESPONSE_CACHE_TIMEOUT", errors[0].msg)
+
+    @override_settings(CACHES=MEMCACHED, RESPONSE_CACHE_TIMEOUT=300)
+    def test_shared_cache_passes(self) -> None:
+        self.assertEqual(check_shared_cache(), [])
+
+    @override_settings(
+        CACHES=LOCMEM, RESPONSE_CACHE_TIMEOUT=0, AUTH_USER_CACHE_TIMEOUT=60
+    )
+    def test_authenticated_user_cache_needs_shared_cache(self) -> None:
+        errors = check_shared_cache()
+
+        self.assertEqual([e.id for e in errors], ["kite_runner.E002"])
+        self.assertIn("AUTH_USER_CACHE_TIMEOUT", errors[0].msg)
+
+    @override_settings(
+        CACHES=LOCMEM,
+        RESPONSE_CACHE_TIMEOUT=0,
+        AUTH_USER_CACHE_TIMEOUT=0,
+        DATABASE_REPLICAS=["replica"],
+        REPLICA_STICKINESS=10,
+    )
+    def test_replica_stickiness_needs_shared_cache(self) -> None:
+        errors = check_shared_cache()
+
+        self.assertEqual([e.id for e in errors], ["kite_runner.E002"])
+        self.assertIn("REPLICA_STICKINESS", errors[0].msg)
+
+    @override_settings(
+        CACHES=LOCMEM,
+        RESPONSE_CACHE_TIMEOUT=0,
+        AUTH_USER_CACHE_TIMEOUT=0,
+        DATABASE_REPLICAS=[],
+    )
+    def test_process_local_cache_passes_when_unused(self) -> None:
+        self.assertEqual(check_shared_cache(), [])
@@ -1,5 +1,11 @@
+from typing import List
+
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
+from kite_runner.api.comment import comments_for
 from kite_runner.models import Article, Comment
 from kite_runner.utils.constants import TOKEN_HEADER
 from kite_runner.utils.tokens import get_user_token
@@ -28,17 +34,38 @@ class TestCommentAPIView(APIBaseTest):
 
         response_data = response.json()
         self.assertIsNotNone(response_data)
-        self.assertEqual(response_data["count"], 1)
+        self.assertEqual(response_data["commentsCount"], 1)
         self.assertEqual(response_data["comments"][0]["body"], self.comment.body)
         self.assertIsNotNone(response_data["comments"][0]["author"])
         self.assertIsNotNone(response_data["comments"][0]["createdAt"])
         self.assertIsNotNone(response_data["comments"][0]["updatedAt"])
 
+    def test_get_comments_for_article_with_cursor(self) -> None:
+        second_comment = Comment.objects.create(
+            body="Second Comment", article=self.article, author=self.user.profile
+        )
+
+        response = self.client.get(
+            f"/api/v1/articles/{self.article.slug}/comments/?cursor=&limit=1"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertEqual(response_data["comments"][0]["id"], self.comment.pk)
+        self.assertIsNotNone(response_data["next"])
+
+        response = self.client.get(response_data["next"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()
+        self.assertEqual(response_data["comments"][0]["id"], second_comment.pk)
+        self.assertIsNone(response_data["next"])
+
     def test_get_all_comments_for_article_no_articles_found(self) -> None:
         response = self.client.get("/api/v1/articles/invalid-slug/comments/")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.json()["count"], 0)
+        self.assertEqual(response.json()["commentsCount"], 0)
 
     def test_create_comment_for_article(self) -> None:
         response = self.client.post(
@@ -55,3 +82,119 @@ class TestCommentAPIView(APIBaseTest):
         self.assertIsNotNone(response_data["author"])
         self.assertIsNotNone(response_data["createdAt"])
         self.assertIsNotNone(response_data["updatedAt"])
+
+    def test_delete_comment(self) -> None:
+        url = f"/api/v1/articles/{self.article.slug}/comments/{self.comment.pk}"
+
+        response = self.client.delete(
+            url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Comment.objects.filter(pk=self.comment.pk).exists())
+
+        response = self.client.delete(
+            url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_comment_for_unknown_article(self) -> None:
+        response = self.client.post(
+            "/api/v1/articles/invalid-slug/comments/",
+            {"comment": {"body": "New Comment"}},
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            response.json(),
+            self.not_found_response(
+                "Could not found any article with slug: invalid-slug"
+            ),
+        )
+
+    def test_delete_comment_of_another_user(self) -> None:
+        other = self._create_user(
+            email="other@kiterunner.com", password="somepassword", username="other"
+        )
+
+        response = self.client.delete(
+            f"/api/v1/articles/{self.article.slug}/comments/{self.comment.pk}",
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(get_user_token(other)),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+
+
+class TestCommentListing(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.article: Article = Article.objects.create(
+            title="Popular Article",
+            body="Test Body",
+            description="Test Description",
+            author=self.user.profile,
+        )
+        self.comments = [
+            Comment.objects.create(
+                body=f"Comment {index}", article=self.article, author=self.user.profile
+            )
+            for index in range(5)
+        ]
+        self.url = f"/api/v1/articles/{self.article.slug}/comments/"
+
+    def ids(self, response: HttpResponse) -> List[int]:
+        return [comment["id"] for comment in response.json()["comments"]]
+
+    def test_list_uses_counter_and_lean_query(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{self.url}?limit=2")
+
+        self.assertEqual(response.json()["commentsCount"], 5)
+        self.assertEqual(self.ids(response), [c.pk for c in self.comments[:2]])
+
+        queries = [q["sql"] for q in context if "SAVEPOINT" not in q["sql"]]
+        self.assertFalse([sql for sql in queries if "COUNT(" in sql])
+        page_query = queries[-1]
+        self.assertNotIn('"kite_runner_article"', page_query)
+        self.assertNotIn('"kite_runner_comment"."article_id",', page_query)
+
+    def test_since_returns_following_comments(self) -> None:
+        response = self.client.get(f"{self.url}?since={self.comments[1].pk}&limit=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(response), [c.pk for c in self.comments[2:4]])
+        self.assertEqual(response.json()["commentsCount"], 5)
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_before_returns_preceding_comments(self) -> None:
+        response = self.client.get(f"{self.url}?before={self.comments[4].pk}&limit=2")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ids(response), [c.pk for c in self.comments[2:4]])
+        self.assertIsNotNone(response.json()["previous"])
+
+    def test_unknown_anchor_is_not_found(self) -> None:
+        other = Article.objects.create(
+            title="Other", body="b", description="d", author=self.user.profile
+        )
+        foreign = Comment.objects.create(
+            body="Elsewhere", article=other, author=self.user.profile
+        )
+
+        for anchor in (foreign.pk, "abc"):
+            response = self.client.get(f"{self.url}?since={anchor}")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_first_page_uses_listing_index(self) -> None:
+        with connection.cursor() as cursor:
+            # Stand in for a large table, where the planner picks these anyway.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+
+        plan = comments_for(self.article.pk)[:20].explain()
+
+        self.assertIn("comment_article_created_idx", plan)
+        self.assertNotIn("Sort", plan)
@@ -0,0 +1,122 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kite_runner.models import Article, Comment, Profile
+
+from .base import APIBaseTest
+
+
+class TestCounters(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.author: Profile = self._create_user(
+            email="author@kiterunner.com", password="somepassword", username="author"
+        ).profile
+        self.article: Article = Article.objects.create(
+            title="Test Article",
+            body="Test Body",
+            description="Test Description",
+            author=self.author,
+        )
+
+    def test_follow_and_unfollow_update_counters(self) -> None:
+        self.user.profile.follow(self.author)
+        self.user.profile.follow(self.author)
+
+        self.author.refresh_from_db()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 1)
+        self.assertEqual(self.user.profile.following_count, 1)
+
+        self.user.profile.unfollow(self.author)
+        self.user.profile.unfollow(self.author)
+
+        self.author.refresh_from_db()
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.author.followers_count, 0)
+        self.assertEqual(self.user.profile.following_count, 0)
+
+    def test_favorite_and_unfavorite_update_counters(self) -> None:
+        self.user.profile.favorite(self.article)
+        self.user.profile.favorite(self.article)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.favorites_count, 1)
+
+        self.user.profile.unfavorite(self.article)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.favorites_count, 0)
+
+    def test_article_and_comment_counters(self) -> None:
+        comment = Comment.objects.create(
+            body="Test Comment", article=self.article, author=self.user.profile
+        )
+
+        self.author.refresh_from_db()
+        self.article.refresh_from_db()
+        self.assertEqual(self.author.articles_count, 1)
+        self.assertEqual(self.article.comments_count, 1)
+
+        comment.delete()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
+
+        self.article.delete()
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.articles_count, 0)
+
+    def test_deleting_article_skips_comment_upkeep(self) -> None:
+        for index in range(10):
+            Comment.objects.create(
+                body=f"Comment {index}", article=self.article, author=self.author
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            self.article.delete()
+
+        self.assertLess(len(context), 10)
+        self.assertFalse(
+            any('UPDATE "kite_runner_article"' in q["sql"] for q in context)
+        )
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.articles_count, 0)
+
+    def test_deleting_commenter_updates_comment_counter(self) -> None:
+        commenter = self._create_user(
+            email="commenter@kiterunner.com",
+            password="somepassword",
+            username="commenter",
+        )
+        Comment.objects.create(
+            body="Test Comment", article=self.article, author=commenter.profile
+        )
+
+        commenter.delete()
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comments_count, 0)
+
+    def test_repair_counters(self) -> None:
+        self.user.profile.favorite(self.article)
+        Article.objects.update(favorites_count=5, comments_count=3)
+        Profile.objects.update(followers_count=2)
+
+        call_command("repair_counters", stdout=StringIO())
+
+        self.article.refresh_from_db()
+        self.author.refresh_from_db()
+        self.assertEqual(self.article.favorites_count, 1)
+        self.assertEqual(self.article.comments_count, 0)
+        self.assertEqual(self.author.followers_count, 0)
+        self.assertEqual(self.author.articles_count, 1)
+
+    def test_repair_counters_rejects_invalid_batch_size(self) -> None:
+        for batch_size in ("0", "-1"):
+            with self.subTest(batch_size=batch_size):
+                with self.assertRaisesMessage(CommandError, "at least 1"):
+                    call_command("repair_counters", f"--batch-size={batch_size}")
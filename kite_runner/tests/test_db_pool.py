@@ -0,0 +1,106 @@
+import psycopg2
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.test import SimpleTestCase
+
+from kite_runner.db.backends.postgresql_pool.base import (DatabaseWrapper,
+                                                          close_pools,
+                                                          get_pool_stats)
+from kite_runner.db.pool import ConnectionPool
+
+
+class TestConnectionPool(SimpleTestCase):
+    def setUp(self) -> None:
+        conn_params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+        self.pool = ConnectionPool(
+            lambda: psycopg2.connect(**conn_params), max_size=1, timeout=0.05
+        )
+
+    def tearDown(self) -> None:
+        self.pool.close()
+
+    def test_released_connection_is_reused(self) -> None:
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+
+        self.assertIs(self.pool.acquire(), connection)
+        self.assertEqual(self.pool.stats()["opened"], 1)
+        self.assertEqual(self.pool.stats()["in_use"], 1)
+        self.pool.release(connection)
+
+    def test_acquire_times_out_when_exhausted(self) -> None:
+        connection = self.pool.acquire()
+
+        with self.assertRaises(psycopg2.OperationalError):
+            self.pool.acquire()
+        self.assertEqual(self.pool.stats()["timeouts"], 1)
+
+        self.pool.release(connection)
+
+    def test_open_transaction_is_rolled_back_on_release(self) -> None:
+        connection = self.pool.acquire()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.pool.release(connection)
+
+        connection = self.pool.acquire()
+        self.assertEqual(
+            connection.get_transaction_status(),
+            psycopg2.extensions.TRANSACTION_STATUS_IDLE,
+        )
+        self.pool.release(connection)
+
+    def test_broken_connection_is_replaced(self) -> None:
+        self.pool.health_check_interval = 0
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        connection.close()
+
+        replacement = self.pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        self.assertFalse(replacement.closed)
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+        self.pool.release(replacement)
+
+
+class TestPooledDatabaseWrapper(SimpleTestCase):
+    databases = {DEFAULT_DB_ALIAS}
+
+    def setUp(self) -> None:
+        settings_dict = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            "ENGINE": "kite_runner.db.backends.postgresql_pool",
+            "POOL": {"MAX_SIZE": 2},
+        }
+        self.wrappers = [DatabaseWrapper(settings_dict, "pooled") for _ in range(2)]
+
+    def tearDown(self) -> None:
+        for wrapper in self.wrappers:
+            wrapper.close()
+        close_pools()
+
+    def test_closed_connections_are_shared_between_wrappers(self) -> None:
+        first, second = self.wrappers
+
+        with first.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        raw_connection = first.connection
+        first.close()
+
+        with second.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+
+        self.assertIs(second.connection, raw_connection)
+        self.assertEqual(get_pool_stats()["pooled"]["acquired"], 2)
+
+    def test_exhausted_pool_raises_database_error(self) -> None:
+        extra = DatabaseWrapper(self.wrappers[0].settings_dict, "pooled")
+        extra.settings_dict["POOL"] = {"MAX_SIZE": 2, "TIMEOUT": 0.05}
+        self.wrappers.append(extra)
+
+        for wrapper in self.wrappers[:2]:
+            wrapper.ensure_connection()
+
+        with self.assertRaises(OperationalError):
+            extra.ensure_connection()
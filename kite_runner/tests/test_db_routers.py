@@ -0,0 +1,161 @@
+from typing import Any, Optional, Tuple
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from kite_runner.db import routers
+from kite_runner.models import Article
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APITransactionBaseTest
+
+
+@override_settings(DATABASE_REPLICAS=["replica1", "replica2"])
+class TestReplicaRouter(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.router = routers.ReplicaRouter()
+        self.factory = RequestFactory()
+        patcher = mock.patch.object(routers, "_is_healthy", return_value=True)
+        self.is_healthy = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_alias(self, request: HttpRequest) -> Optional[str]:
+        with routers.request_routing(request):
+            return self.router.db_for_read(Article)
+
+    def token_header(self, user_id: int) -> str:
+        token = AccessToken()
+        token["user_id"] = user_id
+        return TOKEN_HEADER.format(token)
+
+    def test_reads_outside_requests_use_primary(self) -> None:
+        self.assertIsNone(self.router.db_for_read(Article))
+
+    def test_request_reads_from_one_replica(self) -> None:
+        with routers.request_routing(self.factory.get("/")):
+            alias = self.router.db_for_read(Article)
+            self.assertIn(alias, ["replica1", "replica2"])
+            self.assertEqual(self.router.db_for_read(Article), alias)
+
+    def test_requests_rotate_over_replicas(self) -> None:
+        aliases = {self.read_alias(self.factory.get("/")) for _ in range(4)}
+
+        self.assertEqual(aliases, {"replica1", "replica2"})
+
+    def test_unhealthy_replicas_are_skipped(self) -> None:
+        self.is_healthy.side_effect = lambda alias: alias == "replica2"
+        aliases = {self.read_alias(self.factory.get("/")) for _ in range(4)}
+        self.assertEqual(aliases, {"replica2"})
+
+        self.is_healthy.side_effect = None
+        self.is_healthy.return_value = False
+        self.assertEqual(self.read_alias(self.factory.get("/")), DEFAULT_DB_ALIAS)
+
+    def test_write_requests_use_primary(self) -> None:
+        self.assertIsNone(self.read_alias(self.factory.post("/")))
+        self.assertEqual(self.router.db_for_write(Article), DEFAULT_DB_ALIAS)
+
+    def test_sticky_user_reads_from_primary(self) -> None:
+        routers.stick_to_primary(7)
+
+        sticky = self.factory.get("/", HTTP_AUTHORIZATION=self.token_header(7))
+        other = self.factory.get("/", HTTP_AUTHORIZATION=self.token_header(8))
+
+        self.assertIsNone(self.read_alias(sticky))
+        self.assertIn(self.read_alias(other), ["replica1", "replica2"])
+
+    def test_use_primary_overrides_request_routing(self) -> None:
+        with routers.request_routing(self.factory.get("/")):
+            with routers.use_primary():
+                self.assertIsNone(self.router.db_for_read(Article))
+            self.assertIsNotNone(self.router.db_for_read(Article))
+
+    def test_replicas_are_not_migrated(self) -> None:
+        self.assertFalse(self.router.allow_migrate("replica1", "kite_runner"))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, "kite_runner"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class TestReplicaRouting(APITransactionBaseTest):
+    databases = {DEFAULT_DB_ALIAS, "replica"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        routers.reset_health()
+        self.article = Article.objects.create(
+            title="Replicated",
+            description="Read",
+            body="Here",
+            author=self.user.profile,
+        )
+        self.auth = TOKEN_HEADER.format(get_user_token(self.user))
+
+    def capture(
+        self, method: str, path: str, **extra: Any
+    ) -> Tuple[HttpResponse, int, int]:
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(self.client, method)(path, **extra)
+        return response, len(primary), len(replica)
+
+    def test_authenticated_reads_use_replica(self) -> None:
+        response, primary, replica = self.capture(
+            "get", f"/api/v1/articles/{self.article.slug}", HTTP_AUTHORIZATION=self.auth
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_reads_after_write_use_primary(self) -> None:
+        response = self.client.post(
+            f"/api/v1/articles/{self.article.slug}/comments/",
+            data={"comment": {"body": "First!"}},
+            HTTP_AUTHORIZATION=self.auth,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, primary, replica = self.capture(
+            "get",
+            f"/api/v1/articles/{self.article.slug}/comments/",
+            HTTP_AUTHORIZATION=self.auth,
+        )
+
+        self.assertEqual(response.json()["commentsCount"], 1)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_reads_after_session_write_use_primary(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.post(
+            f"/api/v1/articles/{self.article.slug}/comments/",
+            data={"comment": {"body": "First!"}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response, primary, replica = self.capture(
+            "get", f"/api/v1/articles/{self.article.slug}/comments/"
+        )
+
+        self.assertEqual(response.json()["commentsCount"], 1)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_anonymous_cache_fill_uses_primary(self) -> None:
+        response, primary, replica = self.capture(
+            "get", f"/api/v1/articles/{self.article.slug}"
+        )
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from kite_runner import cache
+from kite_runner.db import instrumentation, middleware
+from kite_runner.db.backends.postgresql_pool.base import get_pool_stats
+from kite_runner.models import Article
+from kite_runner.utils import tokens
+
+from .base import APIBaseTest, APITransactionBaseTest
+
+
+class TestQueryStats(SimpleTestCase):
+    def test_fingerprint_ignores_values(self) -> None:
+        self.assertEqual(
+            instrumentation.fingerprint(
+                "SELECT  *\n FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"
+            ),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            instrumentation.fingerprint("SELECT * FROM t WHERE id IN (%s)"),
+            instrumentation.fingerprint("SELECT * FROM t WHERE id IN (%s, %s)"),
+        )
+
+    def test_repeated_shapes(self) -> None:
+        stats = instrumentation.QueryStats()
+        for pk in range(3):
+            stats.record(f"SELECT * FROM t WHERE id = {pk}", 0.001)
+        stats.record("SELECT * FROM u", 0.002)
+
+        self.assertEqual(stats.count, 4)
+        self.assertAlmostEqual(stats.duration, 0.005)
+        self.assertEqual(stats.repeated(3), {"SELECT * FROM t WHERE id = ?": 3})
+
+
+@override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class TestQueryInstrumentationMiddleware(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        for index in range(2):
+            Article.objects.create(
+                title=f"Article {index}",
+                description="d",
+                body="b",
+                author=self.user.profile,
+            )
+
+    def test_reports_queries_in_headers(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/articles")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Query-Count"], str(len(context)))
+        self.assertRegex(
+            response["Server-Timing"],
+            rf'^db;dur=[0-9.]+;desc="{len(context)} queries"$',
+        )
+        self.assertFalse(response.has_header("X-Query-Repeated"))
+
+    @override_settings(QUERY_N_PLUS_ONE_THRESHOLD=1)
+    def test_flags_repeated_queries(self) -> None:
+        with self.assertLogs(middleware.logger, "WARNING") as logs:
+            response = self.client.get("/api/v1/articles")
+
+        self.assertEqual(response["X-Query-Repeated"], str(len(logs.records)))
+        self.assertIn("Likely N+1 in GET /api/v1/articles: 1 x SELECT", logs.output[0])
+
+    def test_logs_request_statistics(self) -> None:
+        with self.assertLogs(middleware.logger, "INFO") as logs:
+            response = self.client.get("/api/v1/articles")
+
+        record = logs.records[0]
+        self.assertEqual(record.path, "/api/v1/articles")
+        self.assertEqual(record.queries, int(response["X-Query-Count"]))
+
+    @override_settings(PROCESS_STATS_INTERVAL=60)
+    def test_logs_process_statistics_periodically(self) -> None:
+        pool_stats = {"default": {"acquired": 3, "in_use": 1}}
+        process_stats = {"db_pool": lambda: pool_stats}
+
+        with mock.patch.dict(middleware.PROCESS_STATS, process_stats, clear=True):
+            with mock.patch.object(
+                middleware, "_process_stats_reported", float("-inf")
+            ):
+                with self.assertLogs(middleware.logger, "INFO") as logs:
+                    self.client.get("/api/v1/articles")
+                    self.client.get("/api/v1/articles")
+
+        reports = [record for record in logs.records if hasattr(record, "stats")]
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].source, "db_pool")
+        self.assertEqual(reports[0].stats, pool_stats)
+
+    def test_reports_connection_pool_statistics(self) -> None:
+        self.assertIs(middleware.PROCESS_STATS["db_pool"], get_pool_stats)
+
+    def test_reports_token_statistics(self) -> None:
+        self.assertIs(middleware.PROCESS_STATS["tokens"], tokens.get_stats)
+
+    def test_reports_response_cache_statistics(self) -> None:
+        self.assertIs(middleware.PROCESS_STATS["response_cache"], cache.get_stats)
+
+    @override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=0.5)
+    def test_skips_unsampled_requests(self) -> None:
+        with mock.patch.object(middleware.random, "random", return_value=0.9):
+            response = self.client.get("/api/v1/articles")
+
+        self.assertFalse(response.has_header("X-Query-Count"))
+
+    @override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_disabled(self) -> None:
+        response = self.client.get("/api/v1/articles")
+
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+@override_settings(QUERY_INSTRUMENTATION_SAMPLE_RATE=1.0)
+class TestAsyncQueryInstrumentation(APITransactionBaseTest):
+    def test_counts_queries_of_db_pool_threads(self) -> None:
+        Article.objects.create(
+            title="Async", description="d", body="b", author=self.user.profile
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/async/articles")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context), 0)
+        self.assertGreater(int(response["X-Query-Count"]), 0)
@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from typing import Tuple
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kite_runner.models import Profile, User
+
+from .base import APIBaseTest
+
+
+class TestProvision(APIBaseTest):
+    def test_creates_users_and_profiles_in_bulk(self) -> None:
+        records = [
+            {
+                "email": f"user{index}@kiterunner.com",
+                "username": f"user{index}",
+                "password_hash": make_password(f"secret{index}"),
+                "bio": f"Bio {index}",
+            }
+            for index in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            users = User.objects.provision(records)
+
+        queries = [q for q in context if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(len(users), 20)
+        user = User.objects.select_related("profile").get(username="user3")
+        self.assertTrue(user.check_password("secret3"))
+        self.assertEqual(user.profile.bio, "Bio 3")
+
+    def test_hashes_raw_passwords(self) -> None:
+        User.objects.provision(
+            [
+                {"email": "raw@kiterunner.com", "username": "raw", "password": "pw"},
+                {"email": "none@kiterunner.com", "username": "none"},
+            ]
+        )
+
+        self.assertTrue(User.objects.get(username="raw").check_password("pw"))
+        self.assertFalse(User.objects.get(username="none").has_usable_password())
+
+    def test_skips_taken_emails_and_usernames(self) -> None:
+        users = User.objects.provision(
+            [
+                {"email": self.EMAIL, "username": "other"},
+                {"email": "other@kiterunner.com", "username": self.USERNAME},
+                {"email": "new@kiterunner.com", "username": "new"},
+                {"email": "new@kiterunner.com", "username": "again"},
+                {"email": "again@kiterunner.com", "username": "new"},
+            ]
+        )
+
+        self.assertEqual([user.username for user in users], ["new"])
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Profile.objects.count(), 2)
+
+    def test_rejects_invalid_records(self) -> None:
+        for record in (
+            {"username": "nomail"},
+            {"email": "nouser@kiterunner.com"},
+            {"email": "a@kiterunner.com", "username": "a", "password_hash": "plain"},
+        ):
+            with self.subTest(record), self.assertRaises(ValueError):
+                User.objects.build(record)
+
+    def test_signup_still_creates_profile(self) -> None:
+        user = User.objects.create_user("single@kiterunner.com", "pw", "single")
+
+        self.assertTrue(Profile.objects.filter(user=user).exists())
+
+
+class TestProvisionUsersCommand(APIBaseTest):
+    def provision(self, name: str, content: str, *args: str) -> Tuple[str, str]:
+        stdout, stderr = StringIO(), StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, name)
+            with open(path, "w") as file:
+                file.write(content)
+            call_command("provision_users", path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_provisions_ndjson(self) -> None:
+        lines = [
+            json.dumps({"email": f"u{i}@kiterunner.com", "username": f"u{i}"})
+            for i in range(5)
+        ]
+        lines[2] = "{broken"
+        lines.append(json.dumps({"email": self.EMAIL, "username": "dup"}))
+
+        stdout, stderr = self.provision(
+            "users.ndjson", "\n".join(lines), "--batch-size=2"
+        )
+
+        self.assertIn("Created 4 users", stdout)
+        self.assertIn("skipped 1 duplicate and 1 invalid records", stdout)
+        self.assertIn("Line 3:", stderr)
+        self.assertEqual(User.objects.filter(username__startswith="u").count(), 4)
+
+    def test_provisions_csv(self) -> None:
+        content = (
+            "email,username,password,image\n"
+            "csv1@kiterunner.com,csv1,secret,https://example.com/a.png\n"
+            "csv2@kiterunner.com,,secret,\n"
+        )
+
+        stdout, stderr = self.provision("users.csv", content, "--hash-workers=2")
+
+        self.assertIn("Created 1 users", stdout)
+        self.assertIn("Line 3: Users must have a username", stderr)
+        user = User.objects.select_related("profile").get(username="csv1")
+        self.assertTrue(user.check_password("secret"))
+        self.assertEqual(user.profile.image, "https://example.com/a.png")
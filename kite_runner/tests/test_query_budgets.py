@@ -0,0 +1,190 @@
+import itertools
+from typing import Callable
+
+from django.http import HttpResponse
+from django.test import override_settings
+
+from kite_runner.models import Article, Comment, Tag, User
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APIBaseTest
+
+
+class TestQueryBudgets(APIBaseTest):
+    """
+    Query budgets of the API endpoints, for 1 and for 50 rows where the
+    endpoint lists rows.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.author = self.create_author("author")
+        self.article = self.create_article(self.author, 0)
+        self.user.profile.follow(self.author.profile)
+        self.user.profile.favorite(self.article)
+        Comment.objects.create(
+            body="Comment", article=self.article, author=self.author.profile
+        )
+        self.auth = TOKEN_HEADER.format(get_user_token(self.user))
+        self.names = itertools.count()
+
+    def create_author(self, username: str) -> User:
+        return User.objects.create_user(f"{username}@kiterunner.com", None, username)
+
+    def create_article(self, author: User, index: int) -> Article:
+        article = Article.objects.create(
+            title=f"Article {index}",
+            description="d",
+            body="Dragons",
+            author=author.profile,
+        )
+        article.tags.set(Tag.objects.resolve([f"tag{index}", "shared"]))
+        return article
+
+    def add_articles(self) -> None:
+        for index in range(1, 50):
+            author = self.create_author(f"author{index}")
+            self.user.profile.follow(author.profile)
+            article = self.create_article(author, index)
+            self.user.profile.favorite(article)
+
+    def add_comments(self) -> None:
+        for index in range(1, 50):
+            author = self.create_author(f"commenter{index}")
+            Comment.objects.create(
+                body=f"Comment {index}", article=self.article, author=author.profile
+            )
+
+    def get(self, path: str, auth: bool = False) -> Callable[[], HttpResponse]:
+        extra = {"HTTP_AUTHORIZATION": self.auth} if auth else {}
+        return lambda: self.client.get(path, **extra)
+
+    def test_articles(self) -> None:
+        self.assertQueryBudget(
+            3, self.get("/api/v1/articles?limit=50"), self.add_articles
+        )
+
+    def test_articles_authenticated(self) -> None:
+        self.assertQueryBudget(
+            4, self.get("/api/v1/articles?limit=50", auth=True), self.add_articles
+        )
+
+    def test_articles_filtered(self) -> None:
+        for query in ("tag=shared", "author=author", f"favorited={self.USERNAME}"):
+            with self.subTest(query):
+                self.assertQueryBudget(
+                    4, self.get(f"/api/v1/articles?limit=50&{query}", auth=True)
+                )
+
+    def test_feed(self) -> None:
+        # One more than the listing: the followed authors merged at read time.
+        self.assertQueryBudget(
+            5, self.get("/api/v1/articles/feed/?limit=50", auth=True), self.add_articles
+        )
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_feed_merging_skipped_authors(self) -> None:
+        # Every followed author is merged at read time, in one branch of the
+        # page and count queries however many there are. One more than the
+        # fanned-out feed: the merged page is loaded by id.
+        self.assertQueryBudget(
+            6, self.get("/api/v1/articles/feed/?limit=50", auth=True), self.add_articles
+        )
+
+    def test_search(self) -> None:
+        self.assertQueryBudget(
+            2, self.get("/api/v1/articles/search?q=dragons&limit=50"), self.add_articles
+        )
+
+    def test_article(self) -> None:
+        path = f"/api/v1/articles/{self.article.slug}"
+
+        self.assertQueryBudget(2, self.get(path))
+        self.assertQueryBudget(3, self.get(path, auth=True))
+
+    def test_comments(self) -> None:
+        path = f"/api/v1/articles/{self.article.slug}/comments/?limit=50"
+
+        # Anonymous reads look the article id up for the cache scope first;
+        # it is remembered after that first read.
+        self.assertQueryBudget(3, self.get(path), self.add_comments)
+        self.assertQueryBudget(3, self.get(path, auth=True))
+
+    def test_profile(self) -> None:
+        self.assertQueryBudget(1, self.get("/api/v1/profiles/author"))
+        self.assertQueryBudget(2, self.get("/api/v1/profiles/author", auth=True))
+
+    def test_tags(self) -> None:
+        self.assertQueryBudget(1, self.get("/api/v1/tags/"), self.add_articles)
+
+    def test_current_user(self) -> None:
+        # The authenticated user is served from the cache.
+        self.assertQueryBudget(0, self.get("/api/v1/user/", auth=True))
+
+    def test_update_user(self) -> None:
+        self.assertQueryBudget(
+            5,
+            lambda: self.client.put(
+                "/api/v1/user/",
+                {"user": {"bio": f"Bio {next(self.names)}"}},
+                HTTP_AUTHORIZATION=self.auth,
+            ),
+        )
+
+    def test_login(self) -> None:
+        self.assertQueryBudget(
+            1,
+            lambda: self.client.post(
+                "/api/v1/users/login/",
+                {"user": {"email": self.EMAIL, "password": self.PASSWORD}},
+            ),
+        )
+
+    def test_signup(self) -> None:
+        def signup():
+            name = f"new{next(self.names)}"
+            return self.client.post(
+                "/api/v1/users/",
+                {
+                    "user": {
+                        "email": f"{name}@kiterunner.com",
+                        "username": name,
+                        "password": "Sup3r-secret-pass",
+                    }
+                },
+            )
+
+        self.assertQueryBudget(4, signup)
+
+
+class TestQueryBudgetMixin(APIBaseTest):
+    def test_over_budget_lists_queries(self) -> None:
+        with self.assertRaises(AssertionError) as raised:
+            self.assertQueryBudget(0, lambda: self.client.get("/api/v1/tags/"))
+
+        self.assertIn(
+            "Expected at most 0 queries, got 1:\n1. SELECT", str(raised.exception)
+        )
+
+    def test_growing_query_count_shows_diff(self) -> None:
+        def per_row_queries():
+            for article in Article.objects.all():
+                article.author.pk
+            return HttpResponse()
+
+        def grow():
+            for index in range(2):
+                Article.objects.create(
+                    title=f"Article {index}",
+                    description="d",
+                    body="b",
+                    author=self.user.profile,
+                )
+
+        with self.assertRaises(AssertionError) as raised:
+            self.assertQueryBudget(10, per_row_queries, grow)
+
+        message = str(raised.exception)
+        self.assertIn("Query count changed from 1 to 3", message)
+        self.assertIn('+SELECT "kite_runner_profile"', message)
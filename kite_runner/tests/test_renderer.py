@@ -0,0 +1,87 @@
+import json
+
+from django.test import SimpleTestCase, override_settings
+
+from kite_runner.api.renderer import ArticleJSONRenderer, UserJSONRenderer
+from kite_runner.models import Article
+from kite_runner.renderer import get_encoder
+
+from .base import APIBaseTest
+
+
+class TestKRJSONRenderer(SimpleTestCase):
+    page = {"count": 2, "next": None, "previous": None, "results": [{"a": "é"}, {}]}
+
+    def test_render_returns_bytes(self) -> None:
+        rendered = ArticleJSONRenderer().render(self.page)
+
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(
+            json.loads(rendered), {"articles": [{"a": "é"}, {}], "count": 2}
+        )
+
+    def test_render_object_and_errors(self) -> None:
+        renderer = ArticleJSONRenderer()
+
+        self.assertEqual(
+            json.loads(renderer.render({"slug": "x"})), {"article": {"slug": "x"}}
+        )
+        self.assertEqual(
+            json.loads(renderer.render({"errors": {"detail": "x"}})),
+            {"errors": {"detail": "x"}},
+        )
+        self.assertEqual(renderer.render(None), b"{}")
+
+    def test_encoders_agree(self) -> None:
+        for name in ("stdlib", "orjson"):
+            with (
+                self.subTest(encoder=name),
+                override_settings(JSON_RENDERER_ENCODER=name),
+            ):
+                self.assertEqual(
+                    json.loads(ArticleJSONRenderer().render(self.page)),
+                    {"articles": [{"a": "é"}, {}], "count": 2},
+                )
+
+    def test_custom_encoder(self) -> None:
+        self.assertIs(
+            get_encoder("kite_runner.renderer.stdlib_encoder"),
+            get_encoder("stdlib"),
+        )
+
+    def test_iter_render_matches_render(self) -> None:
+        renderer = ArticleJSONRenderer()
+        page = {"next": "n", "previous": None, "results": [{"i": i} for i in range(7)]}
+
+        self.assertEqual(
+            json.loads(b"".join(renderer.iter_render(page, chunk_size=3))),
+            json.loads(renderer.render(page)),
+        )
+
+    def test_user_renderer_does_not_mutate_data(self) -> None:
+        data = {"email": "test@kiterunner.com", "token": b"token"}
+
+        rendered = UserJSONRenderer().render(data)
+
+        self.assertEqual(data["token"], b"token")
+        self.assertEqual(json.loads(rendered)["user"]["token"], "token")
+
+
+class TestStreamingList(APIBaseTest):
+    @override_settings(JSON_RENDERER_STREAM_THRESHOLD=1)
+    def test_large_list_is_streamed(self) -> None:
+        for index in range(2):
+            Article.objects.create(
+                title=f"Article {index}",
+                author=self.user.profile,
+                description="description",
+                body="body",
+            )
+
+        response = self.client.get("/api/v1/articles")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        response_data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(response_data["count"], 2)
+        self.assertEqual(len(response_data["articles"]), 2)
@@ -0,0 +1,105 @@
+from typing import List
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+
+from kite_runner.models import Article, Tag
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APIBaseTest
+
+
+class TestArticleSearch(APIBaseTest):
+    search_url = "/api/v1/articles/search"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.in_title = self._create_article(
+            "Training dragons", "A guide", "Start small."
+        )
+        self.in_body = self._create_article(
+            "Flying lessons", "Up high", "Mostly about training your dragon."
+        )
+        self.unrelated = self._create_article("Baking bread", "Flour", "Knead it.")
+        self.token = get_user_token(self.user)
+
+    def _create_article(self, title: str, description: str, body: str) -> Article:
+        return Article.objects.create(
+            title=title, description=description, body=body, author=self.user.profile
+        )
+
+    def _search_titles(self, query: str) -> List[str]:
+        response = self.client.get(self.search_url, {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [article["title"] for article in response.json()["articles"]]
+
+    def test_results_are_ranked(self) -> None:
+        self.assertEqual(
+            self._search_titles("dragons training"),
+            [self.in_title.title, self.in_body.title],
+        )
+
+    def test_empty_query_returns_nothing(self) -> None:
+        self.assertEqual(self._search_titles(""), [])
+
+    def test_tags_are_searchable(self) -> None:
+        self.unrelated.tags.add(Tag.objects.create(tag="sourdough"))
+
+        self.assertEqual(self._search_titles("sourdough"), [self.unrelated.title])
+
+    def test_created_and_updated_articles_are_indexed(self) -> None:
+        self.client.post(
+            "/api/v1/articles",
+            data={
+                "article": {
+                    "title": "Gardening",
+                    "description": "Soil",
+                    "body": "Water daily.",
+                    "tagList": ["tomatoes"],
+                }
+            },
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+        self.assertEqual(self._search_titles("tomatoes"), ["Gardening"])
+
+        self.client.put(
+            "/api/v1/articles/gardening",
+            data={"article": {"body": "Prune the cucumbers."}},
+            HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+        )
+        self.assertEqual(self._search_titles("cucumber"), ["Gardening"])
+
+    def test_results_are_keyset_paginated(self) -> None:
+        response = self.client.get(self.search_url, {"q": "training", "limit": 1})
+        response_data = response.json()
+
+        self.assertEqual(
+            [article["title"] for article in response_data["articles"]],
+            [self.in_title.title],
+        )
+        self.assertNotIn("count", response_data)
+
+        response = self.client.get(response_data["next"])
+        response_data = response.json()
+
+        self.assertEqual(
+            [article["title"] for article in response_data["articles"]],
+            [self.in_body.title],
+        )
+        self.assertIsNone(response_data["next"])
+
+    def test_reindex_command_indexes_existing_rows(self) -> None:
+        Article.objects.update(search_vector=None)
+        self.assertEqual(self._search_titles("bread"), [])
+
+        call_command("reindex_articles", "--batch-size=1", stdout=None)
+
+        self.assertEqual(self._search_titles("bread"), [self.unrelated.title])
+
+    def test_reindex_command_rejects_invalid_batch_size(self) -> None:
+        for batch_size in ("0", "-1"):
+            with self.subTest(batch_size=batch_size):
+                with self.assertRaisesMessage(CommandError, "at least 1"):
+                    call_command("reindex_articles", f"--batch-size={batch_size}")
@@ -1,3 +1,16 @@
+from datetime import timedelta
+from io import StringIO
+from typing import List
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from kite_runner.models import Article, PopularTag, Tag
+from kite_runner.models.tag import TagDictionary
+
 from .base import APIBaseTest
 
 
@@ -8,3 +21,124 @@ class TestTagAPI(APIBaseTest):
         """
         response = self.client.get("/api/v1/tags/")
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"tags": []})
+
+
+class TestPopularTagsAPI(APIBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self._create_article("one", ["python", "django", "rust"])
+        self._create_article("two", ["python", "django"])
+        self._create_article("three", ["python"])
+        self._refresh()
+
+    def _create_article(self, title: str, tags: List[str]) -> Article:
+        article = Article.objects.create(
+            title=title, body="body", description="desc", author=self.user.profile
+        )
+        article.tags.set(Tag.objects.resolve(tags))
+        return article
+
+    def _refresh(self) -> None:
+        call_command("refresh_popular_tags", stdout=StringIO())
+
+    def test_tags_are_ranked_by_usage(self):
+        response = self.client.get("/api/v1/tags/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"tags": ["python", "django", "rust"]})
+
+    @override_settings(TAG_POPULAR_LIMIT=2)
+    def test_tags_are_limited_to_the_top(self):
+        response = self.client.get("/api/v1/tags/")
+
+        self.assertEqual(response.json(), {"tags": ["python", "django"]})
+
+    def test_long_tail_is_paginated(self):
+        response = self.client.get("/api/v1/tags/?limit=2&offset=1")
+
+        self.assertEqual(response.json(), {"tags": ["django", "rust"], "count": 3})
+
+    def test_window_only_counts_recent_articles(self):
+        old = self._create_article("old", ["rust", "rust-lang"])
+        Article.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        self._refresh()
+
+        response = self.client.get("/api/v1/tags/?window=week")
+        self.assertEqual(response.json(), {"tags": ["python", "django", "rust"]})
+
+        response = self.client.get("/api/v1/tags/?window=month")
+        self.assertEqual(
+            response.json(), {"tags": ["python", "django", "rust", "rust-lang"]}
+        )
+
+    def test_reads_do_not_refresh_the_ranking(self):
+        for title in ("four", "five", "six"):
+            self._create_article(title, ["rust"])
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/tags/")
+        queries = [q["sql"] for q in context if "SAVEPOINT" not in q["sql"]]
+
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith("SELECT"))
+        self.assertEqual(response.json()["tags"][0], "python")
+
+        self._refresh()
+
+        response = self.client.get("/api/v1/tags/")
+        self.assertEqual(response.json()["tags"][0], "rust")
+
+    @override_settings(TAG_RANKING_SIZE=2)
+    def test_ranking_keeps_only_the_top(self):
+        PopularTag.objects.refresh(PopularTag.objects.ALL)
+
+        response = self.client.get("/api/v1/tags/?limit=10")
+        self.assertEqual(response.json(), {"tags": ["python", "django"], "count": 2})
+
+
+class TestTagResolution(APIBaseTest):
+    def test_resolve_normalizes_and_deduplicates_names(self):
+        Tag.objects.create(tag="Django")
+
+        tags = Tag.objects.resolve(["django", "Machine Learning", "DJANGO", " "])
+
+        self.assertEqual([tag.slug for tag in tags], ["django", "machine-learning"])
+        self.assertEqual(tags[1].tag, "Machine Learning")
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_resolve_keeps_unicode_names(self):
+        tags = Tag.objects.resolve(["日本語", "Café"])
+
+        self.assertEqual([tag.slug for tag in tags], ["日本語", "café"])
+        self.assertEqual([tag.tag for tag in tags], ["日本語", "Café"])
+
+    def test_resolve_uses_bounded_queries_then_dictionary(self):
+        names = [f"tag{i}" for i in range(10)]
+
+        with self.assertNumQueries(3):
+            tags = Tag.objects.resolve(names)
+        with self.assertNumQueries(0):
+            cached = Tag.objects.resolve(names)
+
+        self.assertEqual([tag.pk for tag in cached], [tag.pk for tag in tags])
+
+    def test_deleted_tag_is_evicted_from_dictionary(self):
+        (tag,) = Tag.objects.resolve(["python"])
+        tag.delete()
+
+        (recreated,) = Tag.objects.resolve(["python"])
+
+        self.assertNotEqual(recreated.pk, tag.pk)
+        self.assertTrue(Tag.objects.filter(pk=recreated.pk).exists())
+
+    def test_dictionary_is_bounded(self):
+        dictionary = TagDictionary(maxsize=2)
+        dictionary.set_many({"a": (1, "a"), "b": (2, "b")})
+        dictionary.get_many(["a"])
+        dictionary.set_many({"c": (3, "c")})
+
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(dictionary.get_many(["a", "b", "c"]).keys(), {"a", "c"})
@@ -0,0 +1,114 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from kite_runner.checks import check_atomic_write_views, non_atomic_write_views
+from kite_runner.models import Article
+from kite_runner.transactions import AtomicWritesMixin
+from kite_runner.utils.constants import TOKEN_HEADER
+from kite_runner.utils.tokens import get_user_token
+
+from .base import APIBaseTest, APITransactionBaseTest
+
+SNAPSHOT = "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+
+
+class PlainWriteView(APIView):
+    def post(self, request):
+        pass
+
+
+class LoginLikeView(AtomicWritesMixin, APIView):
+    non_atomic_methods = ("POST",)
+
+    def post(self, request):
+        pass
+
+
+class TestTransactionPolicy(APIBaseTest):
+
+    article_data = {
+        "article": {"title": "Atomic", "description": "Writes", "body": "Only"}
+    }
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.article = Article.objects.create(
+            title="Reads", description="Run", body="Unwrapped", author=self.user.profile
+        )
+        self.token = get_user_token(self.user)
+
+    def test_reads_run_without_a_transaction(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/v1/articles/{self.article.slug}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in context if "SAVEPOINT" in q["sql"]])
+
+    def test_writes_run_in_a_transaction(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                "/api/v1/articles",
+                data=self.article_data,
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(context[0]["sql"].startswith("SAVEPOINT"))
+
+    def test_error_response_rolls_back_the_write(self) -> None:
+        with mock.patch(
+            "kite_runner.api.article.ArticleSerializer.to_representation",
+            side_effect=ValidationError("boom"),
+        ):
+            response = self.client.post(
+                "/api/v1/articles",
+                data=self.article_data,
+                HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token),
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Article.objects.filter(title="Atomic").exists())
+
+    def test_check_passes_for_project_urls(self) -> None:
+        self.assertEqual(check_atomic_write_views(), [])
+
+    def test_check_flags_non_atomic_write_view(self) -> None:
+        errors = non_atomic_write_views(
+            [
+                path("plain/", PlainWriteView.as_view()),
+                path("login/", LoginLikeView.as_view()),
+            ]
+        )
+
+        self.assertEqual([e.id for e in errors], ["kite_runner.E001"])
+        self.assertIs(errors[0].obj, PlainWriteView)
+        self.assertIn("POST", errors[0].msg)
+
+
+class TestReadSnapshot(APITransactionBaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.article = Article.objects.create(
+            title="Snapshot", description="Page", body="Count", author=self.user.profile
+        )
+
+    def test_list_runs_in_read_only_snapshot(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/articles")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+        self.assertIn(SNAPSHOT, [q["sql"] for q in context])
+
+    def test_detail_runs_in_autocommit(self) -> None:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/api/v1/articles/{self.article.slug}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(SNAPSHOT, [q["sql"] for q in context])
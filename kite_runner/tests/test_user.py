@@ -1,5 +1,7 @@
+from django.test import override_settings
 from rest_framework import status
 
+from kite_runner.utils import tokens
 from kite_runner.utils.constants import TOKEN_HEADER
 from kite_runner.utils.tokens import get_user_token
 
@@ -68,3 +70,26 @@ class TestUserAPI(APIBaseTest):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json()["user"]["email"], "update_email@mail.com")
+
+    def test_get_current_user_reuses_presented_token(self):
+        tokens.reset_stats()
+
+        response = self.client.get(
+            self.user_api_url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+        )
+
+        self.assertEqual(response.json()["user"]["token"], self.token)
+        self.assertEqual(tokens.get_stats()["minted"], 0)
+        self.assertEqual(tokens.get_stats()["reused"], 1)
+
+    @override_settings(TOKEN_REUSE_MIN_LIFETIME=24 * 60 * 60)
+    def test_get_current_user_renews_expiring_token(self):
+        tokens.reset_stats()
+
+        response = self.client.get(
+            self.user_api_url, HTTP_AUTHORIZATION=TOKEN_HEADER.format(self.token)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(tokens.get_stats()["minted"], 1)
+        self.assertGreater(tokens.get_stats()["signing_seconds"], 0)
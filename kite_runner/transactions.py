@@ -0,0 +1,74 @@
+"""
+Per-view transaction policy, replacing ``ATOMIC_REQUESTS``.
+
+Reads run in autocommit mode, or in a read-only repeatable-read snapshot
+when a view needs several queries to agree (a page and its count); writes
+run in ``transaction.atomic``.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+from django.db import connections, router, transaction
+from rest_framework.permissions import SAFE_METHODS
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+@contextmanager
+def read_only_snapshot(using: Optional[str] = None) -> Iterator[None]:
+    """
+    Runs the block in a ``REPEATABLE READ READ ONLY`` transaction on the
+    database reads are routed to. Inside an existing transaction the block
+    simply joins it, since its isolation level can no longer be changed.
+    """
+
+    using = using or router.db_for_read(None)
+    connection = connections[using]
+    if connection.in_atomic_block:
+        yield
+        return
+
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+            )
+        yield
+
+
+class AtomicWritesMixin:
+    """
+    Runs ``atomic_methods`` in a transaction that is rolled back when the
+    view answers with an exception response. Safe methods run in autocommit
+    mode unless ``needs_read_snapshot`` asks for a snapshot.
+
+    Methods that must not hold a transaction open are listed in
+    ``non_atomic_methods``, which the ``kite_runner.E001`` check accepts.
+    """
+
+    atomic_methods: Tuple[str, ...] = WRITE_METHODS
+    non_atomic_methods: Tuple[str, ...] = ()
+    read_snapshot = False
+
+    def needs_read_snapshot(self, request: Any, *args: Any, **kwargs: Any) -> bool:
+        return self.read_snapshot
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.upper()
+        dispatch = super().dispatch  # type: ignore
+
+        if method in self.atomic_methods and method not in self.non_atomic_methods:
+            with transaction.atomic():
+                response = dispatch(request, *args, **kwargs)
+                if getattr(response, "exception", False):
+                    transaction.set_rollback(True)
+                return response
+
+        if method in SAFE_METHODS and self.needs_read_snapshot(
+            request, *args, **kwargs
+        ):
+            with read_only_snapshot():
+                return dispatch(request, *args, **kwargs)
+
+        return dispatch(request, *args, **kwargs)
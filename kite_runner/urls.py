@@ -4,8 +4,8 @@ from django.urls.conf import include
 from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenRefreshView)
 
-from kite_runner.api import (article, authentication, comment, profile, signup,
-                            tag, user)
+from kite_runner.api import (article, async_views, authentication, comment,
+                             profile, signup, tag, user)
 from kite_runner.router import OptionalSlashRouter
 
 router = OptionalSlashRouter() # type: ignore
@@ -15,11 +15,14 @@ urlpatterns = [
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/v1/articles/feed/", article.ArticlesFeedAPIView.as_view()),
+    path("api/v1/articles/search", article.ArticlesSearchAPIView.as_view()),
     path(r"api/v1/", include(router.urls)),
     path("admin/", admin.site.urls),
     path("api/v1/users/", signup.SignupAPIView.as_view()),
     path("api/v1/users/login/", authentication.LoginViewSet.as_view()),
     path("api/v1/user/", user.UserRetrieveUpdateAPIView.as_view()),
+    path("api/v1/user/following", profile.FollowBatchAPIView.as_view()),
+    path("api/v1/user/favorites", article.FavoriteBatchAPIView.as_view()),
     path("api/v1/profiles/<str:username>", profile.ProfileRetrieveAPIView.as_view()),
     path("api/v1/profiles/<str:username>/follow/", profile.FollowUserAPIView.as_view()),
     path(
@@ -35,4 +38,12 @@ urlpatterns = [
         comment.CommentDestroyAPIView.as_view(),
     ),
     path("api/v1/tags/", tag.TagListAPIView.as_view()),
+    path("api/v1/async/articles", async_views.article_list),
+    path("api/v1/async/articles/<str:slug>", async_views.article_detail),
+    path(
+        "api/v1/async/articles/<str:article_slug>/comments/",
+        async_views.comment_list,
+    ),
+    path("api/v1/async/profiles/<str:username>", async_views.profile_detail),
+    path("api/v1/async/tags/", async_views.tag_list),
 ]
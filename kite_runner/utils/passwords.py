@@ -0,0 +1,108 @@
+"""
+Password verification off the request threads.
+
+Hashing runs on a small, bounded worker pool so a burst of logins can only
+ever occupy ``LOGIN_HASH_WORKERS`` CPUs; requests beyond
+``LOGIN_HASH_QUEUE`` waiting logins are rejected immediately.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional, TypeVar
+
+from django.conf import settings
+from django.contrib.auth.hashers import (check_password, get_hasher,
+                                         identify_hasher, make_password)
+from django.contrib.auth.signals import user_login_failed
+from rest_framework.exceptions import Throttled
+
+from kite_runner.exceptions import ServiceUnavailable
+from kite_runner.models import User
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _executor, _slots
+
+    with _lock:
+        if _executor is None:
+            workers = settings.LOGIN_HASH_WORKERS
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="password-hasher"
+            )
+            _slots = threading.BoundedSemaphore(workers + settings.LOGIN_HASH_QUEUE)
+        return _executor
+
+
+def _run(func: Callable[..., T], *args: Any) -> T:
+    executor = _get_pool()
+    slots = _slots
+    assert slots is not None
+
+    if not slots.acquire(blocking=False):
+        raise Throttled(wait=1, detail="Too many logins in progress.")
+
+    future = executor.submit(func, *args)
+    future.add_done_callback(lambda _: slots.release())
+
+    try:
+        return future.result(timeout=settings.LOGIN_HASH_TIMEOUT)
+    except FutureTimeoutError:
+        raise ServiceUnavailable(wait=settings.LOGIN_HASH_TIMEOUT)
+
+
+def needs_rehash(encoded: str) -> bool:
+    """
+    Whether ``encoded`` was made with another hasher or weaker parameters
+    than the preferred (first) entry of ``PASSWORD_HASHERS``.
+    """
+
+    preferred = get_hasher("default")
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def _login_failed(email: str, request: Any) -> None:
+    user_login_failed.send(
+        sender=__name__, credentials={"email": email}, request=request
+    )
+
+
+def authenticate(email: str, password: str, request: Any = None) -> Optional[User]:
+    """
+    Returns the active user with ``email`` and ``password``, or ``None``.
+    Passwords stored with outdated hasher settings are upgraded.
+
+    Stands in for ``django.contrib.auth.authenticate`` on the login endpoint:
+    ``AUTHENTICATION_BACKENDS`` are not consulted, but ``user_login_failed``
+    is sent for failed attempts all the same.
+    """
+
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        # Hash anyway so unknown emails take as long as wrong passwords.
+        _run(make_password, password)
+        _login_failed(email, request)
+        return None
+
+    if not _run(check_password, password, user.password) or not user.is_active:
+        _login_failed(email, request)
+        return None
+
+    if needs_rehash(user.password):
+        # Rehashing is a write, so it stays on the request thread and its
+        # database connection.
+        user.set_password(password)
+        user.save(update_fields=["password"])
+
+    return user